@@ -0,0 +1,5 @@
+import sys
+
+from affordable_housing.cli import main
+
+sys.exit(main())
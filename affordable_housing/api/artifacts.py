@@ -0,0 +1,47 @@
+# The served model, shared by the API (main.py) and the job pool processes (jobs.py) without
+# either importing the other
+from functools import lru_cache
+import json
+from pathlib import Path
+
+import joblib
+from loguru import logger
+
+from affordable_housing.config import MODEL_EXPORT_DIR, MODEL_FORMAT, MODELS_DIR
+from affordable_housing.modeling.artifact import MANIFEST_NAME, load_artifact
+from affordable_housing.prediction_log import file_version
+
+
+@lru_cache(maxsize=4)
+def load_artifacts(
+    model_path: Path = MODELS_DIR / "model.pkl",
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+):
+    """Load the model and preprocessor once per process and reuse them across requests."""
+    if MODEL_FORMAT == "export":
+        logger.info(f"Loading exported model artifact from {MODEL_EXPORT_DIR}")
+        return load_artifact(MODEL_EXPORT_DIR)
+    logger.info("Loading model...")
+    return joblib.load(model_path), joblib.load(preprocessor_path)
+
+
+def model_available(model_path: Path = MODELS_DIR / "model.pkl") -> bool:
+    """Check that the configured model artifact exists before trying to serve it."""
+    if MODEL_FORMAT == "export":
+        return (MODEL_EXPORT_DIR / MANIFEST_NAME).exists()
+    return model_path.exists()
+
+
+def model_version(model_path: Path = MODELS_DIR / "model.pkl") -> str:
+    """Content hash of the served model, recorded in the prediction log."""
+    if MODEL_FORMAT == "export":
+        return file_version(MODEL_EXPORT_DIR / MANIFEST_NAME)
+    return file_version(model_path)
+
+
+def source_model_version(model_path: Path = MODELS_DIR / "model.pkl") -> str | None:
+    """Content hash of the model.pkl behind the served model (recorded by export.py)."""
+    if MODEL_FORMAT == "export":
+        manifest = json.loads((MODEL_EXPORT_DIR / MANIFEST_NAME).read_text())
+        return manifest.get("source_model_version")
+    return file_version(model_path)
@@ -0,0 +1,248 @@
+from concurrent.futures import ProcessPoolExecutor
+import http.client
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+from typing import Annotated
+
+from loguru import logger
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import typer
+
+from affordable_housing.config import MODEL_EXPORT_DIR, PROJ_ROOT
+from affordable_housing.modeling.artifact import load_artifact
+from affordable_housing.modeling.columnar import (
+    ARROW_STREAM_MEDIA_TYPE,
+    ColumnarScorer,
+    write_arrow_stream,
+)
+
+app = typer.Typer()
+
+GUNICORN_CONF = Path(__file__).with_name("gunicorn_conf.py")
+WORKER_COUNTS = [1, 2, 4]  # default --workers of the workers benchmark
+ROW_COUNTS = [10_000, 1_000_000]  # default --rows of the arrow benchmark
+SAMPLE_INPUT = {
+    "avg_targeted_affordability": 0.5,
+    "CDLAC_total_points_score": 119,
+    "CDLAC_tie_breaker_self_score": 1.2,
+    "bond_request_amount": 30000000.0,
+    "homeless_percent": 0.1,
+    "construction_type": "New Construction",
+    "housing_type": "Large Family",
+    "CDLAC_pool_type": "New Construction",
+    "new_construction_set_aside": "ELI/VLI",
+    "CDLAC_region": "City of Los Angeles",
+}
+
+
+def run_client(port: int, path: str, body: bytes, headers: dict, duration: float) -> int:
+    """Send requests over one keep-alive connection for `duration` seconds; return the count."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    deadline = time.perf_counter() + duration
+    count = 0
+    while time.perf_counter() < deadline:
+        connection.request("POST", path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{path} returned {response.status}")
+        count += 1
+    connection.close()
+    return count
+
+
+def load_test(
+    port: int, path: str, body: bytes, headers: dict, clients: int, duration: float
+) -> float:
+    """Requests per second from `clients` client processes."""
+    with ProcessPoolExecutor(max_workers=clients) as pool:
+        futures = [
+            pool.submit(run_client, port, path, body, headers, duration) for _ in range(clients)
+        ]
+        total = sum(future.result() for future in futures)
+    return total / duration
+
+
+def memory_kb(pid: int) -> dict:
+    """Rss, Pss and private memory of one process from /proc/<pid>/smaps_rollup (Linux only)."""
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        key, _, rest = line.partition(":")
+        if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+            values[key] = int(rest.split()[0])
+    return {
+        "rss_kb": values["Rss"],
+        "pss_kb": values["Pss"],
+        "private_kb": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def child_pids(pid: int) -> list[int]:
+    children = Path(f"/proc/{pid}/task/{pid}/children").read_text().split()
+    return [int(child) for child in children]
+
+
+def wait_until_healthy(port: int, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} did not become healthy")
+
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    env = {**os.environ, **env, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{port}"}
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "-c",
+        str(GUNICORN_CONF),
+        "affordable_housing.api.main:app",
+    ]
+    return subprocess.Popen(
+        command, cwd=PROJ_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    server.wait(timeout=30)
+
+
+def post(port: int, path: str, body: bytes, headers: dict) -> bytes:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+    connection.request("POST", path, body=body, headers=headers)
+    response = connection.getresponse()
+    content = response.read()
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{path} returned {response.status}: {content[:200]!r}")
+    return content
+
+
+def sample_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Random applications drawn around SAMPLE_INPUT, categories from the model vocabulary."""
+    rng = np.random.default_rng(seed)
+    scorer = ColumnarScorer(*load_artifact(MODEL_EXPORT_DIR))
+    df = pd.DataFrame(
+        {
+            column: SAMPLE_INPUT[column] * rng.uniform(0.5, 1.5, n_rows)
+            for column in scorer.numeric_columns
+        }
+    )
+    df["CDLAC_total_points_score"] = df["CDLAC_total_points_score"].round().astype(int)
+    for column, (vocab, _) in scorer.categorical.items():
+        df[column] = rng.choice(vocab.astype(str), n_rows)
+    return df
+
+
+@app.command()
+def workers(
+    worker_counts: Annotated[list[int], typer.Option("--workers")] = WORKER_COUNTS,
+    clients_per_worker: int = 4,
+    duration: float = 10.0,
+    port: int = 8765,
+    model_format: str = "joblib",  # "joblib" or "export"
+):
+    """
+    Throughput and per-worker memory of the preloaded multi-worker server at several worker
+    counts. Scaling is only near-linear up to the number of free cores on the machine.
+    """
+    body = json.dumps(SAMPLE_INPUT).encode()
+    headers = {"Content-Type": "application/json"}
+    rows = []
+    for n_workers in worker_counts:
+        logger.info(f"Starting server with {n_workers} workers")
+        server = start_server(n_workers, port, {"MODEL_FORMAT": model_format})
+        try:
+            wait_until_healthy(port)
+            load_test(port, "/predict", body, headers, n_workers, 1.0)  # warm up every worker
+            clients = n_workers * clients_per_worker
+            throughput = load_test(port, "/predict", body, headers, clients, duration)
+            worker_memory = pd.DataFrame([memory_kb(pid) for pid in child_pids(server.pid)])
+            rows.append(
+                {
+                    "workers": n_workers,
+                    "requests_per_s": throughput,
+                    "master_rss_kb": memory_kb(server.pid)["rss_kb"],
+                    "worker_rss_kb": worker_memory["rss_kb"].mean(),
+                    "worker_pss_kb": worker_memory["pss_kb"].mean(),
+                    "worker_private_kb": worker_memory["private_kb"].mean(),
+                }
+            )
+        finally:
+            stop_server(server)
+
+    results = pd.DataFrame(rows)
+    results["speedup"] = results["requests_per_s"] / results["requests_per_s"].iloc[0]
+    logger.info(f"CPU cores available: {len(os.sched_getaffinity(0))}")
+    logger.info("Multi-worker benchmark:\n" + results.round(1).to_string(index=False))
+
+
+@app.command()
+def arrow(
+    row_counts: Annotated[list[int], typer.Option("--rows")] = ROW_COUNTS,
+    repeats: int = 3,
+    port: int = 8765,
+    model_format: str = "joblib",  # "joblib" or "export"
+):
+    """
+    End-to-end time (encode, send, score, decode) of bulk scoring through the JSON
+    /predict/batch endpoint vs the Arrow IPC /predict/arrow endpoint, on one worker.
+    """
+    rows = []
+    # A million-row JSON request takes longer than gunicorn's default 30 s worker timeout
+    server = start_server(1, port, {"MODEL_FORMAT": model_format, "GUNICORN_TIMEOUT": "600"})
+    try:
+        wait_until_healthy(port)
+        for n_rows in row_counts:
+            df = sample_frame(n_rows)
+
+            def via_json(df=df):
+                body = json.dumps(df.to_dict(orient="records")).encode()
+                content = post(port, "/predict/batch", body, {"Content-Type": "application/json"})
+                return pd.DataFrame(json.loads(content))["probability"].to_numpy()
+
+            def via_arrow(df=df):
+                body = write_arrow_stream(pa.Table.from_pandas(df, preserve_index=False))
+                content = post(
+                    port, "/predict/arrow", body, {"Content-Type": ARROW_STREAM_MEDIA_TYPE}
+                )
+                return pa.ipc.open_stream(content).read_all()["probability"].to_numpy()
+
+            for name, run in (("json", via_json), ("arrow", via_arrow)):
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    probabilities = run()
+                    timings.append(time.perf_counter() - start)
+                rows.append(
+                    {
+                        "rows": n_rows,
+                        "path": name,
+                        "seconds": float(np.median(timings)),
+                        "rows_per_s": n_rows / float(np.median(timings)),
+                        "mean_probability": float(probabilities.mean()),
+                    }
+                )
+                logger.info(f"{n_rows} rows via {name}: {np.median(timings):.3f} s")
+    finally:
+        stop_server(server)
+
+    logger.info("Bulk scoring benchmark:\n" + pd.DataFrame(rows).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,48 @@
+# Multi-worker serving: gunicorn -c affordable_housing/api/gunicorn_conf.py affordable_housing.api.main:app
+#
+# The app and the model are loaded once in the master process (preload_app + when_ready) and the
+# workers are forked from it, so every worker shares one read-only copy of the model parameters
+# through copy-on-write pages (or the page cache, for MODEL_FORMAT=export memory-mapped arrays).
+import gc
+import os
+
+
+def default_workers() -> int:
+    """Number of cores available to this process (respects container CPU affinity)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", default_workers()))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+keepalive = 5
+# Seconds a worker may spend on one request before it is killed and restarted
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+
+
+def when_ready(server):
+    """Load the model in the master before workers are forked."""
+    from affordable_housing.api.main import (
+        load_artifacts,
+        load_columnar_scorer,
+        load_contribution_table,
+    )
+
+    load_artifacts()
+    load_contribution_table()
+    load_columnar_scorer()
+    # Candidate and shadow versions of the routing policy, if one is deployed
+    from affordable_housing.api.registry import load_routing_policy, load_version, policy_versions
+    from affordable_housing.config import ROUTING_POLICY_PATH
+
+    if ROUTING_POLICY_PATH.exists():
+        for name in policy_versions(load_routing_policy(ROUTING_POLICY_PATH)):
+            load_version(name)
+    # Move everything allocated so far out of the GC's reach so collections in the workers do
+    # not write to (and so un-share) the pages holding the model
+    gc.freeze()
+    server.log.info(f"Model preloaded, forking {server.num_workers} workers")
@@ -0,0 +1,274 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import sqlite3
+import time
+import uuid
+
+from loguru import logger
+
+from affordable_housing.api.artifacts import load_artifacts
+from affordable_housing.modeling.applicants import read_round_file
+from affordable_housing.modeling.transform_predict import score_round
+
+ROUND_FILE_SUFFIXES = (".xlsx", ".xls", ".csv", ".parquet")
+JOB_NICENESS = 10  # pool processes yield the CPU to the interactive /predict workers
+# Pool processes are started by a fork server rather than forked from the API process, which
+# by then runs the drift monitor and prediction log threads: a forked child could inherit a
+# lock one of them holds (logging, queues, BLAS) and hang on it
+POOL_START_METHOD = "forkserver"
+
+CREATE_JOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,  -- uploading, queued, running, succeeded, failed
+    filename TEXT NOT NULL,
+    input_path TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    options TEXT NOT NULL,  -- JSON: decision_threshold, explain
+    worker_pid INTEGER,  -- process uploading or running the job
+    worker_started TEXT,  -- process_started(worker_pid), so a reused pid is not mistaken for it
+    n_rows INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_started(pid: int) -> str | None:
+    """
+    Boot id and start time (clock ticks since boot) of a process, which together identify it
+    across pid reuse and reboots; None where /proc is not available or the process is gone.
+    """
+    try:
+        boot_id = Path("/proc/sys/kernel/random/boot_id").read_text().strip()
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # The command name in field 2 may contain spaces, so count fields after its ')'
+    return f"{boot_id}:{stat.rsplit(')', 1)[1].split()[19]}"
+
+
+def process_alive(pid: int | None, started: str | None) -> bool:
+    """Whether the process recorded as (pid, process_started(pid)) is still running."""
+    if pid is None or not pid_alive(pid):
+        return False
+    return started is None or process_started(pid) in (started, None)
+
+
+class JobStore:
+    """Round scoring job state in a local SQLite database, shared by all API processes."""
+
+    def __init__(self, jobs_dir: Path):
+        self.jobs_dir = Path(jobs_dir)
+        self.inputs_dir = self.jobs_dir / "inputs"
+        self.results_dir = self.jobs_dir / "results"
+        self.db_path = self.jobs_dir / "jobs.sqlite"
+        self.inputs_dir.mkdir(parents=True, exist_ok=True)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.execute("PRAGMA journal_mode=WAL")  # readers do not wait on the running job's writes
+        self.execute(CREATE_JOBS_TABLE)
+        columns, _ = self.execute("PRAGMA table_info(jobs)")
+        if "worker_started" not in {column["name"] for column in columns}:
+            try:
+                self.execute("ALTER TABLE jobs ADD COLUMN worker_started TEXT")
+            except sqlite3.OperationalError:
+                pass  # added by another API worker in the meantime
+
+    def execute(self, sql: str, params: tuple = ()):
+        """Run one statement in its own transaction; return (rows, rowcount)."""
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                cursor = connection.execute(sql, params)
+                return [dict(row) for row in cursor.fetchall()], cursor.rowcount
+        finally:
+            connection.close()
+
+    def create(self, filename: str, options: dict) -> dict:
+        """
+        Register a job in the "uploading" state; the caller writes the upload to
+        job["input_path"] and then calls queue(), so no worker picks up a partial file.
+        """
+        job_id = uuid.uuid4().hex
+        suffix = Path(filename).suffix.lower()
+        pid = os.getpid()
+        self.execute(
+            "INSERT INTO jobs (id, status, filename, input_path, output_path, options, worker_pid,"
+            " worker_started, created_at) VALUES (?, 'uploading', ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id,
+                filename,
+                str(self.inputs_dir / f"{job_id}{suffix}"),
+                str(self.results_dir / f"{job_id}.csv"),
+                json.dumps(options),
+                pid,
+                process_started(pid),
+                time.time(),
+            ),
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> dict | None:
+        rows, _ = self.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = rows[0]
+        job["options"] = json.loads(job["options"])
+        return job
+
+    def queue(self, job_id: str) -> None:
+        self.execute(
+            "UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'uploading'", (job_id,)
+        )
+
+    def claim(self, job_id: str, pid: int) -> bool:
+        """Atomically move a queued job to running; False if another process got it first."""
+        _, count = self.execute(
+            "UPDATE jobs SET status = 'running', worker_pid = ?, worker_started = ?,"
+            " started_at = ? WHERE id = ? AND status = 'queued'",
+            (pid, process_started(pid), time.time(), job_id),
+        )
+        return count == 1
+
+    def succeed(self, job_id: str, n_rows: int) -> None:
+        self.execute(
+            "UPDATE jobs SET status = 'succeeded', n_rows = ?, finished_at = ? WHERE id = ?",
+            (n_rows, time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+            (error, time.time(), job_id),
+        )
+
+    def requeue_orphans(self) -> int:
+        """Put back running jobs whose process died (server restart or crashed pool process)."""
+        rows, _ = self.execute(
+            "SELECT id, worker_pid, worker_started FROM jobs WHERE status = 'running'"
+        )
+        requeued = 0
+        for row in rows:
+            if not process_alive(row["worker_pid"], row["worker_started"]):
+                _, count = self.execute(
+                    "UPDATE jobs SET status = 'queued', worker_pid = NULL, worker_started = NULL,"
+                    " started_at = NULL WHERE id = ? AND status = 'running' AND worker_pid IS ?"
+                    " AND worker_started IS ?",
+                    (row["id"], row["worker_pid"], row["worker_started"]),
+                )
+                requeued += count
+        return requeued
+
+    def fail_abandoned_uploads(self) -> int:
+        """Fail jobs still uploading whose server process died before it queued them."""
+        rows, _ = self.execute(
+            "SELECT id, worker_pid, worker_started FROM jobs WHERE status = 'uploading'"
+        )
+        failed = 0
+        for row in rows:
+            if not process_alive(row["worker_pid"], row["worker_started"]):
+                _, count = self.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?"
+                    " WHERE id = ? AND status = 'uploading'",
+                    ("Upload interrupted by a server restart", time.time(), row["id"]),
+                )
+                failed += count
+        return failed
+
+    def queued_ids(self) -> list[str]:
+        rows, _ = self.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at")
+        return [row["id"] for row in rows]
+
+
+def lower_priority() -> None:
+    os.nice(JOB_NICENESS)
+
+
+def run_job(jobs_dir: Path, job_id: str) -> None:
+    """
+    Score one round file in a pool process: set-aside transform, rename, preprocess, score
+    and threshold (see transform_predict.score_round), then write the result csv.
+    """
+    store = JobStore(jobs_dir)
+    if not store.claim(job_id, os.getpid()):
+        return  # already taken by another API worker's pool
+    job = store.get(job_id)
+    try:
+        logger.info(f"Job {job_id}: scoring {job['filename']}")
+        model, preprocessor = load_artifacts()  # cached: loaded on the process's first job
+        raw_df = read_round_file(Path(job["input_path"]))
+        output_df = score_round(
+            raw_df,
+            model,
+            preprocessor,
+            job["options"].get("decision_threshold"),
+            job["options"].get("explain", False),
+        )
+        # Write then rename so a result file is never seen half-written
+        output_path = Path(job["output_path"])
+        partial_path = output_path.with_suffix(".partial")
+        output_df.to_csv(partial_path, index=False)
+        partial_path.replace(output_path)
+        store.succeed(job_id, len(output_df))
+        logger.success(f"Job {job_id}: {len(output_df)} rows scored")
+    except Exception as e:
+        logger.exception(f"Job {job_id} failed")
+        store.fail(job_id, f"{type(e).__name__}: {e}")
+
+
+class JobRunner:
+    """Background process pool that runs the queued jobs of a JobStore."""
+
+    def __init__(self, jobs_dir: Path, max_workers: int = 1):
+        self.jobs_dir = Path(jobs_dir)
+        self.max_workers = max_workers
+        self.store = None
+        self.pool = None
+
+    def start(self) -> None:
+        """Open the store, start the pool and resume jobs left queued or interrupted."""
+        self.store = JobStore(self.jobs_dir)
+        self.pool = ProcessPoolExecutor(
+            self.max_workers,
+            mp_context=multiprocessing.get_context(POOL_START_METHOD),
+            initializer=lower_priority,
+        )
+        requeued = self.store.requeue_orphans()
+        if requeued:
+            logger.warning(f"Requeued {requeued} interrupted jobs")
+        abandoned = self.store.fail_abandoned_uploads()
+        if abandoned:
+            logger.warning(f"Failed {abandoned} jobs whose upload was interrupted")
+        for job_id in self.store.queued_ids():
+            self.submit(job_id)
+
+    def submit(self, job_id: str) -> None:
+        try:
+            self.pool.submit(run_job, self.jobs_dir, job_id)
+        except BrokenProcessPool:
+            # A pool process was killed (e.g. out of memory): its job is orphaned, start over
+            logger.error("Job pool is broken, restarting it")
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.start()  # resubmits every queued job, this one included
+
+    def shutdown(self) -> None:
+        """Stop taking work; jobs not started yet stay queued in the store for the next start."""
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
@@ -1,16 +1,103 @@
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Union
+import shutil
+import time
+from typing import Annotated
+import uuid
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-import joblib
+from fastapi.responses import FileResponse
 from loguru import logger
+import numpy as np
 import pandas as pd
-from pydantic import BaseModel
+import pyarrow as pa
+from pydantic import BaseModel, Field
+
+from affordable_housing.api.artifacts import (
+    load_artifacts,
+    model_available,
+    model_version,
+    source_model_version,
+)
+from affordable_housing.api.jobs import ROUND_FILE_SUFFIXES, JobRunner
+from affordable_housing.api.registry import PRIMARY, ModelRegistry, load_routing_policy
+from affordable_housing.config import (
+    BOOTSTRAP_PATH,
+    DRIFT_REFERENCE_PATH,
+    JOB_WORKERS,
+    JOBS_DIR,
+    MODELS_DIR,
+    PREDICTION_LOG_DIR,
+    PREDICTION_LOGGING,
+    ROUTING_POLICY_PATH,
+    SIMILAR_INDEX_PATH,
+)
+from affordable_housing.drift import PSI_THRESHOLD, DriftMonitor
+from affordable_housing.modeling.artifact import (
+    ExportedModel,
+    ExportedPreprocessor,
+)
+from affordable_housing.modeling.bootstrap import INTERVAL_LEVEL, BootstrapEnsemble
+from affordable_housing.modeling.columnar import (
+    ARROW_STREAM_MEDIA_TYPE,
+    ColumnarScorer,
+    read_arrow_body,
+    score_arrow_table,
+    write_arrow_stream,
+)
+from affordable_housing.modeling.decision import decision_threshold, predict_labels
+from affordable_housing.modeling.explain import ContributionTable, build_contribution_table
+from affordable_housing.modeling.explain import explain as explain_contributions
+from affordable_housing.modeling.export import to_artifact
+from affordable_housing.modeling.sensitivity import MAX_GRID_POINTS, NUMERIC_FIELDS, sensitivity
+from affordable_housing.modeling.similar import SimilarityIndex
+from affordable_housing.prediction_log import (
+    PredictionLogger,
+    prediction_records,
+)
+from affordable_housing.validation import CATEGORICAL_INPUTS, category_vocabulary, input_model
+
+job_runner = JobRunner(JOBS_DIR, JOB_WORKERS)
+# Sketches of the inputs this worker process has scored, when a reference profile is deployed
+drift_monitor: DriftMonitor | None = None
+prediction_logger: PredictionLogger | None = None
+# Candidate and shadow model versions, when a routing policy is deployed
+model_registry: ModelRegistry | None = None
 
-from affordable_housing.config import MODELS_DIR
 
-app = FastAPI(title="Affordable Housing Prediction API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global drift_monitor, prediction_logger, model_registry
+    # Runs in every server worker process, after gunicorn has forked it
+    job_runner.start()
+    if DRIFT_REFERENCE_PATH.exists():
+        drift_monitor = DriftMonitor.from_path(DRIFT_REFERENCE_PATH)
+        drift_monitor.start()
+    if PREDICTION_LOGGING:
+        prediction_logger = PredictionLogger(PREDICTION_LOG_DIR).start()
+    if ROUTING_POLICY_PATH.exists() and model_available():
+        model_registry = ModelRegistry(
+            load_artifacts(),
+            model_version(),
+            load_routing_policy(ROUTING_POLICY_PATH),
+            prediction_logger=prediction_logger,
+        ).start()
+    yield
+    if model_registry is not None:
+        model_registry.stop()  # before the logger, which takes the shadow records
+    if prediction_logger is not None:
+        prediction_logger.stop()  # writes what is still buffered
+    if drift_monitor is not None:
+        drift_monitor.stop()
+    job_runner.shutdown()
+
+
+app = FastAPI(title="Affordable Housing Prediction API", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -22,77 +109,594 @@ app.add_middleware(
 )
 
 
-# Pydantic model for input data
-class PredictionInput(BaseModel):
-    avg_targeted_affordability: float
-    CDLAC_total_points_score: int
-    CDLAC_tie_breaker_self_score: float
-    bond_request_amount: float
-    homeless_percent: float
-    construction_type: str
-    housing_type: str
-    CDLAC_pool_type: str
-    new_construction_set_aside: str
-    CDLAC_region: str
+def served_vocabulary() -> dict[str, list[str]] | None:
+    """Category vocabulary of the served preprocessor, None when no model is deployed."""
+    if not model_available():
+        return None
+    _, preprocessor = load_artifacts()
+    return category_vocabulary(preprocessor)
+
+
+# Pydantic model for input data, generated from the served encoder's categories: an unknown
+# category is rejected with a 422 before any pandas or sklearn work (validation.py)
+PredictionInput = input_model(served_vocabulary())
+# Endpoints whose scored inputs the drift monitor sketches
+DRIFT_MONITORED_PATHS = ("/predict", "/predict/batch")
+
+
+def rejected_categories(errors: list) -> dict[str, list]:
+    """Raw values of categorical fields that failed validation as unknown categories."""
+    rejected = {}
+    for error in errors:
+        field = error["loc"][-1] if error["loc"] else None
+        if error["type"] == "enum" and field in CATEGORICAL_INPUTS:
+            rejected.setdefault(field, []).append(error["input"])
+    return rejected
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    """
+    The default 422 response. Unknown categories are rejected here, before the endpoints that
+    feed the drift monitor, so they are passed to it from this handler.
+    """
+    if drift_monitor is not None and request.url.path in DRIFT_MONITORED_PATHS:
+        rejected = rejected_categories(exc.errors())
+        if rejected:
+            drift_monitor.submit_rejected(rejected)
+    return await request_validation_exception_handler(request, exc)
 
 
 # Pydantic model for output data
 class PredictionOutput(BaseModel):
     prediction: int  # 1 for "Yes", 0 for "No"
     probability: float  # probability of award
+    contributions: dict[str, float] | None = None  # log-odds per input field, if explain=true
+    intercept: float | None = None
+    # Bootstrap replicas (bootstrap.py), when an ensemble is deployed: mean and central interval
+    probability_mean: float | None = None
+    probability_lower: float | None = None
+    probability_upper: float | None = None
+    model_version: str | None = None  # registry version that answered, when routing is on
+
+
+class FieldRange(BaseModel):
+    start: float
+    stop: float
+    num: int = Field(default=11, ge=2, le=1000)  # number of evenly spaced values
+
+
+class SensitivityInput(BaseModel):
+    input: PredictionInput
+    ranges: dict[str, FieldRange]  # keyed by numeric PredictionInput field names
+
+
+class Suggestion(BaseModel):
+    field: str
+    current: float
+    required: float | None  # closest value in the range reaching the threshold
+    change: float | None
+    probability: float | None
+
+
+class Combination(BaseModel):
+    values: dict[str, float]
+    probability: float
+
+
+class SensitivityOutput(BaseModel):
+    threshold: float
+    base_probability: float
+    axes: dict[str, list[float]]
+    surface: list  # nested probabilities, one level per axis in `axes` order
+    suggestions: list[Suggestion]
+    best_combination: Combination | None
+
+
+class SimilarApplication(BaseModel):
+    application_number: str
+    round: str
+    awarded: int  # 1 for "Yes", 0 for "No"
+    distance: float  # euclidean, in the preprocessor's feature space
+
+
+class FieldDrift(BaseModel):
+    field: str
+    kind: str  # numeric or categorical
+    n: int  # non-missing values seen
+    psi: float | None
+    ks: float | None  # on the reference bins, numeric fields only
+    missing_rate: float
+    unseen_rate: float  # values outside the encoder's vocabulary, which it ignores
+    unseen_categories: list[str]
+    drifted: bool
+
+
+class DriftStatus(BaseModel):
+    n_observed: int
+    rejected: int  # requests rejected (422) for categories outside the encoder's vocabulary
+    dropped: int  # inputs not sketched because the monitor's queue was full
+    psi_threshold: float
+    fields: list[FieldDrift]
+
+
+class ModelVersionStatus(BaseModel):
+    name: str  # "primary" or the version directory under models/versions
+    role: str  # primary, candidate or shadow
+    model_version: str  # content hash of model.pkl, as in the prediction log
+    traffic_percent: float  # share of responses routed to it
+    n: int  # inputs scored
+    positive_rate: float | None
+    mean_probability: float | None
+    latency_ms_mean: float | None  # over the latest 1000 scored requests
+    latency_ms_p50: float | None
+    latency_ms_p95: float | None
+    compared: int  # shadow predictions on inputs the primary answered
+    agreement: float | None  # share of those with the primary's prediction
+    mean_abs_probability_difference: float | None
+
+
+class RegistryStatus(BaseModel):
+    candidate: str | None
+    candidate_percent: float
+    shadow: list[str]
+    dropped: int  # inputs not shadow-scored because the queue was full
+    versions: list[ModelVersionStatus]
+
+
+class JobStatus(BaseModel):
+    id: str
+    status: str  # uploading, queued, running, succeeded or failed
+    filename: str
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    n_rows: int | None = None
+    error: str | None = None
+    download_url: str | None = None  # set once the job has succeeded
+
+
+def job_status(job: dict) -> JobStatus:
+    download_url = f"/jobs/{job['id']}/result" if job["status"] == "succeeded" else None
+    return JobStatus(
+        **{field: job[field] for field in JobStatus.model_fields if field in job},
+        download_url=download_url,
+    )
+
+
+@lru_cache(maxsize=4)
+def log_predictions(
+    inputs: list[dict],
+    predictions,
+    probabilities,
+    start: float,
+    application_numbers=None,
+    version: str | None = None,
+    request_ids=None,
+) -> None:
+    """Queue a scored request (its input dicts) for the prediction log, if logging is on."""
+    if prediction_logger is None:
+        return
+    latency_ms = (time.perf_counter() - start) * 1000
+    prediction_logger.log(
+        prediction_records(
+            inputs,
+            predictions,
+            probabilities,
+            latency_ms,
+            version or model_version(),
+            "api",
+            application_numbers,
+            request_ids,
+        )
+    )
+
+
+def record_served(
+    name: str,
+    inputs: list[dict],
+    predictions,
+    probabilities,
+    start: float,
+    scoring_start: float,
+    application_numbers=None,
+) -> None:
+    """
+    Log a response scored by version `name`; with a model registry, also record its latency
+    and submit the inputs to the shadow versions.
+    """
+    if model_registry is None:
+        log_predictions(inputs, predictions, probabilities, start, application_numbers)
+        return
+    latency_ms = (time.perf_counter() - scoring_start) * 1000
+    request_ids = [uuid.uuid4().hex for _ in inputs]
+    log_predictions(
+        inputs,
+        predictions,
+        probabilities,
+        start,
+        application_numbers,
+        model_registry.model_versions[name],
+        request_ids,
+    )
+    model_registry.record(name, predictions, probabilities, latency_ms)
+    model_registry.submit_shadow(inputs, name, predictions, probabilities, request_ids)
+
+
+@lru_cache(maxsize=4)
+def load_columnar_scorer(
+    model_path: Path = MODELS_DIR / "model.pkl",
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+) -> ColumnarScorer:
+    """Build the column-wise linear scorer for bulk scoring once per loaded model."""
+    model, preprocessor = load_artifacts(model_path, preprocessor_path)
+    if not isinstance(model, ExportedModel):
+        manifest, arrays = to_artifact(model, preprocessor)
+        model, preprocessor = (
+            ExportedModel(manifest, arrays),
+            ExportedPreprocessor(manifest, arrays),
+        )
+    return ColumnarScorer(model, preprocessor)
+
+
+@lru_cache(maxsize=4)
+def load_bootstrap_ensemble(
+    model_path: Path = MODELS_DIR / "model.pkl",
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+) -> BootstrapEnsemble | None:
+    """Load the bootstrap replicas once, or None when none are deployed or they are stale."""
+    if not BOOTSTRAP_PATH.exists():
+        return None
+    ensemble = BootstrapEnsemble.load(BOOTSTRAP_PATH)
+    # Replicas of another model would serve an interval around the wrong probability
+    served_version = source_model_version(model_path)
+    if ensemble.model_version is None or ensemble.model_version != served_version:
+        logger.warning(
+            f"{BOOTSTRAP_PATH} was fitted for model {ensemble.model_version}, not the served "
+            f"{served_version}; serving no interval until bootstrap.py is rerun"
+        )
+        return None
+    _, preprocessor = load_artifacts(model_path, preprocessor_path)
+    feature_names = np.asarray(preprocessor.get_feature_names_out()).astype(str)
+    if ensemble.feature_names is not None and not np.array_equal(
+        ensemble.feature_names, feature_names
+    ):
+        logger.warning(f"{BOOTSTRAP_PATH} was fitted on other features, serving no interval")
+        return None
+    logger.info(f"Loaded {ensemble.n_replicas} bootstrap replicas from {BOOTSTRAP_PATH}")
+    return ensemble
+
+
+@lru_cache(maxsize=4)
+def load_similarity_index(
+    model_path: Path = MODELS_DIR / "model.pkl",
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+) -> SimilarityIndex | None:
+    """Load the historical applications index once, or None when missing or stale."""
+    if not SIMILAR_INDEX_PATH.exists():
+        return None
+    index = SimilarityIndex.load(SIMILAR_INDEX_PATH)
+    _, preprocessor = load_artifacts(model_path, preprocessor_path)
+    feature_names = np.asarray(preprocessor.get_feature_names_out()).astype(str)
+    if index.feature_names is not None and not np.array_equal(index.feature_names, feature_names):
+        logger.warning(f"{SIMILAR_INDEX_PATH} was built on other features, ignoring it")
+        return None
+    logger.info(f"Loaded {len(index)} historical applications from {SIMILAR_INDEX_PATH}")
+    return index
+
+
+@lru_cache(maxsize=4)
+def load_contribution_table(
+    model_path: Path = MODELS_DIR / "model.pkl",
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+) -> ContributionTable:
+    """Precompute the coefficient table used for explanations once per loaded model."""
+    return build_contribution_table(*load_artifacts(model_path, preprocessor_path))
 
 
 def predict(
     user_input: pd.DataFrame,
     model_path: Path = MODELS_DIR / "model.pkl",
     preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
-) -> Dict[str, Union[int, float]]:
+    explain: bool = False,
+) -> dict[str, int | float | dict[str, float]]:
     """Perform inference on input features using the specified model. Use for API endpoint.
 
     Args:
         model_path (Path): Path to the trained model (.pkl file).
         features (pd.DataFrame): Input features for prediction.
+        explain (bool): Also return per-field log-odds contributions.
 
     Returns:
-        dictionary: Predicted labels and probability
+        dictionary: Predicted labels and probability, the bootstrap mean and interval if an
+            ensemble is deployed, plus contributions if explain is set
     """
-    logger.info("Loading model...")
-    model = joblib.load(model_path)
-    preprocessor = joblib.load(preprocessor_path)
+    model, preprocessor = load_artifacts(model_path, preprocessor_path)
 
     logger.info("Preprocessing input...")
     transformed_features = preprocessor.transform(user_input)
     logger.info("Performing inference...")
-    prediction = model.predict(transformed_features)
-    prob = model.predict_proba(transformed_features)[:, 1][0]
+    probabilities = model.predict_proba(transformed_features)[:, 1]
+    prediction = predict_labels(model, probabilities)
+    prob = probabilities[0]
     logger.info(f"prediction: {prediction}")
     logger.info(f"probability: {prob}")
 
-    return {"prediction": prediction, "probability": prob}
+    result = {"prediction": prediction, "probability": prob}
+    ensemble = load_bootstrap_ensemble(model_path, preprocessor_path)
+    if ensemble is not None:
+        mean, lower, upper = ensemble.predict_interval(transformed_features, INTERVAL_LEVEL)
+        result["probability_mean"] = mean[0]
+        result["probability_lower"] = lower[0]
+        result["probability_upper"] = upper[0]
+    if explain:
+        table = load_contribution_table(model_path, preprocessor_path)
+        contributions = explain_contributions(transformed_features, table)
+        result["contributions"] = contributions.iloc[0].to_dict()
+        result["intercept"] = table.intercept
+    return result
 
 
 @app.post("/predict", response_model=PredictionOutput)
-async def predict_endpoint(input: PredictionInput):
-    """Predict whether a housing project will receive funding."""
+async def predict_endpoint(
+    input: PredictionInput, explain: bool = False, application_number: str | None = None
+):
+    """
+    Predict whether a housing project will receive funding. `application_number` is recorded
+    in the prediction log, so the input can be labeled once the round is awarded, and keeps a
+    project on the same version under A/B routing.
+    """
+    start = time.perf_counter()
     try:
         # Convert input to DataFrame
-        input_data = pd.DataFrame([input.dict()])
+        record = input.dict()
+        input_data = pd.DataFrame([record])
+        if drift_monitor is not None:
+            drift_monitor.submit(input_data)
 
         # Load model and perform inference
-        model_path = MODELS_DIR / "model.pkl"
-        if not model_path.exists():
+        if not model_available():
             raise HTTPException(status_code=500, detail="Model file not found")
 
-        result = predict(input_data)
+        name = PRIMARY
+        if model_registry is not None and not explain:  # explanations are the primary's
+            name = model_registry.route(application_number)
+        scoring_start = time.perf_counter()
+        if name == PRIMARY:
+            result = predict(input_data, explain=explain)
+        else:
+            predictions, probabilities, _ = model_registry.score(name, input_data)
+            result = {"prediction": predictions, "probability": probabilities[0]}
+        record_served(
+            name,
+            [record],
+            result["prediction"],
+            [result["probability"]],
+            start,
+            scoring_start,
+            [application_number],
+        )
+        if model_registry is not None:
+            result["model_version"] = name
 
         # Format response
         return result
 
     except Exception as e:
-        logger.error(f"Error during prediction: {str(e)}")
+        logger.exception("Error during prediction")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/predict/batch", response_model=list[PredictionOutput])
+async def predict_batch_endpoint(inputs: list[PredictionInput]):
+    """Predict a batch of housing projects sent as JSON records."""
+    start = time.perf_counter()
+    try:
+        if not model_available():
+            raise HTTPException(status_code=500, detail="Model file not found")
+        model, preprocessor = load_artifacts()
+        records = [i.dict() for i in inputs]
+        input_data = pd.DataFrame(records)
+        if drift_monitor is not None:
+            drift_monitor.submit(input_data)
+        name = PRIMARY if model_registry is None else model_registry.route()
+        scoring_start = time.perf_counter()
+        if name == PRIMARY:
+            transformed_features = preprocessor.transform(input_data)
+            probabilities = model.predict_proba(transformed_features)[:, 1]
+            predictions = predict_labels(model, probabilities)
+        else:
+            predictions, probabilities, _ = model_registry.score(name, input_data)
+        record_served(name, records, predictions, probabilities, start, scoring_start)
+        version = None if model_registry is None else name
+        return [
+            {
+                "prediction": int(prediction),
+                "probability": float(probability),
+                "model_version": version,
+            }
+            for prediction, probability in zip(predictions, probabilities)
+        ]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error during batch prediction")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/predict/arrow")
+async def predict_arrow_endpoint(request: Request):
+    """
+    Bulk scoring, columnar to columnar: the body is an Arrow IPC stream (or a Parquet file)
+    with the ten PredictionInput columns; the response is an Arrow IPC stream with
+    prediction and probability columns (and application_number, when sent).
+    """
+    if not model_available():
+        raise HTTPException(status_code=500, detail="Model file not found")
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+
+    def score() -> bytes:
+        table = read_arrow_body(body, content_type)
+        return write_arrow_stream(score_arrow_table(table, load_columnar_scorer()))
+
+    try:
+        # Scoring is CPU-bound; keep it off the event loop
+        content = await run_in_threadpool(score)
+    except (ValueError, pa.ArrowException) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(content=content, media_type=ARROW_STREAM_MEDIA_TYPE)
+
+
+@app.post("/predict/sensitivity", response_model=SensitivityOutput)
+async def sensitivity_endpoint(request: SensitivityInput):
+    """Score a grid of numeric changes around one project in a single vectorized call."""
+    unknown = sorted(set(request.ranges) - set(NUMERIC_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Ranges only allowed for {NUMERIC_FIELDS}")
+    if not request.ranges:
+        raise HTTPException(status_code=422, detail="At least one range is required")
+    n_points = int(np.prod([r.num for r in request.ranges.values()]))
+    if n_points > MAX_GRID_POINTS:
+        raise HTTPException(
+            status_code=422, detail=f"Grid has {n_points} points, limit is {MAX_GRID_POINTS}"
+        )
+
+    try:
+        if not model_available():
+            raise HTTPException(status_code=500, detail="Model file not found")
+        model, preprocessor = load_artifacts()
+
+        def score(features: pd.DataFrame) -> np.ndarray:
+            return model.predict_proba(preprocessor.transform(features))[:, 1]
+
+        axes = {field: np.linspace(r.start, r.stop, r.num) for field, r in request.ranges.items()}
+        # Up to MAX_GRID_POINTS rows: score off the event loop, like /predict/arrow
+        return await run_in_threadpool(
+            sensitivity, request.input.dict(), axes, score, decision_threshold(model)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error during sensitivity analysis")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/similar", response_model=list[SimilarApplication])
+async def similar_endpoint(input: PredictionInput, k: Annotated[int, Query(ge=1, le=50)] = 5):
+    """The k most similar historical applications (nearest first) and whether they won."""
+    if not model_available():
+        raise HTTPException(status_code=500, detail="Model file not found")
+    index = load_similarity_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Similar-applications index not available")
+    _, preprocessor = load_artifacts()
+    try:
+        transformed_features = preprocessor.transform(pd.DataFrame([input.dict()]))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    neighbours = index.neighbours(transformed_features, k)
+    return neighbours.drop(columns=["query", "rank"]).to_dict(orient="records")
+
+
+@app.post("/jobs", response_model=JobStatus, status_code=202)
+async def create_job(
+    file: Annotated[UploadFile, File()],
+    decision_threshold: Annotated[float | None, Form()] = None,
+    explain: Annotated[bool, Form()] = False,
+):
+    """
+    Queue a whole-round scoring job for an applicant list (xlsx/csv/parquet, same columns as
+    transform_predict.py). Poll GET /jobs/{id} until it has a download_url.
+    """
+    filename = Path(file.filename or "").name
+    if Path(filename).suffix.lower() not in ROUND_FILE_SUFFIXES:
+        raise HTTPException(
+            status_code=422, detail=f"Round file must be one of {', '.join(ROUND_FILE_SUFFIXES)}"
+        )
+    store = job_runner.store
+    job = store.create(filename, {"decision_threshold": decision_threshold, "explain": explain})
+
+    def save_upload():
+        with open(job["input_path"], "wb") as f:
+            shutil.copyfileobj(file.file, f)
+
+    def discard_upload(error: str) -> None:
+        # Otherwise the job would stay "uploading" forever: no worker ever picks it up
+        store.fail(job["id"], f"Upload failed: {error}")
+        Path(job["input_path"]).unlink(missing_ok=True)
+
+    try:
+        await run_in_threadpool(save_upload)
+    except Exception as e:
+        logger.exception(f"Upload of job {job['id']} failed")
+        discard_upload(f"{type(e).__name__}: {e}")
+        raise HTTPException(status_code=500, detail=f"Upload failed: {e}")
+    except BaseException:
+        discard_upload("request cancelled")  # e.g. the client disconnected
+        raise
+    store.queue(job["id"])
+    job_runner.submit(job["id"])
+    logger.info(f"Queued job {job['id']} for {filename}")
+    return job_status(store.get(job["id"]))
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = job_runner.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = job_runner.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    stem = Path(job["filename"]).stem
+    return FileResponse(
+        job["output_path"], media_type="text/csv", filename=f"{stem}-predictions.csv"
+    )
+
+
+@app.get("/monitoring/drift", response_model=DriftStatus)
+async def drift_status():
+    """
+    PSI / KS of the inputs this worker has scored (/predict and /predict/batch) against the
+    training reference profile. Unseen category rates also count requests rejected for them.
+    """
+    if drift_monitor is None:
+        raise HTTPException(status_code=503, detail="No drift reference profile deployed")
+    report = drift_monitor.report()
+    report["drifted"] = (report["psi"].fillna(0) > PSI_THRESHOLD) | (report["unseen_rate"] > 0)
+    return {
+        "n_observed": drift_monitor.n,
+        "rejected": drift_monitor.rejected,
+        "dropped": drift_monitor.dropped,
+        "psi_threshold": PSI_THRESHOLD,
+        "fields": report.replace({np.nan: None}).to_dict(orient="records"),
+    }
+
+
+@app.get("/models", response_model=RegistryStatus)
+async def registry_status():
+    """Routing policy and the predictions and latencies of each model version in this worker."""
+    if model_registry is None:
+        raise HTTPException(status_code=503, detail="No routing policy deployed")
+    return {
+        "candidate": model_registry.policy["candidate"],
+        "candidate_percent": model_registry.policy["candidate_percent"],
+        "shadow": model_registry.policy["shadow"],
+        "dropped": model_registry.dropped,
+        "versions": model_registry.report(),
+    }
+
+
 @app.get("/health")
 async def health_check():
     """Check if the API is running."""
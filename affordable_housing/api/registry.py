@@ -0,0 +1,279 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import random
+import threading
+import time
+import zlib
+
+import joblib
+from loguru import logger
+import numpy as np
+import pandas as pd
+
+from affordable_housing.api.jobs import POOL_START_METHOD
+from affordable_housing.config import MODEL_VERSIONS_DIR, ROUTING_POLICY_PATH
+from affordable_housing.modeling.decision import predict_labels
+from affordable_housing.prediction_log import file_version, prediction_records
+
+PRIMARY = "primary"  # the served model.pkl (or export), always in the registry
+LATENCY_WINDOW = 1000  # latest latencies kept per version for the percentiles
+SHADOW_NICENESS = 10  # the shadow process yields the CPU to the workers answering requests
+
+
+def load_routing_policy(path: Path = ROUTING_POLICY_PATH) -> dict:
+    """
+    Read a routing policy, e.g. {"candidate": "20250801T120000Z", "candidate_percent": 10,
+    "shadow": ["20250901T120000Z"]}. Versions are directory names under MODEL_VERSIONS_DIR,
+    as published by refresh.py.
+    """
+    policy = {"candidate": None, "candidate_percent": 0.0, "shadow": []}
+    policy.update(json.loads(Path(path).read_text()))
+    if not 0 <= policy["candidate_percent"] <= 100:
+        raise ValueError(
+            f"candidate_percent must be in [0, 100], got {policy['candidate_percent']}"
+        )
+    if policy["candidate"] in policy["shadow"]:
+        raise ValueError(f"{policy['candidate']} cannot be both the candidate and a shadow")
+    return policy
+
+
+def policy_versions(policy: dict) -> list:
+    """Versions a policy needs loaded, candidate first."""
+    return ([policy["candidate"]] if policy["candidate"] else []) + list(policy["shadow"])
+
+
+@lru_cache(maxsize=8)
+def load_version(name: str, versions_dir: Path = MODEL_VERSIONS_DIR) -> tuple:
+    """(model, preprocessor) of a published version, loaded once per process."""
+    version_dir = versions_dir / name
+    return joblib.load(version_dir / "model.pkl"), joblib.load(version_dir / "preprocessor.pkl")
+
+
+def score_model(model, preprocessor, X: pd.DataFrame) -> tuple:
+    """Predictions, probabilities and latency (ms) of one model on a batch of inputs."""
+    start = time.perf_counter()
+    transformed = preprocessor.transform(X)
+    probabilities = model.predict_proba(transformed)[:, 1]
+    predictions = predict_labels(model, probabilities)
+    return predictions, probabilities, (time.perf_counter() - start) * 1000
+
+
+def start_shadow_process(names: list, versions_dir: Path) -> None:
+    os.nice(SHADOW_NICENESS)
+    for name in names:  # loaded once, before the first batch arrives
+        load_version(name, versions_dir)
+
+
+def score_shadows(names: list, versions_dir: Path, inputs: list) -> list:
+    """(name, predictions, probabilities, latency ms) of each shadow version, in its process."""
+    X = pd.DataFrame(inputs)
+    return [(name, *score_model(*load_version(name, versions_dir), X)) for name in names]
+
+
+class VersionStats:
+    """Running prediction and latency summary of one version."""
+
+    def __init__(self):
+        self.n = 0
+        self.positives = 0
+        self.probability_sum = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)  # ms per scored request
+        # Shadow versions only: agreement with the primary on the same inputs
+        self.compared = 0
+        self.agreements = 0
+        self.abs_difference_sum = 0.0
+
+    def record(self, predictions, probabilities, latency_ms: float, primary=None) -> None:
+        predictions = np.asarray(predictions)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.n += len(predictions)
+        self.positives += int((predictions == 1).sum())
+        self.probability_sum += float(probabilities.sum())
+        self.latencies.append(latency_ms)
+        if primary is not None:
+            primary_predictions, primary_probabilities = primary
+            self.compared += len(predictions)
+            self.agreements += int((predictions == np.asarray(primary_predictions)).sum())
+            self.abs_difference_sum += float(
+                np.abs(probabilities - np.asarray(primary_probabilities)).sum()
+            )
+
+    def summary(self) -> dict:
+        latencies = np.asarray(self.latencies)
+        return {
+            "n": self.n,
+            "positive_rate": self.positives / self.n if self.n else None,
+            "mean_probability": self.probability_sum / self.n if self.n else None,
+            "latency_ms_mean": float(latencies.mean()) if len(latencies) else None,
+            "latency_ms_p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "latency_ms_p95": float(np.percentile(latencies, 95)) if len(latencies) else None,
+            "compared": self.compared,
+            "agreement": self.agreements / self.compared if self.compared else None,
+            "mean_abs_probability_difference": (
+                self.abs_difference_sum / self.compared if self.compared else None
+            ),
+        }
+
+
+class ModelRegistry:
+    """
+    Several model versions held in memory at once, and the routing policy between them.
+
+    The primary answers by default. A `candidate` version answers `candidate_percent` of the
+    requests instead: by a hash of the application number when one is sent (so a project always
+    gets the same version), at random otherwise.
+
+    Shadow versions score the same inputs in a separate, lower-priority process, so they share
+    neither the GIL nor CPU priority with the request path. Requests only submit their input
+    dicts; past `max_pending` batches in flight new ones are dropped and counted, and results
+    are recorded from a callback, so a response never waits on a shadow.
+
+    Predictions and latencies of every version are summarized in memory. With a prediction
+    logger they are also logged under each version's model hash, shadows with source "shadow"
+    and the request ids of the response they shadow.
+    """
+
+    def __init__(
+        self,
+        primary: tuple,
+        primary_version: str,
+        policy: dict,
+        versions_dir: Path = MODEL_VERSIONS_DIR,
+        prediction_logger=None,
+        max_pending: int = 1000,
+    ):
+        self.policy = policy
+        self.versions_dir = Path(versions_dir)
+        self.models = {PRIMARY: primary}
+        if policy["candidate"]:
+            self.models[policy["candidate"]] = load_version(policy["candidate"], versions_dir)
+        self.model_versions = {PRIMARY: primary_version}
+        for name in policy_versions(policy):
+            self.model_versions[name] = file_version(self.versions_dir / name / "model.pkl")
+        self.stats = {name: VersionStats() for name in self.model_versions}
+        self.prediction_logger = prediction_logger
+        self.max_pending = max_pending
+        self.pending = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.pool = None
+
+    def role(self, name: str) -> str:
+        if name == PRIMARY:
+            return PRIMARY
+        return "candidate" if name == self.policy["candidate"] else "shadow"
+
+    def route(self, key: str | None = None) -> str:
+        """Name of the version that answers a request."""
+        candidate, percent = self.policy["candidate"], self.policy["candidate_percent"]
+        if candidate is None or percent <= 0:
+            return PRIMARY
+        if key is None:
+            draw = random.random() * 100
+        else:
+            draw = zlib.crc32(key.encode()) % 10_000 / 100
+        return candidate if draw < percent else PRIMARY
+
+    def score(self, name: str, X: pd.DataFrame) -> tuple:
+        """Predictions, probabilities and latency (ms) of the primary or candidate."""
+        return score_model(*self.models[name], X)
+
+    def record(self, name: str, predictions, probabilities, latency_ms: float, primary=None):
+        with self.lock:
+            self.stats[name].record(predictions, probabilities, latency_ms, primary)
+
+    def submit_shadow(
+        self, inputs: list, name: str, predictions, probabilities, request_ids
+    ) -> None:
+        """
+        Submit a served batch (its input dicts) to the shadow process; never blocks. `name`,
+        `predictions` and `probabilities` are the response's; shadows are compared with it when
+        it is the primary's.
+        """
+        if self.pool is None:
+            return
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.dropped += len(inputs)
+                return
+            self.pending += 1
+        try:
+            future = self.pool.submit(
+                score_shadows, self.policy["shadow"], self.versions_dir, inputs
+            )
+        except BrokenProcessPool:
+            logger.error("Shadow process is broken, restarting it")
+            with self.lock:
+                self.pending -= 1
+                self.dropped += len(inputs)
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+            self.start()
+            return
+        primary = (predictions, probabilities) if name == PRIMARY else None
+        future.add_done_callback(partial(self.shadows_done, inputs, primary, request_ids))
+
+    def shadows_done(self, inputs: list, primary, request_ids, future) -> None:
+        with self.lock:
+            self.pending -= 1
+        if future.cancelled():
+            return
+        try:
+            results = future.result()
+        except Exception:
+            logger.exception("Shadow scoring failed")
+            return
+        for name, predictions, probabilities, latency_ms in results:
+            self.record(name, predictions, probabilities, latency_ms, primary)
+            if self.prediction_logger is not None:
+                self.prediction_logger.log(
+                    prediction_records(
+                        inputs,
+                        predictions,
+                        probabilities,
+                        latency_ms,
+                        self.model_versions[name],
+                        "shadow",
+                        request_ids=request_ids,
+                    )
+                )
+
+    def start(self) -> "ModelRegistry":
+        if self.pool is None and self.policy["shadow"]:
+            # Not forked from the threaded API process, as for the job pool
+            self.pool = ProcessPoolExecutor(
+                1,
+                mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                initializer=start_shadow_process,
+                initargs=(self.policy["shadow"], self.versions_dir),
+            )
+        return self
+
+    def stop(self) -> None:
+        """Finish the shadow batch in progress and drop the rest."""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def report(self) -> list:
+        """One summary per version: name, role, model hash, traffic share and VersionStats."""
+        with self.lock:
+            summaries = {name: stats.summary() for name, stats in self.stats.items()}
+        candidate_percent = self.policy["candidate_percent"] if self.policy["candidate"] else 0
+        traffic = {PRIMARY: 100 - candidate_percent, self.policy["candidate"]: candidate_percent}
+        return [
+            {
+                "name": name,
+                "role": self.role(name),
+                "model_version": self.model_versions[name],
+                "traffic_percent": traffic.get(name, 0.0),
+                **summaries[name],
+            }
+            for name in self.model_versions
+        ]
@@ -0,0 +1,67 @@
+import importlib
+import sys
+
+# Command -> (module with a typer `app`, one-line help). Modules are imported only when their
+# command runs, so `--help` and `paths` load neither typer nor pandas / sklearn / loguru.
+COMMANDS = {
+    "dataset": (
+        "affordable_housing.dataset",
+        "Merge the applicant and award lists into one dataset",
+    ),
+    "features": ("affordable_housing.features", "Split the dataset and fit the preprocessor"),
+    "train": ("affordable_housing.modeling.train", "Search and train the logistic regression"),
+    "threshold": ("affordable_housing.modeling.threshold", "Tune the decision threshold"),
+    "bootstrap": ("affordable_housing.modeling.bootstrap", "Fit bootstrap replicas for intervals"),
+    "train-online": ("affordable_housing.modeling.train_online", "Out-of-core SGD training"),
+    "predict": ("affordable_housing.modeling.predict", "Score transformed test features"),
+    "transform-predict": (
+        "affordable_housing.modeling.transform_predict",
+        "Score a raw applicant list end to end",
+    ),
+    "refresh": ("affordable_housing.modeling.refresh", "Add a labeled round and warm-start"),
+    "export": ("affordable_housing.modeling.export", "Export the pickle-free model artifact"),
+    "similar": ("affordable_housing.modeling.similar", "Build or query the similarity index"),
+    "allocation": ("affordable_housing.modeling.allocation", "Simulate a round's allocation"),
+    "tracking": ("affordable_housing.tracking", "Query the experiment tracker"),
+    "synthetic": ("affordable_housing.synthetic", "Generate synthetic rounds, benchmark"),
+    "plots": ("affordable_housing.plots", "Generate the report figures"),
+    "benchmark": ("affordable_housing.api.benchmark", "Benchmark API serving"),
+}
+PROG = "affordable-housing"
+
+
+def print_help() -> None:
+    width = max(map(len, COMMANDS)) + 2
+    lines = [f"Usage: {PROG} COMMAND [ARGS]...", "", "Commands:"]
+    lines += [f"  {name:<{width}}{help_text}" for name, (_, help_text) in COMMANDS.items()]
+    lines += [f"  {'paths':<{width}}Print the configured data and model paths", ""]
+    lines.append(f"Run '{PROG} COMMAND --help' for the options of a command.")
+    print("\n".join(lines))
+
+
+def print_paths() -> None:
+    from affordable_housing import config
+
+    names = [name for name in sorted(vars(config)) if name.isupper()]
+    print("\n".join(f"{name}={getattr(config, name)}" for name in names))
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print_help()
+        return 0 if argv else 2
+    name, args = argv[0], argv[1:]
+    if name == "paths":
+        print_paths()
+        return 0
+    if name not in COMMANDS:
+        print(f"{PROG}: unknown command '{name}'", file=sys.stderr)
+        print_help()
+        return 2
+    module = importlib.import_module(COMMANDS[name][0])
+    return module.app(args=args, prog_name=f"{PROG} {name}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
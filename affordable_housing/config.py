@@ -1,22 +1,48 @@
+import os
 from pathlib import Path
 
 from dotenv import load_dotenv
-from loguru import logger
 
 # Load environment variables from .env file if it exists
 load_dotenv()
 
 # Paths
+# `affordable-housing paths` prints the resolved paths (no logging here: config is imported by
+# every module, including the CLI's fast path)
 PROJ_ROOT = Path(__file__).resolve().parents[1]
-logger.info(f"PROJ_ROOT path is: {PROJ_ROOT}")
 
 DATA_DIR = PROJ_ROOT / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 INTERIM_DATA_DIR = DATA_DIR / "interim"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 EXTERNAL_DATA_DIR = DATA_DIR / "external"
+# Transformed features keyed by application_number, partitioned by preprocessor version and round
+FEATURE_STORE_DIR = DATA_DIR / "feature_store"
 
 MODELS_DIR = PROJ_ROOT / "models"
+MODEL_EXPORT_DIR = MODELS_DIR / "export"
+# Experiment tracker (tracking.py): runs, search trials, metrics and artifact paths
+EXPERIMENT_DB = Path(os.getenv("EXPERIMENT_DB", MODELS_DIR / "experiments.sqlite"))
+# Models published by refresh.py, one <UTC timestamp>/ directory per version
+MODEL_VERSIONS_DIR = MODELS_DIR / "versions"
+# Stacked coefficients of the bootstrap replicas (bootstrap.py); the API serves an interval if set
+BOOTSTRAP_PATH = Path(os.getenv("BOOTSTRAP_PATH", MODELS_DIR / "bootstrap.npz"))
+# Training input histograms the API's live drift monitor compares traffic against (drift.py)
+DRIFT_REFERENCE_PATH = Path(os.getenv("DRIFT_REFERENCE_PATH", MODELS_DIR / "drift_reference.json"))
+# Nearest-historical-applications index (modeling/similar.py), built by features.py
+SIMILAR_INDEX_PATH = Path(os.getenv("SIMILAR_INDEX_PATH", MODELS_DIR / "similar_index.pkl"))
+# A/B and shadow routing between the served model and published versions (api/registry.py)
+ROUTING_POLICY_PATH = Path(os.getenv("ROUTING_POLICY_PATH", MODELS_DIR / "routing.json"))
+# "joblib" serves model.pkl / preprocessor.pkl, "export" serves the pickle-free MODEL_EXPORT_DIR
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "joblib")
+
+# Round scoring jobs submitted to the API: SQLite job store, uploaded inputs and results
+JOBS_DIR = Path(os.getenv("JOBS_DIR", DATA_DIR / "jobs"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+
+# Rolling Parquet log of served predictions (prediction_log.py); PREDICTION_LOGGING=false disables
+PREDICTION_LOG_DIR = Path(os.getenv("PREDICTION_LOG_DIR", DATA_DIR / "prediction_logs"))
+PREDICTION_LOGGING = os.getenv("PREDICTION_LOGGING", "true").lower() == "true"
 
 REPORTS_DIR = PROJ_ROOT / "reports"
 FIGURES_DIR = REPORTS_DIR / "figures"
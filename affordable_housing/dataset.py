@@ -8,10 +8,65 @@ from sklearn.model_selection import train_test_split
 import typer
 
 from affordable_housing.config import EXTERNAL_DATA_DIR, PROCESSED_DATA_DIR
+from affordable_housing.modeling.applicants import read_excel_columns
+from affordable_housing.prediction_log import read_prediction_logs
+from affordable_housing.validation import clean_construction_type, clean_region
 
 app = typer.Typer()
 
 
+# (matcher, pattern, name) in priority order: a column takes the first pattern it matches
+COLUMN_PATTERNS = [
+    (re.match, "average", "avg_targeted_affordability"),
+    (re.match, "CDLAC TOTAL", "total_points"),
+    (re.search, "tie-brea", "tie_breaker_self_score"),
+    (re.search, "bond", "bond_request_amount"),
+    (re.search, "units for homeless", "num_homeless_units"),
+    (re.search, "construction type", "construction_type"),
+    (re.search, "housing type", "housing_type"),
+    (re.search, "CDLAC.*region", "CDLAC_region"),
+    (re.search, "CDLAC.*pool", "CDLAC_pool"),
+    (re.search, "BIPOC", "bipoc_binary"),
+    (re.match, "new construction set aside", "new_construction_set_aside"),
+    (re.search, "secondary new construction", "secondary_new_construction_set_aside"),
+    (re.search, "application", "application_number"),
+]
+AWARD_KEY_PATTERN = r"application|CTCAC"
+# Prediction log (model input) fields as dataset columns. The log has the homeless percentage
+# instead of the unit count: logged rows carry homeless_percent and leave num_homeless_units empty
+PREDICTION_LOG_COLUMNS = {
+    "application_number": "application_number",
+    "avg_targeted_affordability": "avg_targeted_affordability",
+    "CDLAC_total_points_score": "total_points",
+    "CDLAC_tie_breaker_self_score": "tie_breaker_self_score",
+    "bond_request_amount": "bond_request_amount",
+    "construction_type": "construction_type",
+    "housing_type": "housing_type",
+    "CDLAC_region": "CDLAC_region",
+    "CDLAC_pool_type": "combined_CDLAC_pool",
+    "new_construction_set_aside": "combined_set_aside",
+    "homeless_percent": "homeless_percent",
+}
+# Years whose award list (Financing-data) covers every round. A logged application of any other
+# year that is not in the applicant lists belongs to a round whose awards are not loaded (e.g.
+# 2025-R2), so it cannot be labeled
+FULL_YEAR_AWARD_YEARS = ("2023", "2024")
+
+
+def round_id_from_path(path: Path) -> str:
+    """Round of an applicant list from its file name, e.g. 2025-R2-ApplicantList.xlsx -> 2025-R2."""
+    match = re.search(r"(\d{4})-(R\d+)", Path(path).name, re.IGNORECASE)
+    return f"{match.group(1)}-{match.group(2).upper()}" if match else Path(path).stem
+
+
+def standard_column_name(col: str) -> str | None:
+    """Standard name of an applicant list column, or None if the pipeline does not use it."""
+    for matcher, pattern, name in COLUMN_PATTERNS:
+        if matcher(pattern, str(col), re.IGNORECASE):
+            return name
+    return None
+
+
 def rename_column_names(applicant_df: pd.DataFrame) -> pd.DataFrame:
     """
     Rename columns in the DataFrame based on regular expression patterns.
@@ -22,57 +77,20 @@ def rename_column_names(applicant_df: pd.DataFrame) -> pd.DataFrame:
     Raises:
         AssertionError: If any regular expression matches more than one column.
     """
-    num_of_matches = [0] * 20
-    df = applicant_df.copy()  # Create a copy to avoid modifying the original
-
-    for i, col in enumerate(df.columns):
-        if re.match("average", col, re.IGNORECASE):
-            df = df.rename(columns={col: "avg_targeted_affordability"})
-            num_of_matches[0] += 1
-        elif re.match("CDLAC TOTAL", col, re.IGNORECASE):
-            df = df.rename(columns={col: "total_points"})
-            num_of_matches[1] += 1
-        elif re.search("tie-brea", col, re.IGNORECASE):
-            df = df.rename(columns={col: "tie_breaker_self_score"})
-            num_of_matches[2] += 1
-        elif re.search("bond", col, re.IGNORECASE):
-            df = df.rename(columns={col: "bond_request_amount"})
-            num_of_matches[3] += 1
-        elif re.search("units for homeless", col, re.IGNORECASE):
-            df = df.rename(columns={col: "num_homeless_units"})
-            num_of_matches[4] += 1
-        elif re.search("construction type", col, re.IGNORECASE):
-            df = df.rename(columns={col: "construction_type"})
-            num_of_matches[5] += 1
-        elif re.search("housing type", col, re.IGNORECASE):
-            df = df.rename(columns={col: "housing_type"})
-            num_of_matches[6] += 1
-        elif re.search("CDLAC.*region", col, re.IGNORECASE):
-            df = df.rename(columns={col: "CDLAC_region"})
-            num_of_matches[7] += 1
-        elif re.search("CDLAC.*pool", col, re.IGNORECASE):
-            df = df.rename(columns={col: "CDLAC_pool"})
-            num_of_matches[8] += 1
-        elif re.search("BIPOC", col, re.IGNORECASE):
-            df = df.rename(columns={col: "bipoc_binary"})
-            num_of_matches[9] += 1
-        elif re.match("new construction set aside", col, re.IGNORECASE):
-            df = df.rename(columns={col: "new_construction_set_aside"})
-            num_of_matches[10] += 1
-        elif re.search("secondary new construction", col, re.IGNORECASE):
-            df = df.rename(columns={col: "secondary_new_construction_set_aside"})
-            num_of_matches[11] += 1
-        elif re.search("application", col, re.IGNORECASE):
-            df = df.rename(columns={col: "application_number"})
-            num_of_matches[12] += 1
+    renames = {}
+    for col in applicant_df.columns:
+        name = standard_column_name(col)
+        if name is not None:
+            renames[col] = name
 
     # Ensure each regular expression matches at most one column
-    for i in range(20):
-        assert num_of_matches[i] < 2, (
-            f"Pattern {i} matched {num_of_matches[i]} columns, expected at most 1"
+    for name in set(renames.values()):
+        num_of_matches = list(renames.values()).count(name)
+        assert num_of_matches < 2, (
+            f"Pattern for {name} matched {num_of_matches} columns, expected at most 1"
         )
 
-    return df
+    return applicant_df.rename(columns=renames)
 
 
 def clean_and_merge_columns(applicant_df: pd.DataFrame) -> pd.DataFrame:
@@ -145,34 +163,34 @@ def standardize_application_number(num: str) -> str:
     return f"{prefix}-{year}-{seq}"
 
 
-def clean_region(region: str) -> str:
-    region = region.strip().lower()  # Normalize to lowercase for consistent matching
-
-    if re.search(r"bay\s*area", region):
-        return "BAY AREA"
-    elif re.search(r"northern", region):
-        return "NORTHERN"
-    elif re.search(r"inland", region):
-        return "INLAND"
-    elif re.search(r"city\s*of\s*(la|los\s*angeles)", region):
-        return "CITY OF LA"
-    elif re.search(r"balance\s*of\s*(la|los\s*angeles)\s*county", region):
-        return "BALANCE OF LA COUNTY"
-    elif re.search(r"coastal", region):
-        return "COASTAL"
-    else:
-        return "NONE"
-
-
-def clean_construction_type(construction_type: str) -> str:
-    construction_type = (
-        construction_type.strip().lower()
-    )  # Normalize to lowercase for consistent matching
-
-    if re.search(r"acq", construction_type, re.IGNORECASE):
-        return "ACQ AND REHAB"
-    else:
-        return construction_type.upper()
+def logged_applicants(
+    log_dir: Path, known_numbers, labeled_years=FULL_YEAR_AWARD_YEARS
+) -> pd.DataFrame:
+    """
+    Applicant rows from the prediction log: the latest logged input of each application number
+    not already in the applicant lists. Predictions logged without a number, or from a year
+    outside `labeled_years` (no award list covers their round, so a missing award would read
+    as a false "No"), cannot be labeled and are skipped. The log does not record the round:
+    logged rows get the year of their application number as their round.
+    """
+    logs = read_prediction_logs(log_dir)
+    logs = logs[logs["application_number"].notna()]
+    logs = logs.assign(
+        application_number=logs["application_number"]
+        .astype(str)
+        .apply(standardize_application_number)
+    ).drop_duplicates("application_number", keep="last")
+    logs = logs[~logs["application_number"].isin(known_numbers)]
+    year = logs["application_number"].str.split("-").str[1]
+    unlabeled = ~year.isin(labeled_years)
+    if unlabeled.any():
+        logger.warning(
+            f"Skipping {int(unlabeled.sum())} logged applications from rounds without a loaded "
+            f"award list (years {sorted(year[unlabeled].unique())})"
+        )
+    logs = logs[~unlabeled].assign(round=year[~unlabeled])
+    columns = {**PREDICTION_LOG_COLUMNS, "round": "round"}
+    return logs[list(columns)].rename(columns=columns)
 
 
 @app.command()
@@ -192,6 +210,8 @@ def main(
     output_path: Path = PROCESSED_DATA_DIR / "3yr_dataset.csv",
     output_path_train: Path = PROCESSED_DATA_DIR / "3yr_dataset_train.csv",
     output_path_test: Path = PROCESSED_DATA_DIR / "3yr_dataset_test.csv",
+    # Directory of the API / Lambda prediction log, as an extra source of applications
+    prediction_log_dir: Path | None = None,
 ):
     """
     Combine datasets from 3 years (2023, 2024, 2025 till R1) by standardising their names, merging and cleaning.
@@ -216,12 +236,20 @@ def main(
             (input_path_labels_r1_2025, "Labels_R1_2025", 0),  # default sheet for 2025
         ]
 
-        # Load applicant DataFrames
+        # Load applicant DataFrames. The header row is read first and only the columns that
+        # map to a standard name are parsed; rows with fewer than 10% of the sheet's cells
+        # filled (notes, blank rows) are skipped while reading
         applicant_dfs = []
         for path, name in applicant_data:
             logger.info(f"Loading applicant Excel file from {path}")
-            df = pd.read_excel(path, header=1, index_col=None)
+            df = read_excel_columns(
+                path,
+                lambda col: standard_column_name(col) is not None,
+                header=1,
+                min_filled_fraction=0.1,
+            )
             df.attrs["file_name"] = str(path)  # Store file path in attrs
+            df["round"] = round_id_from_path(path)  # e.g. 2024-R2, carried to features.py
             logger.info(f"Loaded {name} with {len(df)} rows and {len(df.columns)} columns")
             applicant_dfs.append(df)
 
@@ -229,7 +257,12 @@ def main(
         award_dfs = []
         for path, name, sheet in award_data:
             logger.info(f"Loading award Excel file from {path}")
-            df = pd.read_excel(path, sheet_name=sheet)
+            df = read_excel_columns(
+                path,
+                lambda col: re.search(AWARD_KEY_PATTERN, col, re.IGNORECASE) is not None,
+                header=0,
+                sheet_name=sheet,
+            )
             df.attrs["file_name"] = str(path)  # Store file path in attrs
             logger.info(f"Loaded {name} with {len(df)} rows and {len(df.columns)} columns")
             award_dfs.append(df)
@@ -238,12 +271,10 @@ def main(
         applicant_df = pd.DataFrame()
         for df in applicant_dfs:
             df = rename_column_names(df)
-
-            threshold = int(len(df.columns) * 0.1)
-            df = df.dropna(thresh=threshold)
             df = clean_and_merge_columns(df)
             columns = [
                 "application_number",
+                "round",
                 "avg_targeted_affordability",
                 "total_points",
                 "tie_breaker_self_score",
@@ -272,10 +303,19 @@ def main(
                 f"Warning: Some standardized numbers do not have 11 characters: {invalid_lengths}"
             )
 
+        if prediction_log_dir is not None:
+            logged_df = logged_applicants(
+                prediction_log_dir, set(applicant_df["application_number"])
+            )
+            # Aligned on the column names: num_homeless_units stays empty for logged rows and
+            # homeless_percent for rows from the applicant lists
+            applicant_df = pd.concat([applicant_df, logged_df])
+            logger.info(f"Added {len(logged_df)} applications from {prediction_log_dir}")
+
         labels_df = pd.DataFrame()
         for df in award_dfs:
             for col in df.columns:
-                if re.search(r"application|CTCAC", col, re.IGNORECASE):
+                if re.search(AWARD_KEY_PATTERN, col, re.IGNORECASE):
                     df = df.rename(columns={col: "application_number"})
                     df["application_number"] = df["application_number"].apply(
                         standardize_application_number
@@ -311,7 +351,7 @@ def main(
         )
 
     except Exception as e:
-        logger.error(f"Error during processing: {str(e)}")
+        logger.error(f"Error during processing: {e!s}")
         raise
     # -----------------------------------------
 
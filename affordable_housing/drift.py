@@ -0,0 +1,300 @@
+import json
+from pathlib import Path
+import queue
+import threading
+
+from loguru import logger
+import numpy as np
+import pandas as pd
+
+from affordable_housing.config import DRIFT_REFERENCE_PATH
+from affordable_housing.features import RENAMED_CAT
+from affordable_housing.modeling.sensitivity import NUMERIC_FIELDS
+
+PSI_THRESHOLD = 0.2  # usual "significant shift" cut for the population stability index
+EPSILON = 1e-4  # floor for empty bins, keeps the log finite
+PROFILE_BINS = 20  # reference quantile bins per numeric field for the live monitor
+MAX_UNSEEN = 50  # unseen category values kept per field as examples
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index between two vectors of bin proportions."""
+    expected = np.clip(expected, EPSILON, None)
+    actual = np.clip(actual, EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def numeric_bins(reference: pd.Series, n_bins: int = 10) -> np.ndarray:
+    """Inner edges of the reference deciles (duplicates dropped for discrete columns)."""
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    return np.unique(np.nanquantile(reference.to_numpy(dtype=np.float64), quantiles))
+
+
+def numeric_proportions(values: pd.Series, edges: np.ndarray) -> np.ndarray:
+    counts = np.bincount(
+        np.searchsorted(edges, values.to_numpy(dtype=np.float64), side="right"),
+        minlength=len(edges) + 1,
+    )
+    return counts / max(len(values), 1)
+
+
+def categorical_proportions(values: pd.Series, categories) -> np.ndarray:
+    return values.value_counts(normalize=True).reindex(categories, fill_value=0.0).to_numpy()
+
+
+def drift_report(
+    reference: pd.DataFrame,
+    current: pd.DataFrame,
+    numeric: list[str] = NUMERIC_FIELDS,
+    categorical: list[str] = RENAMED_CAT,
+    n_bins: int = 10,
+) -> pd.DataFrame:
+    """
+    Per-field drift of `current` against `reference` (both in the preprocessor's column names).
+
+    Numeric fields are binned on the reference deciles; categorical fields compare category
+    frequencies over the union of categories.
+    Returns:
+        pd.DataFrame: One row per field with kind, psi, and the categories that do not occur in
+            the reference (the fitted one-hot encoder would ignore them).
+    """
+    rows = []
+    for column in numeric:
+        edges = numeric_bins(reference[column], n_bins)
+        rows.append(
+            {
+                "field": column,
+                "kind": "numeric",
+                "psi": psi(
+                    numeric_proportions(reference[column], edges),
+                    numeric_proportions(current[column], edges),
+                ),
+                "unseen_categories": [],
+            }
+        )
+    for column in categorical:
+        seen = set(reference[column].dropna().astype(str))
+        current_values = current[column].dropna().astype(str)
+        categories = sorted(seen | set(current_values))
+        rows.append(
+            {
+                "field": column,
+                "kind": "categorical",
+                "psi": psi(
+                    categorical_proportions(reference[column].dropna().astype(str), categories),
+                    categorical_proportions(current_values, categories),
+                ),
+                "unseen_categories": sorted(set(current_values) - seen),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def needs_refit(report: pd.DataFrame, psi_threshold: float = PSI_THRESHOLD) -> bool:
+    """Refit the preprocessor when a field drifted past the threshold or has new categories."""
+    return bool(
+        (report["psi"] > psi_threshold).any() or report["unseen_categories"].map(len).any()
+    )
+
+
+def reference_profile(
+    reference: pd.DataFrame,
+    numeric: list[str] = NUMERIC_FIELDS,
+    categorical: list[str] = RENAMED_CAT,
+    n_bins: int = PROFILE_BINS,
+) -> dict:
+    """
+    Reference histograms of the training inputs for the live drift monitor (JSON-able).
+
+    Numeric fields keep their quantile bin edges and proportions; categorical fields keep the
+    proportion of each category seen in training, which is the vocabulary the fitted one-hot
+    encoder knows.
+    """
+    profile = {"n": len(reference), "numeric": {}, "categorical": {}}
+    for column in numeric:
+        edges = numeric_bins(reference[column], n_bins)
+        profile["numeric"][column] = {
+            "edges": edges.tolist(),
+            "proportions": numeric_proportions(reference[column], edges).tolist(),
+        }
+    for column in categorical:
+        values = reference[column].dropna().astype(str)
+        categories = sorted(values.unique())
+        profile["categorical"][column] = {
+            "categories": categories,
+            "proportions": categorical_proportions(values, categories).tolist(),
+        }
+    return profile
+
+
+def save_reference_profile(reference: pd.DataFrame, path: Path = DRIFT_REFERENCE_PATH) -> Path:
+    path.write_text(json.dumps(reference_profile(reference), indent=2))
+    return path
+
+
+def ks_from_bins(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Kolmogorov-Smirnov distance on a shared binning: largest gap between the binned CDFs."""
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+
+class DriftMonitor:
+    """
+    Constant-memory input sketches of live prediction traffic, compared with a reference
+    profile: a count per reference bin for numeric fields, a count per known category plus an
+    unseen count (and a bounded sample of unseen values) for categorical fields.
+
+    Requests only enqueue their inputs; a daemon thread folds them into the sketches, so
+    updates stay off the request path. When the bounded queue is full inputs are dropped and
+    counted rather than blocking the caller.
+
+    Requests whose categories fail validation are never scored, so their unknown values are
+    submitted separately (submit_rejected) and counted as unseen.
+    """
+
+    def __init__(self, profile: dict, max_queue: int = 10_000, max_unseen: int = MAX_UNSEEN):
+        self.profile = profile
+        self.max_unseen = max_unseen
+        self.edges = {c: np.asarray(p["edges"]) for c, p in profile["numeric"].items()}
+        self.vocabularies = {
+            c: pd.Index(p["categories"]) for c, p in profile["categorical"].items()
+        }
+        self.numeric_counts = {c: np.zeros(len(e) + 1, np.int64) for c, e in self.edges.items()}
+        self.category_counts = {
+            c: np.zeros(len(v), np.int64) for c, v in self.vocabularies.items()
+        }
+        self.unseen_counts = dict.fromkeys(self.vocabularies, 0)
+        self.unseen_values = {c: set() for c in self.vocabularies}
+        self.missing_counts = dict.fromkeys(list(self.edges) + list(self.vocabularies), 0)
+        self.n = 0
+        self.rejected = 0  # requests rejected for categories outside the vocabulary
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.thread = None
+
+    @classmethod
+    def from_path(cls, path: Path = DRIFT_REFERENCE_PATH, **kwargs) -> "DriftMonitor":
+        return cls(json.loads(Path(path).read_text()), **kwargs)
+
+    def update(self, X: pd.DataFrame) -> None:
+        """Fold a batch of inputs (preprocessor column names) into the sketches."""
+        with self.lock:
+            self.n += len(X)
+            for column, edges in self.edges.items():
+                values = pd.to_numeric(X[column], errors="coerce").to_numpy(dtype=np.float64)
+                present = ~np.isnan(values)
+                self.missing_counts[column] += int((~present).sum())
+                self.numeric_counts[column] += np.bincount(
+                    np.searchsorted(edges, values[present], side="right"),
+                    minlength=len(edges) + 1,
+                )
+            for column, vocabulary in self.vocabularies.items():
+                values = X[column].dropna().astype(str)
+                self.missing_counts[column] += len(X) - len(values)
+                codes = vocabulary.get_indexer(values)
+                known = codes >= 0
+                self.category_counts[column] += np.bincount(
+                    codes[known], minlength=len(vocabulary)
+                )
+                self.unseen_counts[column] += int((~known).sum())
+                unseen = self.unseen_values[column]
+                for value in values[~known].unique():
+                    if len(unseen) >= self.max_unseen:
+                        break
+                    unseen.add(value)
+
+    def update_rejected(self, rejected: dict) -> None:
+        """Count the values of a rejected request (categorical column -> values) as unseen."""
+        with self.lock:
+            self.rejected += 1
+            for column, values in rejected.items():
+                if column not in self.vocabularies:
+                    continue
+                self.unseen_counts[column] += len(values)
+                unseen = self.unseen_values[column]
+                for value in map(str, values):
+                    if len(unseen) >= self.max_unseen:
+                        break
+                    unseen.add(value)
+
+    def submit(self, X: pd.DataFrame) -> None:
+        """Queue inputs for the background thread; never blocks."""
+        try:
+            self.queue.put_nowait(X)
+        except queue.Full:
+            with self.lock:
+                self.dropped += len(X)
+
+    def submit_rejected(self, rejected: dict) -> None:
+        """Queue the unknown categories of a request that failed validation; never blocks."""
+        try:
+            self.queue.put_nowait(rejected)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+
+    def run(self) -> None:
+        while True:
+            X = self.queue.get()
+            if X is None:
+                return
+            try:
+                if isinstance(X, pd.DataFrame):
+                    self.update(X)
+                else:
+                    self.update_rejected(X)
+            except Exception:  # a malformed batch must not stop the monitor
+                logger.exception("Drift monitor update failed")
+
+    def start(self) -> None:
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="drift-monitor", daemon=True)
+            self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def report(self) -> pd.DataFrame:
+        """
+        PSI and binned KS of the traffic seen so far against the reference, per field.
+        Returns:
+            pd.DataFrame: field, kind, n (non-missing values seen), psi, ks (numeric only),
+                missing_rate, unseen_rate (share of values outside the encoder's categories,
+                including those of rejected requests) and a sample of the unseen categories.
+        """
+        rows = []
+        with self.lock:
+            for column, counts in self.numeric_counts.items():
+                expected = np.asarray(self.profile["numeric"][column]["proportions"])
+                rows.append(self.report_row(column, "numeric", expected, counts, 0))
+            for column, counts in self.category_counts.items():
+                expected = np.asarray(self.profile["categorical"][column]["proportions"])
+                # Unseen values form an extra bin the reference never had
+                row = self.report_row(
+                    column,
+                    "categorical",
+                    np.append(expected, 0.0),
+                    np.append(counts, self.unseen_counts[column]),
+                    self.unseen_counts[column],
+                )
+                row["ks"] = None
+                row["unseen_categories"] = sorted(self.unseen_values[column])
+                rows.append(row)
+        return pd.DataFrame(rows)
+
+    def report_row(self, column, kind, expected, counts, unseen) -> dict:
+        n = int(counts.sum())
+        actual = counts / n if n else np.zeros_like(expected)
+        return {
+            "field": column,
+            "kind": kind,
+            "n": n,
+            "psi": psi(expected, actual) if n else None,
+            "ks": ks_from_bins(expected, actual) if n else None,
+            "missing_rate": self.missing_counts[column] / self.n if self.n else 0.0,
+            "unseen_rate": unseen / n if n else 0.0,
+            "unseen_categories": [],
+        }
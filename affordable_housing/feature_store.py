@@ -0,0 +1,163 @@
+import hashlib
+from pathlib import Path
+import re
+
+import joblib
+from loguru import logger
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from affordable_housing.config import FEATURE_STORE_DIR
+from affordable_housing.dataset import standardize_application_number
+
+KEY = "application_number"
+ROUND = "round"
+INPUT_HASH = "input_hash"
+
+
+def preprocessor_version(preprocessor_path: Path) -> str:
+    """
+    Short content hash of a saved preprocessor; stored features are kept per version.
+    The file is hashed rather than the loaded object, whose pickle is not byte-stable.
+    """
+    return hashlib.sha256(Path(preprocessor_path).read_bytes()).hexdigest()[:12]
+
+
+def input_hashes(X_values: pd.DataFrame) -> np.ndarray:
+    """Per-row hash of the raw model inputs, used to detect changed applications."""
+    # Stored as int64: Parquet and pandas' nullable integers handle it without overflow
+    return pd.util.hash_pandas_object(X_values, index=False).to_numpy().view(np.int64)
+
+
+def find_application_number_column(df: pd.DataFrame) -> str | None:
+    """Name of the application number column ("APPLICATION NUMBER", "application_number", ...)."""
+    for col in df.columns:
+        if re.search("application", str(col), re.IGNORECASE):
+            return col
+    return None
+
+
+def round_ids_from_keys(keys: pd.Series) -> pd.Series:
+    """Fallback round partition when no round is known: the year of CA-YYYY-NNN keys."""
+    return keys.str.extract(r"^CA-(\d{4})-", expand=False).fillna("unknown")
+
+
+def application_rounds(df: pd.DataFrame, keys: pd.Series) -> pd.Series:
+    """
+    Round of each row of a dataset, e.g. 2024-R2: its "round" column (written by dataset.py
+    from the applicant list file names), the year of its standardized key where that is
+    missing or the dataset has no round column.
+    """
+    fallback = round_ids_from_keys(keys.astype(str))
+    column = next((col for col in df.columns if str(col).lower() == ROUND), None)
+    if column is None:
+        return fallback.rename(ROUND)
+    return df[column].astype("string").fillna(fallback).astype(str).rename(ROUND)
+
+
+def read_keys(path: Path) -> pd.DataFrame:
+    """
+    Application numbers and rounds of a features.py split. Keys files written before the
+    round column existed get the year of each application number as its round.
+    """
+    keys = pd.read_csv(path, dtype=str)
+    if ROUND not in keys.columns:
+        keys[ROUND] = round_ids_from_keys(keys[KEY])
+    return keys[[KEY, ROUND]]
+
+
+class FeatureStore:
+    """
+    Transformed features keyed by standardized application_number, stored as Parquet under
+    <root>/preprocessor_version=<hash>/round=<round>/features.parquet.
+
+    Only applications that are new, or whose raw inputs changed, are sent through the
+    preprocessor; everything else is read back from the store.
+    """
+
+    def __init__(self, preprocessor_path: Path, root: Path = FEATURE_STORE_DIR, preprocessor=None):
+        self.preprocessor = (
+            preprocessor if preprocessor is not None else joblib.load(preprocessor_path)
+        )
+        self.version = preprocessor_version(preprocessor_path)
+        self.root = Path(root) / f"preprocessor_version={self.version}"
+        self.feature_names = [str(name) for name in self.preprocessor.get_feature_names_out()]
+
+    def partition_path(self, round_id: str) -> Path:
+        return self.root / f"{ROUND}={round_id}" / "features.parquet"
+
+    def rounds(self):
+        return sorted(path.name.split("=", 1)[1] for path in self.root.glob(f"{ROUND}=*"))
+
+    def read(self, round_id: str | None = None) -> pd.DataFrame:
+        """
+        Stored features for one round, or every round when `round_id` is None (backtests).
+        Returns:
+            pd.DataFrame: application_number, round, input_hash and one column per feature.
+        """
+        round_ids = self.rounds() if round_id is None else [round_id]
+        frames = []
+        for rid in round_ids:
+            path = self.partition_path(rid)
+            if path.exists():
+                frames.append(pd.read_parquet(path).assign(**{ROUND: rid}))
+        if not frames:
+            return pd.DataFrame(columns=[KEY, ROUND, INPUT_HASH] + self.feature_names)
+        df = pd.concat(frames, ignore_index=True)
+        return df[[KEY, ROUND, INPUT_HASH] + self.feature_names]
+
+    def write(self, round_id: str, keys, X_values: pd.DataFrame, X_transformed) -> None:
+        """Upsert already transformed rows of one round."""
+        if sparse.issparse(X_transformed):
+            X_transformed = X_transformed.toarray()
+        rows = pd.DataFrame(
+            np.asarray(X_transformed, dtype=np.float64), columns=self.feature_names
+        )
+        rows.insert(0, INPUT_HASH, input_hashes(X_values))
+        rows.insert(0, KEY, np.asarray(keys, dtype=str))
+
+        stored = self.read(round_id).drop(columns=ROUND)
+        merged = pd.concat([stored[~stored[KEY].isin(rows[KEY])], rows], ignore_index=True)
+        path = self.partition_path(round_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_suffix(".partial")
+        merged.to_parquet(partial_path, index=False)
+        partial_path.replace(path)
+
+    def write_rounds(self, application_numbers, round_ids, X_values, X_transformed) -> None:
+        """Upsert rows spread over several rounds (e.g. a multi-year training set)."""
+        keys = pd.Series(application_numbers).astype(str).map(standardize_application_number)
+        round_ids = np.asarray(round_ids, dtype=str)
+        for round_id in np.unique(round_ids):
+            rows = np.flatnonzero(round_ids == round_id)
+            self.write(round_id, keys.iloc[rows], X_values.iloc[rows], X_transformed[rows])
+
+    def transform(self, X_values: pd.DataFrame, application_numbers, round_id: str) -> np.ndarray:
+        """
+        Transformed features for `X_values`, in the same row order, reusing stored rows.
+        Args:
+            X_values (pd.DataFrame): Model input columns, as passed to preprocessor.transform.
+            application_numbers: Raw application numbers of the rows (standardized here).
+            round_id (str): Round partition, e.g. "2025-R2".
+        Returns:
+            np.ndarray: Dense transformed feature matrix.
+        """
+        keys = pd.Series(application_numbers).astype(str).map(standardize_application_number)
+        if keys.duplicated().any():
+            raise ValueError(f"Duplicate application numbers: {keys[keys.duplicated()].tolist()}")
+        hashes = input_hashes(X_values)
+
+        stored = self.read(round_id).set_index(KEY)
+        # Nullable Int64 keeps the 64-bit hashes exact where reindexing introduces missing rows
+        stored_hashes = stored[INPUT_HASH].astype("Int64").reindex(keys.to_numpy())
+        stale = (stored_hashes != hashes).fillna(True).to_numpy(dtype=bool)
+        if stale.any():
+            X_stale = X_values.iloc[np.flatnonzero(stale)]
+            self.write(round_id, keys[stale], X_stale, self.preprocessor.transform(X_stale))
+            stored = self.read(round_id).set_index(KEY)
+        logger.info(
+            f"Feature store {self.version}/{round_id}: transformed {int(stale.sum())} of "
+            f"{len(keys)} applications, reused {int((~stale).sum())}"
+        )
+        return stored.loc[keys.to_numpy(), self.feature_names].to_numpy()
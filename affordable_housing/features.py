@@ -2,6 +2,7 @@ from pathlib import Path
 
 import joblib
 from loguru import logger
+import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.model_selection import train_test_split
@@ -14,24 +15,101 @@ from sklearn.preprocessing import (
 )
 import typer
 
-from affordable_housing.config import MODELS_DIR, PROCESSED_DATA_DIR
-from affordable_housing.utils import get_binary_homeless_transformer
+from affordable_housing.config import (
+    DRIFT_REFERENCE_PATH,
+    MODELS_DIR,
+    PROCESSED_DATA_DIR,
+    SIMILAR_INDEX_PATH,
+)
+from affordable_housing.dataset import standardize_application_number
+from affordable_housing.feature_store import (
+    KEY,
+    ROUND,
+    FeatureStore,
+    application_rounds,
+    find_application_number_column,
+)
+from affordable_housing.modeling.similar import SimilarityIndex, dense
+from affordable_housing.utils import get_binary_homeless_transformer, save_feature_matrix
 
 app = typer.Typer()
 
 TEST_SIZE = 0.25
 SEED = 42
 
+PREPROCESSOR_PATH = MODELS_DIR / "preprocessor.pkl"
+
+RENAMED_CAT = [
+    "construction_type",
+    "housing_type",
+    "CDLAC_pool_type",
+    "new_construction_set_aside",
+    "CDLAC_region",
+]
+
+
+def build_preprocessor(sparse: bool = False) -> ColumnTransformer:
+    """
+    Build the (unfitted) column transformer used for every model input.
+    Args:
+        sparse (bool): Keep the one-hot output as a scipy sparse matrix instead of
+            densifying it, so memory scales with non-zeros rather than categories x rows.
+    Returns:
+        ColumnTransformer: Unfitted preprocessing pipeline.
+    """
+    logger.debug("Setting up homeless pipeline")
+    homeless_pipe = make_pipeline(get_binary_homeless_transformer())
+
+    logger.debug("Setting up points pipeline")
+    points_transformer = PowerTransformer(method="yeo-johnson")
+    points_pipe = make_pipeline(points_transformer, MinMaxScaler())
+
+    logger.debug("Setting up categorical and numerical pipelines")
+    cat_pipe = make_pipeline(OneHotEncoder(handle_unknown="ignore"))
+    remainder_num_pipe = make_pipeline(StandardScaler())
+
+    logger.info("Creating column transformer")
+    return ColumnTransformer(
+        transformers=[
+            ("homeless_binary", homeless_pipe, ["homeless_percent"]),
+            ("points_power", points_pipe, ["CDLAC_total_points_score"]),
+            ("category", cat_pipe, RENAMED_CAT),
+        ],
+        remainder=remainder_num_pipe,
+        # 1.0 forces sparse output whenever any block is sparse (the one-hot block always is)
+        sparse_threshold=1.0 if sparse else 0.3,
+    )
+
+
+def artifact_path(model_path: Path, deployed_path: Path) -> Path:
+    """
+    Where a run writing the preprocessor to `model_path` saves one of its side artifacts: the
+    deployed path (what the API loads) for the default preprocessor path, otherwise the same
+    file name next to `model_path`, so an experimental run never replaces deployed artifacts.
+    """
+    if Path(model_path) == PREPROCESSOR_PATH:
+        return deployed_path
+    return Path(model_path).parent / deployed_path.name
+
 
 @app.command()
 def main(
     # ---- REPLACE DEFAULT PATHS AS APPROPRIATE ----
     input_path: Path = PROCESSED_DATA_DIR / "merged_dataset.csv",
     output_path: Path = PROCESSED_DATA_DIR,
-    model_path: Path = MODELS_DIR / "preprocessor.pkl",
+    model_path: Path = PREPROCESSOR_PATH,
+    sparse: bool = False,  # keep one-hot output sparse and save transformed features as .npz
+    use_feature_store: bool = True,  # also store the transformed rows keyed by application_number
+    similar_index: bool = True,  # index the rows for nearest-historical-applications lookup
+    similar_index_path: Path | None = None,  # default: see artifact_path
+    drift_reference_path: Path | None = None,  # default: see artifact_path
     # -----------------------------------------
 ):
     # ---- REPLACE THIS WITH YOUR OWN CODE ----
+    if similar_index_path is None:
+        similar_index_path = artifact_path(model_path, SIMILAR_INDEX_PATH)
+    if drift_reference_path is None:
+        drift_reference_path = artifact_path(model_path, DRIFT_REFERENCE_PATH)
     logger.info("Generating features from dataset...")
 
     # Read Excel files
@@ -88,35 +166,7 @@ def main(
 
     # pipelines
     logger.info("Creating preprocessing pipelines")
-
-    logger.debug("Setting up homeless pipeline")
-    homeless_pipe = make_pipeline(get_binary_homeless_transformer())
-
-    logger.debug("Setting up points pipeline")
-    points_transformer = PowerTransformer(method="yeo-johnson")
-    points_pipe = make_pipeline(points_transformer, MinMaxScaler())
-
-    logger.debug("Setting up categorical and numerical pipelines")
-    cat_pipe = make_pipeline(OneHotEncoder(handle_unknown="ignore"))
-    remainder_num_pipe = make_pipeline(StandardScaler())
-
-    logger.info("Creating column transformer")
-    renamed_cat = [
-        "construction_type",
-        "housing_type",
-        "CDLAC_pool_type",
-        "new_construction_set_aside",
-        "CDLAC_region",
-    ]
-
-    preprocessor_pipe = ColumnTransformer(
-        transformers=[
-            ("homeless_binary", homeless_pipe, ["homeless_percent"]),
-            ("points_power", points_pipe, ["CDLAC_total_points_score"]),
-            ("category", cat_pipe, renamed_cat),
-        ],
-        remainder=remainder_num_pipe,
-    )
+    preprocessor_pipe = build_preprocessor(sparse=sparse)
 
     # transform
     logger.info("Fitting and transforming training data")
@@ -124,20 +174,16 @@ def main(
     logger.info("Transforming test data")
     X_test_transform = preprocessor_pipe.transform(X_test)
 
-    # Convert to DataFrame with column names
-    logger.info("Converting transformed data to DataFrame")
-    X_train_transform_df = pd.DataFrame(
-        X_train_transform, columns=preprocessor_pipe.get_feature_names_out()
-    )
-    X_test_transform_df = pd.DataFrame(
-        X_test_transform, columns=preprocessor_pipe.get_feature_names_out()
-    )
     # save features
     logger.info(f"Saving features to {output_path}")
     X_train.to_csv(output_path / "X_train.csv", index=False)
     X_test.to_csv(output_path / "X_test.csv", index=False)
-    X_train_transform_df.to_csv(output_path / "X_train_transform.csv", index=False)
-    X_test_transform_df.to_csv(output_path / "X_test_transform.csv", index=False)
+    feature_names = preprocessor_pipe.get_feature_names_out()
+    suffix = ".npz" if sparse else ".csv"
+    save_feature_matrix(
+        X_train_transform, output_path / f"X_train_transform{suffix}", feature_names
+    )
+    save_feature_matrix(X_test_transform, output_path / f"X_test_transform{suffix}", feature_names)
     y_train.to_csv(output_path / "y_train.csv", index=False)
     y_test.to_csv(output_path / "y_test.csv", index=False)
     logger.info("Features saved successfully.")
@@ -147,6 +193,50 @@ def main(
     joblib.dump(preprocessor_pipe, model_path)
     logger.info(f"Preprocessor pipeline saved to {model_path}")
 
+    # Reference histograms for the API's live drift monitor; drift.py imports RENAMED_CAT
+    # from this module, hence the late import
+    from affordable_housing.drift import save_reference_profile
+
+    save_reference_profile(X_train, drift_reference_path)
+    logger.info(f"Drift reference profile saved to {drift_reference_path}")
+
+    # Key the transformed rows so they can be joined back to applications and reused
+    key_column = find_application_number_column(df)
+    if key_column is None:
+        logger.warning("No application number column, transformed features are saved unkeyed")
+    else:
+        store = (
+            FeatureStore(model_path, preprocessor=preprocessor_pipe) if use_feature_store else None
+        )
+        split_keys = []
+        for name, X_split, X_split_transform in (
+            ("train", X_train, X_train_transform),
+            ("test", X_test, X_test_transform),
+        ):
+            keys = (
+                df.loc[X_split.index, key_column].astype(str).map(standardize_application_number)
+            )
+            # The round each application was submitted in (e.g. 2024-R2), as the applicant
+            # lists scored by transform_predict.py are partitioned
+            rounds = application_rounds(df.loc[X_split.index], keys)
+            split_keys.append(pd.DataFrame({KEY: keys, ROUND: rounds}))
+            split_keys[-1].to_csv(output_path / f"X_{name}_keys.csv", index=False)
+            if store is not None:
+                store.write_rounds(keys, rounds, X_split, X_split_transform)
+        if store is not None:
+            logger.info(f"Transformed features stored under {store.root}")
+        if similar_index:
+            keys = pd.concat(split_keys)
+            index = SimilarityIndex(
+                np.vstack([dense(X_train_transform), dense(X_test_transform)]),
+                keys[KEY],
+                keys[ROUND],
+                pd.concat([y_train, y_test]),
+                feature_names,
+            )
+            index.save(similar_index_path)
+            logger.info(f"Indexed {len(index)} applications in {similar_index_path}")
+
     logger.success("Features generation complete.")
     # -----------------------------------------
 
@@ -0,0 +1,277 @@
+import json
+from pathlib import Path
+import time
+from typing import NamedTuple
+
+from joblib import Parallel, delayed
+from loguru import logger
+import numpy as np
+import pandas as pd
+import typer
+
+from affordable_housing.config import PROCESSED_DATA_DIR
+from affordable_housing.modeling.applicants import RENAME_COLUMNS
+
+app = typer.Typer()
+
+POINTS = "CDLAC_total_points_score"
+TIE_BREAKER = "CDLAC_tie_breaker_self_score"
+REQUEST = "bond_request_amount"
+POOL = "CDLAC_pool_type"
+REGION = "CDLAC_region"
+PROBABILITY = "PREDICTION_PROBABILITY"
+BATCH_DRAWS = 500  # draws scored together as one (draws x projects) array
+
+
+class Buckets(NamedTuple):
+    """Projects grouped by budget: a pool, or a pool's regional apportionment."""
+
+    names: list[str]
+    index: np.ndarray  # bucket of each project, -1 when its pool has no budget
+    caps: np.ndarray  # bond cap per bucket
+
+
+def assign_buckets(df: pd.DataFrame, budgets: dict) -> Buckets:
+    """
+    Map projects to budgets. `budgets` maps a pool to its cap, or to {region: cap} for pools
+    apportioned by region (as the New Construction pool is), e.g.
+    {"New Construction": {"Bay Area (...)": 3.1e8, ...}, "Preservation": 1.2e8}.
+    """
+    names, caps = [], []
+    index = np.full(len(df), -1)
+    for pool, budget in budgets.items():
+        in_pool = (df[POOL] == pool).to_numpy()
+        regional = budget if isinstance(budget, dict) else {None: budget}
+        for region, cap in regional.items():
+            members = in_pool if region is None else in_pool & (df[REGION] == region).to_numpy()
+            index[members] = len(names)
+            names.append(pool if region is None else f"{pool} / {region}")
+            caps.append(float(cap))
+    return Buckets(names, index, np.asarray(caps))
+
+
+def simulate_batch(
+    points: np.ndarray,
+    tie_breaker: np.ndarray,
+    request: np.ndarray,
+    probability: np.ndarray,
+    buckets: Buckets,
+    n_draws: int,
+    seed,
+    points_review_rate: float,
+    points_loss_max: int,
+    tie_breaker_noise: float,
+):
+    """
+    Run `n_draws` allocations at once.
+
+    Each draw perturbs the self scores (a project loses 1..points_loss_max points in review
+    with probability points_review_rate; tie-breakers get multiplicative lognormal noise), lets
+    each project compete with its model probability, ranks every bucket by points then
+    tie-breaker, and funds down the ranking while the cumulative bond request fits the cap.
+    Returns:
+        tuple: Awards per project (n,), and per draw the tie-breaker each project needs to be
+            funded (n_draws, n): 0 when already ahead on points, inf when it would need more
+            points or its request alone exceeds the cap.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_draws, len(points))
+    drawn_points = points - rng.binomial(1, points_review_rate, shape) * rng.integers(
+        1, points_loss_max + 1, shape
+    )
+    drawn_tie_breaker = tie_breaker * rng.lognormal(0.0, tie_breaker_noise, shape)
+    entered = rng.random(shape) < probability
+
+    # Buckets are the primary sort key, so every bucket is the same column block in every draw
+    order_bucket = np.sort(buckets.index)
+    starts = np.searchsorted(order_bucket, np.arange(len(buckets.caps)))
+    ends = np.searchsorted(order_bucket, np.arange(len(buckets.caps)), side="right")
+    key = np.lexsort((-drawn_tie_breaker, -drawn_points, np.broadcast_to(buckets.index, shape)))
+    rows = np.arange(n_draws)[:, None]
+    sorted_points = drawn_points[rows, key]
+    sorted_tie_breaker = drawn_tie_breaker[rows, key]
+    sorted_request = np.where(entered[rows, key], request[key], 0.0)
+    sorted_bucket = buckets.index[key]
+    position = np.arange(len(points))
+
+    # Exclusive cumulative request within each bucket
+    total = np.cumsum(sorted_request, axis=1)
+    exclusive = total - sorted_request
+    block_start = np.zeros(len(points), dtype=np.int64)
+    for start, end in zip(starts, ends):
+        block_start[start:end] = start
+    exclusive = exclusive - exclusive[:, block_start]
+    cap = np.where(sorted_bucket >= 0, buckets.caps[sorted_bucket], -np.inf)
+    funded = (sorted_request > 0) & (exclusive + sorted_request <= cap)
+
+    # Tie-breaker needed: the project has to rank above the first competitor that keeps its
+    # request from fitting, i.e. the last position whose exclusive sum still leaves room for it.
+    # Offsetting every draw and bucket makes the exclusive sums one non-decreasing array, so a
+    # single searchsorted finds that competitor for every project and draw.
+    half = float(request.sum()) + 1.0  # above any bucket's total request
+    offset = (rows * (len(buckets.caps) + 1) + sorted_bucket + 1) * 2 * half
+    room = np.minimum(cap - request[key], half)
+    m = np.searchsorted((exclusive + offset).ravel(), (offset + room).ravel(), side="right") - 1
+    m = m.reshape(shape) - rows * len(points)
+    # Funded projects only need to stay above the first unfunded competitor of their bucket
+    unfunded = (sorted_request > 0) & ~funded
+    first_unfunded = np.full(shape, len(points))
+    bucket_total = np.zeros(shape)
+    for start, end in zip(starts, ends):
+        block = np.where(unfunded[:, start:end], position[start:end], len(points))
+        first_unfunded[:, start:end] = block.min(axis=1, keepdims=True)
+        bucket_total[:, start:end] = sorted_request[:, start:end].sum(axis=1, keepdims=True)
+    target = np.where(funded, first_unfunded, m)
+    # A project that would fit even after everyone else has no competitor to beat
+    has_target = (target < len(points)) & (funded | (bucket_total + request[key] > cap))
+
+    target = np.clip(target, 0, len(points) - 1)
+    target_points = np.take_along_axis(sorted_points, target, axis=1)
+    target_tie_breaker = np.take_along_axis(sorted_tie_breaker, target, axis=1)
+    needed = np.where(
+        sorted_points > target_points,
+        0.0,
+        np.where(sorted_points == target_points, target_tie_breaker, np.inf),
+    )
+    needed = np.where(has_target, needed, 0.0)
+    # No position fits: the request alone exceeds the cap, or the project has no budget
+    impossible = (m < block_start) | ~np.isfinite(cap)
+    needed = np.where(~funded & impossible, np.inf, needed)
+
+    # Back to the input order
+    awards = np.zeros(len(points))
+    np.add.at(awards, key.ravel(), funded.ravel())
+    unsorted_needed = np.empty(shape)
+    unsorted_needed[rows, key] = needed
+    return awards, unsorted_needed
+
+
+def simulate(
+    df: pd.DataFrame,
+    budgets: dict,
+    n_draws: int = 20_000,
+    use_probability: bool = True,
+    points_review_rate: float = 0.05,
+    points_loss_max: int = 5,
+    tie_breaker_noise: float = 0.05,
+    seed: int = 42,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """
+    Monte Carlo allocation of a scored round.
+    Args:
+        df (pd.DataFrame): Scored round with the model input names (see read_scored_round).
+        budgets (dict): Pool caps, see assign_buckets.
+        n_draws (int): Allocation draws, split into batches run in parallel.
+        use_probability (bool): Let each project compete only with its model probability
+            (e.g. passing review, not withdrawing); otherwise every project competes.
+        points_review_rate, points_loss_max, tie_breaker_noise: Self-score perturbations.
+        n_jobs (int): Parallel batches (joblib semantics).
+    Returns:
+        pd.DataFrame: SIMULATED_AWARD_PROBABILITY, MARGINAL_TIE_BREAKER (median over draws of
+            the tie-breaker needed to be funded; inf when more points are needed),
+            TIE_BREAKER_GAP (MARGINAL_TIE_BREAKER minus the project's own) and
+            POINTS_SHORT_FRACTION (draws in which no tie-breaker would have been enough).
+    """
+    buckets = assign_buckets(df, budgets)
+    unbudgeted = buckets.index < 0
+    if unbudgeted.any():
+        pools = sorted(df.loc[unbudgeted, POOL].astype(str).unique())
+        logger.warning(f"{int(unbudgeted.sum())} projects in pools without a budget: {pools}")
+
+    points = df[POINTS].to_numpy(dtype=np.float64)
+    tie_breaker = df[TIE_BREAKER].to_numpy(dtype=np.float64)
+    request = df[REQUEST].to_numpy(dtype=np.float64)
+    probability = (
+        df[PROBABILITY].to_numpy(dtype=np.float64) if use_probability else np.ones(len(df))
+    )
+
+    batches = [min(BATCH_DRAWS, n_draws - start) for start in range(0, n_draws, BATCH_DRAWS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(simulate_batch)(
+            points,
+            tie_breaker,
+            request,
+            probability,
+            buckets,
+            size,
+            batch_seed,
+            points_review_rate,
+            points_loss_max,
+            tie_breaker_noise,
+        )
+        for size, batch_seed in zip(batches, seeds)
+    )
+    awards = sum(result[0] for result in results)
+    needed = np.concatenate([result[1] for result in results])
+    marginal = np.median(needed, axis=0)
+    return pd.DataFrame(
+        {
+            "SIMULATED_AWARD_PROBABILITY": awards / n_draws,
+            "MARGINAL_TIE_BREAKER": marginal,
+            "TIE_BREAKER_GAP": marginal - tie_breaker,
+            "POINTS_SHORT_FRACTION": np.isinf(needed).mean(axis=0),
+        },
+        index=df.index,
+    )
+
+
+def read_scored_round(path: Path) -> pd.DataFrame:
+    """A transform_predict.py output, with the published column names renamed to model names."""
+    df = pd.read_csv(path)
+    df = df.rename(columns={raw: name for raw, name in RENAME_COLUMNS.items() if raw in df})
+    missing = [c for c in (POINTS, TIE_BREAKER, REQUEST, POOL, REGION, PROBABILITY) if c not in df]
+    if missing:
+        raise ValueError(f"Scored round {path} is missing columns {missing}")
+    return df
+
+
+@app.command()
+def main(
+    input_path: Path = PROCESSED_DATA_DIR / "predictions/2025-R2-predictions-with-raw.csv",
+    # JSON: {pool: cap} or {pool: {region: cap}}, pool and region spelled as in the round
+    budgets_path: Path = PROCESSED_DATA_DIR / "2025-R2-budgets.json",
+    output_path: Path = PROCESSED_DATA_DIR / "predictions/2025-R2-allocation.csv",
+    n_draws: int = 20_000,
+    use_probability: bool = True,
+    points_review_rate: float = 0.05,
+    points_loss_max: int = 5,
+    tie_breaker_noise: float = 0.05,
+    seed: int = 42,
+    n_jobs: int = -1,
+    # Projects logged, by simulated award probability; 0 to skip
+    top: int = 20,
+):
+    """
+    Simulate CDLAC's ranked allocation of a scored round against the pool budgets, and write
+    each project's simulated award probability and the tie-breaker it would need.
+    """
+    df = read_scored_round(input_path)
+    budgets = json.loads(budgets_path.read_text())
+    logger.info(f"Simulating {n_draws} allocations of {len(df)} projects")
+    start = time.perf_counter()
+    results = simulate(
+        df,
+        budgets,
+        n_draws,
+        use_probability,
+        points_review_rate,
+        points_loss_max,
+        tie_breaker_noise,
+        seed,
+        n_jobs,
+    )
+    logger.info(f"Simulation took {time.perf_counter() - start:.1f}s")
+
+    output_df = pd.concat([df, results], axis=1)
+    output_df.to_csv(output_path, index=False)
+    if top:
+        columns = [POOL, POINTS, TIE_BREAKER, PROBABILITY] + list(results.columns)
+        ranked = output_df.sort_values("SIMULATED_AWARD_PROBABILITY", ascending=False)
+        logger.info("Top projects:\n" + ranked[columns].head(top).to_string())
+    logger.success(f"Allocation results saved to {output_path}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,238 @@
+from collections.abc import Callable, Iterator
+from pathlib import Path
+import re
+
+from loguru import logger
+import pandas as pd
+
+# Applicant list columns used by the model, and their preprocessor names
+RENAME_COLUMNS = {
+    "AVERAGE TARGETED AFFORDABILITY": "avg_targeted_affordability",
+    "CDLAC TOTAL POINTS": "CDLAC_total_points_score",
+    "TIEBREAKER SELF SCORE": "CDLAC_tie_breaker_self_score",
+    "BOND REQUEST": "bond_request_amount",
+    "HOMELESS %": "homeless_percent",
+    "CONSTRUCTION TYPE": "construction_type",
+    "HOUSING TYPE": "housing_type",
+    "CDLAC POOL": "CDLAC_pool_type",
+    "NEW CONSTRUCTION SET ASIDE": "new_construction_set_aside",  # built from SET_ASIDE_FLAGS
+    "CDLAC REGION": "CDLAC_region",
+}
+SET_ASIDE_FLAGS = ["HOMELESS", "ELI/VLI", "MIP"]
+
+
+def is_model_column(column) -> bool:
+    """Columns worth parsing when only scoring: model inputs, set-aside flags, id and label."""
+    column = str(column)
+    return (
+        column in RENAME_COLUMNS
+        or column in SET_ASIDE_FLAGS
+        or re.search("application|award", column, re.IGNORECASE) is not None
+    )
+
+
+def excel_header_names(row) -> list:
+    """Column names of a header row, named like pandas does for empty or repeated cells."""
+    names, seen = [], {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def iter_excel_columns(
+    path: Path,
+    keep: Callable[[str], bool] | None = None,
+    header: int = 1,
+    sheet_name: int = 0,
+    chunksize: int | None = None,
+    min_filled_fraction: float = 0.0,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a worksheet with openpyxl in read-only mode, keeping only the columns whose header
+    satisfies `keep`, so memory and DataFrame construction scale with the columns used rather
+    than with the width of the sheet.
+    Args:
+        path (Path): .xlsx workbook.
+        keep (callable, optional): Header name -> bool; all columns when None.
+        header (int): 0-based row index of the header (CDLAC applicant lists have a title row).
+        sheet_name (int): 0-based sheet index.
+        chunksize (int, optional): Rows per yielded DataFrame; one DataFrame when None.
+        min_filled_fraction (float): Skip rows with fewer non-empty cells, over the full width
+            of the sheet, than this fraction of the header width (like dropna(thresh=...)
+            on the whole sheet).
+    Yields:
+        pd.DataFrame: The kept columns.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[sheet_name].iter_rows(values_only=True)
+        for _ in range(header):
+            next(rows)
+        names = excel_header_names(next(rows))
+        indices = [i for i, name in enumerate(names) if keep is None or keep(name)]
+        columns = [names[i] for i in indices]
+        min_filled = int(len(names) * min_filled_fraction)
+        chunk = []
+        for row in rows:
+            if min_filled and sum(value is not None for value in row) < min_filled:
+                continue
+            chunk.append([row[i] if i < len(row) else None for i in indices])
+            if chunksize is not None and len(chunk) == chunksize:
+                yield pd.DataFrame(chunk, columns=columns).infer_objects()
+                chunk = []
+        # Like pandas, drop the empty rows a sheet often carries after the data
+        while chunk and all(value is None for value in chunk[-1]):
+            chunk.pop()
+        if chunk or chunksize is None:
+            yield pd.DataFrame(chunk, columns=columns).infer_objects()
+    finally:
+        workbook.close()
+
+
+def read_excel_columns(path: Path, keep=None, header: int = 1, sheet_name: int = 0, **kwargs):
+    """Read only the wanted columns of a worksheet (see iter_excel_columns)."""
+    return next(iter_excel_columns(path, keep, header, sheet_name, **kwargs))
+
+
+def transform_new_construction_set_aside(df_round2: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transform Round 2 Homeless, ELI/VLI, and MIP columns into a single NEW CONSTRUCTION SET ASIDE column
+    to match Round 1 format.
+
+    Args:
+        df_round2 (pd.DataFrame): Round 2 dataset with Homeless, ELI/VLI, and MIP columns.
+
+    Returns:
+        pd.DataFrame: Transformed DataFrame with NEW CONSTRUCTION SET ASIDE column and original columns dropped.
+    """
+    logger.info("Transforming NEW CONSTRUCTION SET ASIDE for Round 2 data...")
+
+    # Copy the DataFrame to avoid modifying the original
+    df = df_round2.copy()
+
+    # Log unique values for debugging
+    for col in ["HOMELESS", "ELI/VLI", "MIP"]:
+        if col in df.columns:
+            logger.info(f"{col} values: {df[col].unique()}")
+        else:
+            logger.error(f"Column {col} not found in Round 2 dataset")
+            raise ValueError(f"Missing column {col}")
+
+    # Convert YES/NO to 1/0 if necessary
+    for col in ["HOMELESS", "ELI/VLI", "MIP"]:
+        if df[col].dtype == "object":
+            df[col] = df[col].replace({"Yes": 1, "No": 0}).fillna(0).astype(int)
+        elif df[col].isna().any():
+            logger.warning(f"Found missing values in {col}, imputing with 0")
+            df[col] = df[col].fillna(0).astype(int)
+
+    # Create NEW CONSTRUCTION SET ASIDE column
+    def map_set_aside(row):
+        if row["HOMELESS"] == 1 and row["ELI/VLI"] == 1:
+            return "Homeless, ELI/VLI"
+        elif row["ELI/VLI"] == 1:
+            return "ELI/VLI"
+        else:
+            return "none"  # MIP = 1 or all 0s map to 'none'
+
+    df["NEW CONSTRUCTION SET ASIDE"] = df.apply(map_set_aside, axis=1)
+
+    # Verify valid categories
+    valid_categories = ["none", "Homeless, ELI/VLI", "ELI/VLI"]
+    invalid_categories = df[~df["NEW CONSTRUCTION SET ASIDE"].isin(valid_categories)][
+        "NEW CONSTRUCTION SET ASIDE"
+    ].unique()
+    if len(invalid_categories) > 0:
+        logger.error(f"Invalid NEW CONSTRUCTION SET ASIDE values: {invalid_categories}")
+        raise ValueError("Invalid NEW CONSTRUCTION SET ASIDE values detected")
+
+    # Drop original columns
+    df = df.drop(columns=["HOMELESS", "ELI/VLI", "MIP"])
+    logger.info("Dropped Homeless, ELI/VLI, and MIP columns")
+
+    logger.info("NEW CONSTRUCTION SET ASIDE transformation complete")
+    return df
+
+
+def read_round_file(input_path: Path, project_columns: bool = False) -> pd.DataFrame:
+    """
+    Read a CDLAC applicant list. Excel files have a title row above the header, as published;
+    csv and parquet files are expected to start with the header.
+    Args:
+        input_path (Path): .xlsx, .xls, .csv or .parquet file.
+        project_columns (bool): Parse only the columns needed for scoring (is_model_column),
+            resolved from the header first, instead of every column of the sheet.
+    """
+    suffix = input_path.suffix.lower()
+    keep = is_model_column if project_columns else None
+    if suffix == ".xlsx":
+        return read_excel_columns(input_path, keep, header=1)
+    if suffix == ".xls":
+        return pd.read_excel(input_path, header=1, index_col=None, usecols=keep)
+    if suffix == ".csv":
+        return pd.read_csv(input_path, usecols=keep)
+    if suffix == ".parquet":
+        if keep is None:
+            return pd.read_parquet(input_path)
+        import pyarrow.parquet as pq
+
+        columns = [name for name in pq.read_schema(input_path).names if keep(name)]
+        return pd.read_parquet(input_path, columns=columns)
+    raise ValueError(f"Unsupported round file type: {input_path.suffix}")
+
+
+def iter_round_chunks(input_path: Path, chunksize: int = 5000) -> Iterator[pd.DataFrame]:
+    """
+    Read an applicant list in chunks of `chunksize` rows, so memory does not grow with the
+    file. Same layouts as read_round_file.
+    """
+    input_path = Path(input_path)
+    suffix = input_path.suffix.lower()
+    if suffix == ".csv":
+        yield from pd.read_csv(input_path, chunksize=chunksize)
+    elif suffix == ".xlsx":
+        yield from iter_excel_columns(input_path, header=1, chunksize=chunksize)
+    elif suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported round file type for chunked reading: {input_path.suffix}")
+
+
+def prepare_round_features(raw_df: pd.DataFrame):
+    """
+    Apply the Round 2 set-aside and construction type fixes and extract the model inputs.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Transformed raw data, and the ten model input columns
+            renamed to the preprocessor's names.
+    """
+    # Create new column "NEW CONSTRUCTION SET ASIDE"
+    logger.info("Creating new column to match round 1")
+    raw_df = transform_new_construction_set_aside(raw_df)
+
+    # modify the column "CONSTRUCTION TYPE"
+    raw_df["CONSTRUCTION TYPE"] = raw_df["CONSTRUCTION TYPE"].replace(
+        {"Acquisition/Rehabilitation": "Acq and Rehabilitation"}
+    )
+
+    # Extract features for transformation
+    logger.info("Extracting features for transformation")
+    X_values = raw_df[list(RENAME_COLUMNS)]
+    logger.info("Feature extraction complete")
+
+    # rename column names to single word and lowercase
+    logger.info("rename columns")
+    X_values = X_values.rename(columns=RENAME_COLUMNS)
+    logger.info("rename columns successful!")
+    return raw_df, X_values
@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from affordable_housing.modeling.decision import predict_labels
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def yeo_johnson(x: np.ndarray, lmbda: float) -> np.ndarray:
+    """Yeo-Johnson transform with a fitted lambda, matching sklearn's PowerTransformer."""
+    out = np.zeros_like(x, dtype=np.float64)
+    pos = x >= 0
+    eps = np.spacing(1.0)
+    if abs(lmbda) < eps:
+        out[pos] = np.log1p(x[pos])
+    else:
+        out[pos] = (np.power(x[pos] + 1, lmbda) - 1) / lmbda
+    if abs(lmbda - 2) > eps:
+        out[~pos] = -(np.power(-x[~pos] + 1, 2 - lmbda) - 1) / (2 - lmbda)
+    else:
+        out[~pos] = -np.log1p(-x[~pos])
+    return out
+
+
+def apply_step(step: dict, arrays: dict, X):
+    """Apply one exported preprocessing step to a 2-D float block (or raw category block)."""
+    kind = step["type"]
+    if kind == "binary_positive":
+        return (X > 0).astype(np.float64)
+    if kind == "yeo_johnson":
+        lambdas = arrays[step["lambdas"]]
+        X = np.column_stack([yeo_johnson(X[:, i], lambdas[i]) for i in range(X.shape[1])])
+        if "mean" in step:
+            X = (X - arrays[step["mean"]]) / arrays[step["scale"]]
+        return X
+    if kind == "min_max":
+        return X * arrays[step["scale"]] + arrays[step["min"]]
+    if kind == "standard":
+        if "mean" in step:
+            X = X - arrays[step["mean"]]
+        if "scale" in step:
+            X = X / arrays[step["scale"]]
+        return X
+    if kind == "one_hot":
+        blocks = []
+        for i, vocab_name in enumerate(step["categories"]):
+            vocab = arrays[vocab_name]
+            codes = pd.Categorical(X[:, i], categories=vocab).codes
+            if step["handle_unknown"] == "error" and (codes < 0).any():
+                unknown = pd.unique(X[codes < 0, i])
+                raise ValueError(f"Found unknown categories {list(unknown)} during transform")
+            block = np.zeros((len(codes), len(vocab)))
+            known = codes >= 0
+            block[np.flatnonzero(known), codes[known]] = 1.0
+            blocks.append(block)
+        return np.hstack(blocks)
+    raise ValueError(f"Unsupported step type {kind}")
+
+
+class ExportedPreprocessor:
+    """Numpy re-implementation of the fitted ColumnTransformer, read from an export manifest."""
+
+    def __init__(self, manifest: dict, arrays: dict):
+        self.blocks = manifest["preprocessor"]["blocks"]
+        self.feature_names = np.asarray(manifest["preprocessor"]["feature_names"], dtype=object)
+        self.feature_fields = manifest["preprocessor"]["feature_fields"]
+        self.feature_names_in_ = np.asarray(manifest["preprocessor"]["columns_in"], dtype=object)
+        self.arrays = arrays
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        outputs = []
+        for block in self.blocks:
+            is_categorical = any(step["type"] == "one_hot" for step in block["steps"])
+            values = X[block["columns"]].to_numpy(dtype=object if is_categorical else np.float64)
+            for step in block["steps"]:
+                values = apply_step(step, self.arrays, values)
+            outputs.append(values)
+        return np.hstack(outputs)
+
+    def get_feature_names_out(self) -> np.ndarray:
+        return self.feature_names
+
+    def get_feature_fields(self) -> pd.Series:
+        return pd.Series(self.feature_fields, index=self.feature_names)
+
+
+class ExportedModel:
+    """Linear classifier (plus optional calibration and threshold) read from an export."""
+
+    def __init__(self, manifest: dict, arrays: dict):
+        model = manifest["model"]
+        self.coef_ = arrays[model["coef"]]
+        self.intercept_ = arrays[model["intercept"]]
+        self.classes_ = np.asarray(model["classes"])
+        self.threshold = model["threshold"]  # None when the exported model stored none
+        self.calibration = model.get("calibration")
+        self.arrays = arrays
+
+    def decision_function(self, X) -> np.ndarray:
+        return np.asarray(X @ self.coef_.T).ravel() + self.intercept_[0]
+
+    def proba_from_logits(self, logits: np.ndarray) -> np.ndarray:
+        """Positive-class probability for linear log-odds, after any calibration map."""
+        calibration = self.calibration
+        if calibration is None:
+            proba = 1 / (1 + np.exp(-logits))
+        elif calibration["type"] == "sigmoid":
+            proba = 1 / (1 + np.exp(calibration["a"] * logits + calibration["b"]))
+        elif calibration["type"] == "isotonic":
+            proba = np.interp(logits, self.arrays[calibration["x"]], self.arrays[calibration["y"]])
+        else:
+            raise ValueError(f"Unsupported calibration {calibration['type']}")
+        return proba
+
+    def predict_proba(self, X) -> np.ndarray:
+        proba = self.proba_from_logits(self.decision_function(X))
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, X) -> np.ndarray:
+        proba = self.predict_proba(X)[:, 1]
+        return self.classes_[predict_labels(self, proba)]
+
+
+def load_artifact(artifact_dir: Path, mmap: bool = True):
+    """
+    Load an exported artifact (JSON manifest plus raw .npy arrays).
+
+    Only numpy and pandas are needed, no pickle is executed, and the arrays are memory-mapped
+    rather than copied, so loading takes milliseconds and pages are shared between processes.
+    Args:
+        artifact_dir (Path): Directory holding manifest.json and the .npy arrays.
+        mmap (bool): Memory-map the arrays read-only instead of reading them into memory.
+    Returns:
+        tuple[ExportedModel, ExportedPreprocessor]: Drop-in replacements for the joblib pair.
+    """
+    artifact_dir = Path(artifact_dir)
+    manifest = json.loads((artifact_dir / MANIFEST_NAME).read_text())
+    if manifest["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format {manifest['format_version']}")
+    arrays = {
+        name: np.load(artifact_dir / file_name, mmap_mode="r" if mmap else None)
+        for name, file_name in manifest["arrays"].items()
+    }
+    return ExportedModel(manifest, arrays), ExportedPreprocessor(manifest, arrays)
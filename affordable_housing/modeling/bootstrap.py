@@ -0,0 +1,186 @@
+from pathlib import Path
+import time
+
+import joblib
+from joblib import Parallel, delayed
+from loguru import logger
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.utils import resample
+import typer
+
+from affordable_housing.config import BOOTSTRAP_PATH, MODELS_DIR, PROCESSED_DATA_DIR
+from affordable_housing.modeling.explain import get_linear_model
+from affordable_housing.prediction_log import file_version
+from affordable_housing.utils import load_feature_matrix
+
+app = typer.Typer()
+
+INTERVAL_LEVEL = 0.9  # central interval served next to the mean probability
+
+
+class BootstrapEnsemble:
+    """
+    Logistic regressions fitted on bootstrap resamples, stored as one stacked coefficient
+    matrix: probabilities of every replica come from a single matrix multiply.
+    `model_version` is the content hash (file_version) of the model.pkl they resample, so the
+    API only serves them next to that model.
+    """
+
+    def __init__(
+        self,
+        coef: np.ndarray,
+        intercept: np.ndarray,
+        feature_names=None,
+        model_version: str | None = None,
+    ):
+        self.coef = np.asarray(coef, dtype=np.float64)  # (n_replicas, n_features)
+        self.intercept = np.asarray(intercept, dtype=np.float64)  # (n_replicas,)
+        self.feature_names = None if feature_names is None else np.asarray(feature_names)
+        self.model_version = model_version
+
+    @property
+    def n_replicas(self) -> int:
+        return len(self.intercept)
+
+    def predict_proba_replicas(self, X) -> np.ndarray:
+        """Positive-class probability of every replica, shape (n_samples, n_replicas)."""
+        logits = np.asarray(X @ self.coef.T) + self.intercept
+        return 1 / (1 + np.exp(-logits))
+
+    def predict_interval(self, X, level: float = INTERVAL_LEVEL) -> tuple:
+        """Mean replica probability and the central `level` interval, one value per row each."""
+        proba = self.predict_proba_replicas(X)
+        lower, upper = np.quantile(proba, [(1 - level) / 2, (1 + level) / 2], axis=1)
+        return proba.mean(axis=1), lower, upper
+
+    def save(self, path: Path) -> Path:
+        arrays = {"coef": self.coef, "intercept": self.intercept}
+        if self.feature_names is not None:
+            arrays["feature_names"] = self.feature_names.astype(str)
+        if self.model_version is not None:
+            arrays["model_version"] = np.str_(self.model_version)
+        np.savez(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "BootstrapEnsemble":
+        with np.load(path) as arrays:
+            model_version = arrays.get("model_version")
+            return cls(
+                arrays["coef"],
+                arrays["intercept"],
+                arrays.get("feature_names"),
+                None if model_version is None else str(model_version),
+            )
+
+
+def fit_replica(estimator, X, y, seed: int) -> tuple[np.ndarray, float]:
+    """Fit one clone on a bootstrap resample, stratified so both classes are always drawn."""
+    X_sample, y_sample = resample(X, y, random_state=seed, stratify=y)
+    replica = clone(estimator).fit(X_sample, y_sample)
+    return np.ravel(replica.coef_), float(np.ravel(replica.intercept_)[0])
+
+
+def fit_bootstrap(
+    model,
+    X,
+    y,
+    n_replicas: int = 200,
+    seed: int = 42,
+    n_jobs: int = -1,
+    feature_names=None,
+    model_version: str | None = None,
+) -> BootstrapEnsemble:
+    """
+    Refit the model's linear classifier (same hyperparameters) on `n_replicas` bootstrap
+    resamples of the training data, in parallel.
+    Args:
+        model: Model artifact as saved by train.py / threshold.py.
+        X: Transformed training features (dense or sparse).
+        y: Training labels.
+        n_replicas (int): Number of bootstrap resamples.
+        model_version (str, optional): file_version of the saved model, checked by the API.
+    Returns:
+        BootstrapEnsemble: The stacked replica coefficients.
+    """
+    estimator = get_linear_model(model)
+    y = np.asarray(y).ravel()
+    seeds = np.random.RandomState(seed).randint(np.iinfo(np.int32).max, size=n_replicas)
+    replicas = Parallel(n_jobs=n_jobs)(
+        delayed(fit_replica)(estimator, X, y, int(replica_seed)) for replica_seed in seeds
+    )
+    coef = np.vstack([replica_coef for replica_coef, _ in replicas])
+    intercept = np.array([replica_intercept for _, replica_intercept in replicas])
+    return BootstrapEnsemble(coef, intercept, feature_names, model_version)
+
+
+def time_scoring(score, repeats: int = 200) -> float:
+    """Median time of one `score()` call in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        score()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+@app.command()
+def main(
+    features_path: Path = PROCESSED_DATA_DIR / "X_train_transform.csv",
+    labels_path: Path = PROCESSED_DATA_DIR / "y_train.csv",
+    model_path: Path = MODELS_DIR / "model.pkl",
+    output_path: Path = BOOTSTRAP_PATH,
+    n_replicas: int = 200,
+    seed: int = 42,
+    n_jobs: int = -1,
+    benchmark: bool = False,  # time one-row scoring of the model alone vs model plus replicas
+):
+    """
+    Fit bootstrap replicas of the trained model and save their stacked coefficients, which the
+    API uses to serve a probability interval next to each prediction.
+    """
+    X_train = load_feature_matrix(features_path)
+    y_train = pd.read_csv(labels_path).squeeze()
+    model = joblib.load(model_path)
+    feature_names = getattr(X_train, "columns", None)
+
+    logger.info(f"Fitting {n_replicas} bootstrap replicas on {len(y_train)} rows")
+    start = time.perf_counter()
+    ensemble = fit_bootstrap(
+        model,
+        X_train,
+        y_train,
+        n_replicas,
+        seed,
+        n_jobs,
+        feature_names,
+        file_version(model_path),
+    )
+    logger.info(f"Fitted in {time.perf_counter() - start:.1f}s")
+    ensemble.save(output_path)
+
+    _, lower, upper = ensemble.predict_interval(X_train)
+    widths = upper - lower
+    logger.info(
+        f"{INTERVAL_LEVEL:.0%} interval width on training rows: median {np.median(widths):.3f}, "
+        f"max {widths.max():.3f}"
+    )
+    if benchmark:
+        # The API scores the preprocessor's array output
+        row = X_train[:1]
+        array_row = row.toarray() if hasattr(row, "toarray") else row.to_numpy()
+        single = time_scoring(lambda: model.predict_proba(row))
+        both = time_scoring(
+            lambda: (model.predict_proba(row), ensemble.predict_interval(array_row))
+        )
+        logger.info(
+            f"One-row scoring: model {single:.3f} ms, model plus {n_replicas} replicas "
+            f"{both:.3f} ms"
+        )
+    logger.success(f"Bootstrap ensemble saved to {output_path}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,157 @@
+from collections.abc import Mapping
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from affordable_housing.modeling.artifact import ExportedModel, ExportedPreprocessor, apply_step
+from affordable_housing.modeling.decision import decision_threshold
+from affordable_housing.validation import category_normalizer
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+class ColumnarScorer:
+    """
+    Score column arrays directly with the linear model, without building a one-hot matrix.
+
+    Numeric blocks are transformed column-wise and multiplied by their coefficient slice; each
+    categorical column becomes an integer code array that indexes a per-category weight table
+    (the last slot, weight 0, is used for unknown categories, like handle_unknown="ignore").
+    """
+
+    def __init__(self, model: ExportedModel, preprocessor: ExportedPreprocessor):
+        self.model = model
+        self.numeric_blocks = []  # (columns, steps, coef slice)
+        self.categorical = {}  # column -> (vocabulary, weights with trailing 0 for unknown)
+        self.normalizers = {}  # column -> raw value -> vocabulary spelling, as /predict does
+        coef = np.asarray(model.coef_, dtype=np.float64)[0]
+        offset = 0
+        for block in preprocessor.blocks:
+            one_hot = [step for step in block["steps"] if step["type"] == "one_hot"]
+            if one_hot:
+                for column, vocab_name in zip(block["columns"], one_hot[0]["categories"]):
+                    vocab = np.asarray(preprocessor.arrays[vocab_name])
+                    weights = np.append(coef[offset : offset + len(vocab)], 0.0)
+                    self.categorical[column] = (vocab, weights)
+                    self.normalizers[column] = category_normalizer(column, [str(v) for v in vocab])
+                    offset += len(vocab)
+            else:
+                n_out = len(block["columns"])
+                self.numeric_blocks.append(
+                    (block["columns"], block["steps"], coef[offset : offset + n_out])
+                )
+                offset += n_out
+        self.arrays = preprocessor.arrays
+        self.intercept = float(np.ravel(model.intercept_)[0])
+        self.threshold = decision_threshold(model)
+        self.numeric_columns = [c for columns, _, _ in self.numeric_blocks for c in columns]
+        self.columns = self.numeric_columns + list(self.categorical)
+
+    def logits(self, numeric: Mapping[str, np.ndarray], codes: Mapping[str, np.ndarray]):
+        """
+        Args:
+            numeric (Mapping): Numeric column name -> float array.
+            codes (Mapping): Categorical column name -> int array of vocabulary indices,
+                -1 for unknown values.
+        Returns:
+            np.ndarray: Linear log-odds per row.
+        """
+        n_rows = len(next(iter(codes.values()))) if codes else len(next(iter(numeric.values())))
+        logits = np.full(n_rows, self.intercept)
+        for columns, steps, coef in self.numeric_blocks:
+            values = np.column_stack([np.asarray(numeric[c], dtype=np.float64) for c in columns])
+            for step in steps:
+                values = apply_step(step, self.arrays, values)
+            logits += values @ coef
+        for column, (_, weights) in self.categorical.items():
+            logits += weights[codes[column]]
+        return logits
+
+    def score(self, numeric: Mapping[str, np.ndarray], codes: Mapping[str, np.ndarray]):
+        """Return (prediction, probability) arrays for column inputs."""
+        probability = self.model.proba_from_logits(self.logits(numeric, codes))
+        prediction = (probability >= self.threshold).astype(np.int8)
+        return prediction, probability
+
+
+def read_arrow_body(body: bytes, content_type: str = ""):
+    """Read an Arrow IPC stream, or a Parquet file, from a request body into a pyarrow Table."""
+    if content_type.startswith(PARQUET_MEDIA_TYPE) or body[:4] == b"PAR1":
+        return pq.read_table(io.BytesIO(body))
+    with pa.ipc.open_stream(pa.py_buffer(body)) as reader:
+        return reader.read_all()
+
+
+def score_arrow_table(table, scorer: ColumnarScorer, passthrough=("application_number",)):
+    """
+    Score a pyarrow Table column-to-column.
+
+    Numeric columns are read as numpy arrays and categorical columns are encoded with
+    pyarrow.compute.index_in, so no Python object is created per row. Category values are
+    normalized like PredictionInput's (case, whitespace, region and construction type
+    spellings), once per distinct value.
+    Args:
+        table (pa.Table): Must contain the ten canonical feature columns.
+        scorer (ColumnarScorer): Linear scorer for the loaded model.
+        passthrough (tuple): Columns copied to the output when present (e.g. ids).
+    Returns:
+        pa.Table: prediction (int8) and probability (float64) columns, plus passthrough ones.
+    Raises:
+        ValueError: Missing columns, missing or NaN numeric values, missing or unknown
+            categories; the message names the field.
+    """
+    missing = [c for c in scorer.columns if c not in table.column_names]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+
+    numeric = {}
+    for column in scorer.numeric_columns:
+        values = pc.cast(table[column], pa.float64()).to_numpy()
+        n_missing = int(np.isnan(values).sum())  # nulls come out as NaN
+        if n_missing:
+            raise ValueError(f"{column}: {n_missing} missing values")
+        numeric[column] = values
+    codes = {}
+    for column, (vocab, _) in scorer.categorical.items():
+        values = pc.cast(table[column], pa.string())
+        if values.null_count:
+            raise ValueError(f"{column}: {values.null_count} missing values")
+        distinct = pc.unique(values)
+        normalize = scorer.normalizers[column]
+        spellings = pa.array([normalize(v) for v in distinct.to_pylist()], pa.string())
+        distinct_codes = pc.fill_null(
+            pc.index_in(spellings, value_set=pa.array(vocab.tolist())), -1
+        ).to_numpy()
+        unknown = distinct.filter(pa.array(distinct_codes == -1)).to_pylist()
+        if unknown:
+            raise ValueError(f"{column}: unknown categories {unknown[:10]}")
+        codes[column] = distinct_codes[pc.index_in(values, value_set=distinct).to_numpy()]
+
+    prediction, probability = scorer.score(numeric, codes)
+    output = {c: table[c] for c in passthrough if c in table.column_names}
+    output["prediction"] = pa.array(prediction)
+    output["probability"] = pa.array(probability)
+    return pa.table(output)
+
+
+def write_arrow_stream(table) -> bytes:
+    """Serialize a pyarrow Table as an Arrow IPC stream."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def score_dataframe(df: pd.DataFrame, scorer: ColumnarScorer):
+    """Score a pandas DataFrame with the columnar scorer (used for checks and benchmarks)."""
+    numeric = {column: df[column].to_numpy(dtype=np.float64) for column in scorer.numeric_columns}
+    codes = {
+        column: pd.Categorical(df[column], categories=vocab).codes.astype(np.int64)
+        for column, (vocab, _) in scorer.categorical.items()
+    }
+    return scorer.score(numeric, codes)
@@ -0,0 +1,88 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.pipeline import Pipeline
+
+from affordable_housing.modeling.threshold import get_base_estimator
+
+
+class ContributionTable(NamedTuple):
+    weights: pd.DataFrame  # transformed feature x original field, coef where the feature maps
+    intercept: float
+
+
+def get_linear_model(model):
+    """
+    Unwrap a model artifact down to the fitted linear classifier that produces the log-odds.
+
+    Handles the FixedThresholdClassifier wrapper, pipelines and CalibratedClassifierCV fitted
+    with ensemble=False (the calibration map is applied on top of the linear log-odds).
+    """
+    model = get_base_estimator(model)
+    if isinstance(model, CalibratedClassifierCV):
+        if len(model.calibrated_classifiers_) != 1:
+            raise ValueError("Explanations need a calibrated model fitted with ensemble=False")
+        model = model.calibrated_classifiers_[0].estimator
+    if isinstance(model, Pipeline):
+        model = model[-1]
+    if not hasattr(model, "coef_"):
+        raise ValueError(f"{type(model).__name__} has no linear coefficients to explain")
+    return model
+
+
+def get_feature_fields(preprocessor) -> pd.Series:
+    """Map each transformed feature name to the original input column it was derived from."""
+    if hasattr(preprocessor, "get_feature_fields"):  # exported artifact stores the mapping
+        return preprocessor.get_feature_fields()
+    fields = {}
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or len(columns) == 0:
+            continue
+        columns = [
+            preprocessor.feature_names_in_[col] if isinstance(col, (int, np.integer)) else col
+            for col in columns
+        ]
+        for output in transformer.get_feature_names_out(columns):
+            # One-hot outputs are "<column>_<category>"; take the longest matching column
+            matches = [col for col in columns if output == col or output.startswith(f"{col}_")]
+            fields[f"{name}__{output}"] = max(matches, key=len)
+    feature_names = preprocessor.get_feature_names_out()
+    return pd.Series([fields[f] for f in feature_names], index=feature_names)
+
+
+def build_contribution_table(model, preprocessor) -> ContributionTable:
+    """
+    Precompute per-field weights so log-odds contributions are one matrix product.
+    Args:
+        model: Model artifact (see get_linear_model).
+        preprocessor: Fitted ColumnTransformer used in front of the model.
+    Returns:
+        ContributionTable: Coefficient matrix grouped by original field, and the intercept.
+    """
+    linear_model = get_linear_model(model)
+    feature_fields = get_feature_fields(preprocessor)
+    coef = np.ravel(linear_model.coef_)
+    if len(coef) != len(feature_fields):
+        raise ValueError(
+            f"Model has {len(coef)} coefficients, preprocessor outputs {len(feature_fields)}"
+        )
+    fields = list(dict.fromkeys(feature_fields))
+    indicator = (feature_fields.to_numpy()[:, None] == np.array(fields)[None, :]).astype(float)
+    weights = pd.DataFrame(coef[:, None] * indicator, index=feature_fields.index, columns=fields)
+    return ContributionTable(weights, float(np.ravel(linear_model.intercept_)[0]))
+
+
+def explain(X_transformed, table: ContributionTable) -> pd.DataFrame:
+    """
+    Per-field log-odds contributions (coefficient x transformed value, summed per field).
+    Args:
+        X_transformed: Dense or sparse output of the preprocessor.
+        table (ContributionTable): Precomputed by build_contribution_table.
+    Returns:
+        pd.DataFrame: One row per input, one column per original field. Row sums plus the
+            intercept equal the model's log-odds before any calibration.
+    """
+    contributions = X_transformed @ table.weights.to_numpy()
+    return pd.DataFrame(np.asarray(contributions), columns=table.weights.columns)
@@ -0,0 +1,270 @@
+import json
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import joblib
+from loguru import logger
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.isotonic import IsotonicRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import (
+    FunctionTransformer,
+    MinMaxScaler,
+    OneHotEncoder,
+    PowerTransformer,
+    StandardScaler,
+)
+import typer
+
+from affordable_housing.config import MODEL_EXPORT_DIR, MODELS_DIR, PROCESSED_DATA_DIR
+from affordable_housing.modeling.artifact import FORMAT_VERSION, MANIFEST_NAME, load_artifact
+from affordable_housing.modeling.decision import stored_threshold
+from affordable_housing.modeling.explain import get_feature_fields, get_linear_model
+from affordable_housing.modeling.threshold import get_base_estimator
+from affordable_housing.prediction_log import file_version
+from affordable_housing.utils import binary_homeless
+
+app = typer.Typer()
+
+
+class ArrayWriter:
+    """Collect the named arrays referenced by a manifest."""
+
+    def __init__(self):
+        self.arrays = {}
+
+    def add(self, name: str, array) -> str:
+        array = np.asarray(array)
+        if array.dtype == object:
+            array = array.astype(str)  # fixed-width unicode so the file can be memory-mapped
+        self.arrays[name] = np.ascontiguousarray(array)
+        return name
+
+
+def export_step(step, prefix: str, writer: ArrayWriter) -> dict:
+    """Describe one fitted preprocessing step as a manifest entry plus arrays."""
+    if isinstance(step, FunctionTransformer) and step.func is binary_homeless:
+        return {"type": "binary_positive"}
+    if isinstance(step, PowerTransformer) and step.method == "yeo-johnson":
+        entry = {"type": "yeo_johnson", "lambdas": writer.add(f"{prefix}_lambdas", step.lambdas_)}
+        if step.standardize:
+            entry["mean"] = writer.add(f"{prefix}_mean", step._scaler.mean_)
+            entry["scale"] = writer.add(f"{prefix}_scale", step._scaler.scale_)
+        return entry
+    if isinstance(step, MinMaxScaler) and not step.clip:
+        return {
+            "type": "min_max",
+            "scale": writer.add(f"{prefix}_scale", step.scale_),
+            "min": writer.add(f"{prefix}_min", step.min_),
+        }
+    if isinstance(step, StandardScaler):
+        entry = {"type": "standard"}
+        if step.with_mean:
+            entry["mean"] = writer.add(f"{prefix}_mean", step.mean_)
+        if step.with_std:
+            entry["scale"] = writer.add(f"{prefix}_scale", step.scale_)
+        return entry
+    if isinstance(step, OneHotEncoder) and step.drop is None:
+        return {
+            "type": "one_hot",
+            "handle_unknown": "error" if step.handle_unknown == "error" else "ignore",
+            "categories": [
+                writer.add(f"{prefix}_categories_{i}", categories)
+                for i, categories in enumerate(step.categories_)
+            ],
+        }
+    raise ValueError(f"Cannot export preprocessing step {step!r}")
+
+
+def export_calibration(model, writer: ArrayWriter):
+    """Describe the calibration map of a CalibratedClassifierCV(ensemble=False), if any."""
+    model = get_base_estimator(model)
+    if not isinstance(model, CalibratedClassifierCV):
+        return None
+    calibrator = model.calibrated_classifiers_[0].calibrators[0]
+    if isinstance(calibrator, IsotonicRegression):
+        return {
+            "type": "isotonic",
+            "x": writer.add("calibration_x", calibrator.X_thresholds_),
+            "y": writer.add("calibration_y", calibrator.y_thresholds_),
+        }
+    return {"type": "sigmoid", "a": float(calibrator.a_), "b": float(calibrator.b_)}
+
+
+def to_artifact(model, preprocessor):
+    """
+    Describe a fitted ColumnTransformer + linear model as a manifest and named arrays.
+    Args:
+        model: Model artifact as saved by train.py / threshold.py.
+        preprocessor: Fitted ColumnTransformer as saved by features.py.
+    Returns:
+        tuple[dict, dict]: Manifest and arrays, accepted by ExportedModel/ExportedPreprocessor.
+    """
+    writer = ArrayWriter()
+
+    blocks = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if isinstance(transformer, str) or len(columns) == 0:
+            if transformer == "passthrough":
+                raise ValueError("Cannot export passthrough columns")
+            continue
+        steps = transformer.steps if isinstance(transformer, Pipeline) else [(name, transformer)]
+        blocks.append(
+            {
+                "name": name,
+                "columns": [
+                    str(preprocessor.feature_names_in_[col])
+                    if isinstance(col, (int, np.integer))
+                    else col
+                    for col in columns
+                ],
+                "steps": [
+                    export_step(step, f"{name}_{i}", writer) for i, (_, step) in enumerate(steps)
+                ],
+            }
+        )
+
+    linear_model = get_linear_model(model)
+    if len(linear_model.classes_) != 2:
+        raise ValueError("Only binary classifiers can be exported")
+    feature_fields = get_feature_fields(preprocessor)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "preprocessor": {
+            "columns_in": [str(col) for col in preprocessor.feature_names_in_],
+            "blocks": blocks,
+            "feature_names": [str(name) for name in feature_fields.index],
+            "feature_fields": [str(field) for field in feature_fields],
+        },
+        "model": {
+            "type": type(linear_model).__name__,
+            "coef": writer.add("coef", np.atleast_2d(linear_model.coef_).astype(np.float64)),
+            "intercept": writer.add("intercept", np.ravel(linear_model.intercept_)),
+            "classes": np.asarray(linear_model.classes_).tolist(),
+            "threshold": stored_threshold(model),  # None: cut at FALLBACK_THRESHOLD
+            "calibration": export_calibration(model, writer),
+        },
+    }
+    return manifest, writer.arrays
+
+
+def export_artifact(
+    model, preprocessor, output_dir: Path, source_version: str | None = None
+) -> Path:
+    """
+    Write a fitted ColumnTransformer + linear model as manifest.json and raw .npy arrays.
+    Args:
+        model: Model artifact as saved by train.py / threshold.py.
+        preprocessor: Fitted ColumnTransformer as saved by features.py.
+        output_dir (Path): Directory to write; created if missing.
+        source_version (str, optional): file_version of the model.pkl exported, stored as
+            "source_model_version" so artifacts fitted on that pickle can be matched to it.
+    Returns:
+        Path: Path of the written manifest.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest, arrays = to_artifact(model, preprocessor)
+    manifest["source_model_version"] = source_version
+    manifest["arrays"] = {}
+    for name, array in arrays.items():
+        manifest["arrays"][name] = f"{name}.npy"
+        np.save(output_dir / f"{name}.npy", array)
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return manifest_path
+
+
+def time_cold_load(code: str, repeats: int) -> float:
+    """Median wall time of a fresh interpreter running `code` (imports included)."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def time_warm_load(load, repeats: int) -> float:
+    """Median time of `load()` in this process (libraries already imported)."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def compare_load_times(
+    model_path: Path, preprocessor_path: Path, export_dir: Path, repeats: int = 5
+) -> pd.DataFrame:
+    """Compare joblib and exported artifact load times, warm (in-process) and cold."""
+    joblib_code = (
+        f"import joblib; joblib.load({str(model_path)!r}); joblib.load({str(preprocessor_path)!r})"
+    )
+    export_code = (
+        "from affordable_housing.modeling.artifact import load_artifact; "
+        f"load_artifact({str(export_dir)!r})"
+    )
+    results = pd.DataFrame(
+        {
+            "warm_load_ms": [
+                time_warm_load(
+                    lambda: (joblib.load(model_path), joblib.load(preprocessor_path)), repeats
+                ),
+                time_warm_load(lambda: load_artifact(export_dir), repeats),
+            ],
+            "cold_start_ms": [
+                time_cold_load(joblib_code, repeats),
+                time_cold_load(export_code, repeats),
+            ],
+        },
+        index=["joblib", "export"],
+    )
+    return results * 1000
+
+
+@app.command()
+def main(
+    model_path: Path = MODELS_DIR / "model.pkl",
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+    output_dir: Path = MODEL_EXPORT_DIR,
+    features_path: Path = PROCESSED_DATA_DIR / "X_test.csv",
+    compare: bool = False,  # time loading against joblib
+    repeats: int = 5,
+):
+    """
+    Export model.pkl + preprocessor.pkl to the pickle-free artifact format, check that it
+    reproduces the joblib probabilities, and optionally compare load times.
+    """
+    logger.info(f"Loading model from {model_path} and preprocessor from {preprocessor_path}")
+    model = joblib.load(model_path)
+    preprocessor = joblib.load(preprocessor_path)
+
+    manifest_path = export_artifact(model, preprocessor, output_dir, file_version(model_path))
+    logger.info(f"Artifact written to {manifest_path}")
+
+    if features_path.exists():
+        X = pd.read_csv(features_path)
+        exported_model, exported_preprocessor = load_artifact(output_dir)
+        expected = model.predict_proba(preprocessor.transform(X))[:, 1]
+        actual = exported_model.predict_proba(exported_preprocessor.transform(X))[:, 1]
+        max_diff = float(np.max(np.abs(expected - actual)))
+        logger.info(f"Max probability difference vs joblib on {len(X)} rows: {max_diff:.2e}")
+        if max_diff > 1e-9:
+            raise ValueError("Exported artifact does not reproduce the joblib predictions")
+    else:
+        logger.warning(f"{features_path} not found, skipping prediction check")
+
+    if compare:
+        results = compare_load_times(model_path, preprocessor_path, output_dir, repeats)
+        logger.info("Load time comparison (ms):\n" + results.round(2).to_string())
+
+    logger.success("Export complete.")
+
+
+if __name__ == "__main__":
+    app()
@@ -7,6 +7,9 @@ from sklearn.metrics import classification_report, f1_score
 import typer
 
 from affordable_housing.config import MODELS_DIR, PROCESSED_DATA_DIR
+from affordable_housing.feature_store import KEY, ROUND, FeatureStore
+from affordable_housing.modeling.decision import decision_threshold, predict_labels
+from affordable_housing.utils import load_feature_matrix
 
 app = typer.Typer()
 
@@ -19,13 +22,31 @@ def main(
     predictions_path: Path = PROCESSED_DATA_DIR / "predictions/test_predictions.csv",
     y_test_path: Path = PROCESSED_DATA_DIR / "y_test.csv",
     # -----------------------------------------
+    # Score features read from the feature store instead of features_path: one round, or
+    # "all" for every stored round (backtests). Predictions are then keyed by application_number.
+    store_round: str | None = None,
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
 ):
-    logger.info("Loading test features and model...")
-    X_test = pd.read_csv(features_path)
     model = joblib.load(model_path)
+    if store_round is not None:
+        store = FeatureStore(preprocessor_path)
+        stored = store.read(None if store_round == "all" else store_round)
+        if stored.empty:
+            raise ValueError(f"No features stored for round {store_round} in {store.root}")
+        logger.info(f"Read {len(stored)} applications from feature store {store.version}")
+        probabilities = model.predict_proba(stored[store.feature_names])[:, 1]
+        predictions = stored[[KEY, ROUND]].assign(
+            prediction=predict_labels(model, probabilities), probability=probabilities
+        )
+        predictions.to_csv(predictions_path, index=False)
+        logger.success(f"Inference complete. Predictions saved to {predictions_path}")
+        return
+
+    logger.info("Loading test features and model...")
+    X_test = load_feature_matrix(features_path)
 
-    logger.info("Performing inference...")
-    y_test_pred = model.predict(X_test)
+    logger.info(f"Performing inference (decision threshold {decision_threshold(model):.3f})...")
+    y_test_pred = predict_labels(model, model.predict_proba(X_test)[:, 1])
     logger.info(f"First 20 predictions: {y_test_pred[:20]}")
 
     # Optionally compare to actual y_test if available
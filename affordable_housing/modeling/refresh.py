@@ -0,0 +1,335 @@
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import re
+import time
+
+import joblib
+from loguru import logger
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import FixedThresholdClassifier
+from sklearn.pipeline import Pipeline
+import typer
+
+from affordable_housing.config import (
+    DRIFT_REFERENCE_PATH,
+    EXTERNAL_DATA_DIR,
+    MODEL_EXPORT_DIR,
+    MODEL_VERSIONS_DIR,
+    MODELS_DIR,
+    PROCESSED_DATA_DIR,
+    SIMILAR_INDEX_PATH,
+)
+from affordable_housing.dataset import (
+    AWARD_KEY_PATTERN,
+    round_id_from_path,
+    standardize_application_number,
+)
+from affordable_housing.drift import (
+    PSI_THRESHOLD,
+    drift_report,
+    needs_refit,
+    save_reference_profile,
+)
+from affordable_housing.feature_store import (
+    KEY,
+    ROUND,
+    find_application_number_column,
+    read_keys,
+)
+from affordable_housing.features import artifact_path
+from affordable_housing.modeling.applicants import (
+    prepare_round_features,
+    read_excel_columns,
+    read_round_file,
+)
+from affordable_housing.modeling.artifact import MANIFEST_NAME
+from affordable_housing.modeling.export import export_artifact
+from affordable_housing.modeling.similar import SimilarityIndex, dense
+from affordable_housing.modeling.threshold import get_base_estimator
+from affordable_housing.prediction_log import file_version
+from affordable_housing.utils import save_feature_matrix
+
+app = typer.Typer()
+
+
+def is_award_key(col) -> bool:
+    return re.search(AWARD_KEY_PATTERN, str(col), re.IGNORECASE) is not None
+
+
+def read_awarded_numbers(award_path: Path, sheet_name: int = 0) -> set:
+    """Standardized application numbers of an award list (.xlsx with the header on top or .csv)."""
+    if award_path.suffix.lower() == ".csv":
+        awards = pd.read_csv(award_path, usecols=is_award_key)
+    else:
+        awards = read_excel_columns(award_path, is_award_key, header=0, sheet_name=sheet_name)
+    if len(awards.columns) == 0:
+        raise ValueError(f"No application number column in award list {award_path}")
+    numbers = awards.iloc[:, 0].dropna().astype(str)
+    return set(numbers.map(standardize_application_number))
+
+
+def label_round(raw_df: pd.DataFrame, awarded: set | None) -> tuple:
+    """
+    Standardized application numbers and award labels of an applicant list.
+
+    Labels come from the award list when given, otherwise from an AWARD ("Yes"/"No") column.
+    """
+    key_column = find_application_number_column(raw_df)
+    if key_column is None:
+        raise ValueError("The applicant list has no application number column")
+    keys = raw_df[key_column].astype(str).map(standardize_application_number)
+    if awarded is not None:
+        labels = keys.isin(awarded).astype(int)
+    elif "AWARD" in raw_df.columns:
+        labels = raw_df["AWARD"].map({"Yes": 1, "No": 0})
+    else:
+        raise ValueError("Pass an award list: the applicant list has no AWARD column")
+    return keys.rename(KEY).reset_index(drop=True), labels.rename("AWARD").reset_index(drop=True)
+
+
+def get_logistic_regression(model) -> LogisticRegression:
+    """The fitted LogisticRegression inside a model artifact (threshold wrapper and pipeline)."""
+    estimator = get_base_estimator(model)
+    if isinstance(estimator, Pipeline):
+        estimator = estimator[-1]
+    if not isinstance(estimator, LogisticRegression):
+        raise TypeError(
+            f"Refresh warm-starts a LogisticRegression, got {type(estimator).__name__}; "
+            "retrain calibrated models with train.py and threshold.py"
+        )
+    return estimator
+
+
+def warm_start_coefficients(
+    estimator: LogisticRegression, old_names, new_names
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Previous coefficients laid out in the new feature order; features the old preprocessor did
+    not produce (new categories after a refit) start at zero.
+    """
+    old_coef = dict(zip(old_names, estimator.coef_[0]))
+    coef = np.array([[old_coef.get(name, 0.0) for name in new_names]])
+    return coef, estimator.intercept_.copy()
+
+
+def warm_start_fit(model, X, y, old_names, new_names):
+    """
+    Fit a copy of the model's LogisticRegression on X, y starting from its current solution.
+
+    liblinear ignores warm_start, so it is swapped for saga, which supports both penalties and
+    reuses the previous coefficients. The model's wrappers (pipeline, decision threshold) are
+    kept.
+    """
+    estimator = get_logistic_regression(model)
+    refreshed = clone(estimator).set_params(warm_start=True)
+    if refreshed.solver == "liblinear":
+        refreshed.set_params(solver="saga")
+    refreshed.coef_, refreshed.intercept_ = warm_start_coefficients(
+        estimator, old_names, new_names
+    )
+    refreshed.fit(X, y)
+
+    base = get_base_estimator(model)
+    if isinstance(base, Pipeline):
+        refreshed = Pipeline(base.steps[:-1] + [(base.steps[-1][0], refreshed)])
+    if isinstance(model, FixedThresholdClassifier):
+        refreshed = FixedThresholdClassifier(
+            refreshed, threshold=model.threshold, response_method="predict_proba"
+        )
+    return refreshed
+
+
+def publish(
+    model,
+    preprocessor,
+    metadata: dict,
+    model_path: Path,
+    preprocessor_path: Path,
+    versions_dir: Path = MODEL_VERSIONS_DIR,
+    export_dir: Path = MODEL_EXPORT_DIR,
+) -> Path:
+    """
+    Save a refreshed model as a new version (<versions_dir>/<UTC timestamp>/) and make it the
+    current model.pkl / preprocessor.pkl; the pickle-free export is rewritten if there is one.
+    """
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    version_dir = versions_dir / version
+    version_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, version_dir / "model.pkl")
+    joblib.dump(preprocessor, version_dir / "preprocessor.pkl")
+    (version_dir / "metadata.json").write_text(
+        json.dumps({"version": version, **metadata}, indent=2)
+    )
+
+    joblib.dump(model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+    if (export_dir / MANIFEST_NAME).exists():
+        export_artifact(model, preprocessor, export_dir, file_version(model_path))
+        logger.info(f"Re-exported the artifact in {export_dir}")
+    return version_dir
+
+
+def transform_path(features_dir: Path, split: str) -> Path:
+    """The saved transformed matrix of a split, .npz when features.py ran with --sparse."""
+    npz_path = features_dir / f"X_{split}_transform.npz"
+    return npz_path if npz_path.exists() else features_dir / f"X_{split}_transform.csv"
+
+
+@app.command()
+def main(
+    input_path: Path = EXTERNAL_DATA_DIR / "2025-R2-ApplicantList.xlsx",
+    # Award list of the round (.xlsx or .csv); not needed when the applicant list already has
+    # an AWARD column
+    award_path: Path | None = None,
+    award_sheet: int = 0,
+    features_dir: Path = PROCESSED_DATA_DIR,
+    model_path: Path = MODELS_DIR / "model.pkl",
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+    psi_threshold: float = PSI_THRESHOLD,
+    refit_preprocessor: bool = False,  # refit even when the drift check does not ask for it
+    tolerance: float = 0.0,  # allowed validation F1 drop before the refresh is rejected
+):
+    """
+    Add a newly labeled round to the training set and warm-start the current model on it,
+    instead of rerunning dataset -> features -> train. The preprocessor is only refit when the
+    new round drifted from the training data; the new model is published only if its F1 on the
+    held-out split (X_test / y_test) does not regress.
+    """
+    start = time.perf_counter()
+    round_id = round_id_from_path(input_path)
+    # Versions, export, drift reference and similarity index of a preprocessor other than the
+    # deployed one are kept next to it, as features.py writes them
+    versions_dir = artifact_path(preprocessor_path, MODEL_VERSIONS_DIR)
+    export_dir = artifact_path(preprocessor_path, MODEL_EXPORT_DIR)
+    drift_reference_path = artifact_path(preprocessor_path, DRIFT_REFERENCE_PATH)
+    similar_index_path = artifact_path(preprocessor_path, SIMILAR_INDEX_PATH)
+
+    logger.info(f"Loading round {round_id} from {input_path}")
+    raw_df, X_new = prepare_round_features(read_round_file(input_path))
+    X_new = X_new.reset_index(drop=True)
+    awarded = read_awarded_numbers(award_path, award_sheet) if award_path else None
+    keys_new, y_new = label_round(raw_df, awarded)
+    logger.info(f"{len(X_new)} applications, {int(y_new.sum())} awarded")
+
+    X_train = pd.read_csv(features_dir / "X_train.csv")
+    y_train = pd.read_csv(features_dir / "y_train.csv").squeeze("columns")
+    X_val = pd.read_csv(features_dir / "X_test.csv")
+    y_val = pd.read_csv(features_dir / "y_test.csv").squeeze("columns")
+    keys_path = features_dir / "X_train_keys.csv"
+    if keys_path.exists():
+        keys_train = read_keys(keys_path)
+        # Rerunning a refresh for the same round must not duplicate its applications
+        new_rows = ~keys_new.isin(keys_train[KEY])
+        if not new_rows.all():
+            logger.info(f"Skipping {int((~new_rows).sum())} applications already in training")
+        X_new, y_new, keys_new = X_new[new_rows], y_new[new_rows], keys_new[new_rows]
+        keys_train = pd.concat(
+            [keys_train, pd.DataFrame({KEY: keys_new, ROUND: round_id})], ignore_index=True
+        )
+    if X_new.empty:
+        logger.warning("No new applications to train on, nothing to refresh")
+        return
+
+    X_combined = pd.concat([X_train, X_new], ignore_index=True)
+    y_combined = pd.concat([y_train, y_new], ignore_index=True)
+
+    logger.info("Checking the new round for drift against the training data")
+    report = drift_report(X_train, X_new)
+    logger.info("Drift report:\n" + report.to_string(index=False))
+    preprocessor = joblib.load(preprocessor_path)
+    model = joblib.load(model_path)
+    old_names = preprocessor.get_feature_names_out()
+    refit = refit_preprocessor or needs_refit(report, psi_threshold)
+    if refit:
+        logger.info("Refitting the preprocessor on the combined training data")
+        new_preprocessor = clone(preprocessor).fit(X_combined)
+    else:
+        logger.info("Keeping the current preprocessor")
+        new_preprocessor = preprocessor
+
+    X_combined_transform = new_preprocessor.transform(X_combined)
+    logger.info(f"Warm-starting the model on {len(y_combined)} rows")
+    new_model = warm_start_fit(
+        model,
+        X_combined_transform,
+        y_combined,
+        old_names,
+        new_preprocessor.get_feature_names_out(),
+    )
+
+    old_f1 = f1_score(y_val, model.predict(preprocessor.transform(X_val)))
+    X_val_transform = new_preprocessor.transform(X_val)
+    new_f1 = f1_score(y_val, new_model.predict(X_val_transform))
+    seconds = time.perf_counter() - start
+    logger.info(f"Validation F1: current {old_f1:.3f}, refreshed {new_f1:.3f}")
+    if new_f1 < old_f1 - tolerance:
+        logger.warning(
+            f"Refreshed model regresses validation F1, keeping the current model ({seconds:.1f}s)"
+        )
+        return
+
+    metadata = {
+        "round": round_id,
+        "input_path": str(input_path),
+        "award_path": str(award_path) if award_path else None,
+        "new_rows": len(X_new),
+        "training_rows": len(y_combined),
+        "preprocessor_refit": bool(refit),
+        "drifted_fields": report.loc[report["psi"] > psi_threshold, "field"].tolist(),
+        "validation_f1": {"previous": float(old_f1), "refreshed": float(new_f1)},
+    }
+    version_dir = publish(
+        new_model,
+        new_preprocessor,
+        metadata,
+        model_path,
+        preprocessor_path,
+        versions_dir,
+        export_dir,
+    )
+
+    # The refreshed training set is the base of the next refresh (and of a full retrain)
+    X_combined.to_csv(features_dir / "X_train.csv", index=False)
+    y_combined.to_frame().to_csv(features_dir / "y_train.csv", index=False)
+    if keys_path.exists():
+        keys_train.to_csv(keys_path, index=False)
+    feature_names = new_preprocessor.get_feature_names_out()
+    save_feature_matrix(X_combined_transform, transform_path(features_dir, "train"), feature_names)
+    if refit:
+        save_feature_matrix(X_val_transform, transform_path(features_dir, "test"), feature_names)
+
+    if drift_reference_path.exists():
+        save_reference_profile(X_combined, drift_reference_path)
+    if similar_index_path.exists() and keys_path.exists():
+        index = SimilarityIndex.load(similar_index_path)
+        if refit:
+            # A refit preprocessor moves every vector: rebuild over all applications
+            keys_all = pd.concat(
+                [keys_train, read_keys(features_dir / "X_test_keys.csv")], ignore_index=True
+            )
+            index = SimilarityIndex(
+                np.vstack([dense(X_combined_transform), dense(X_val_transform)]),
+                keys_all[KEY],
+                keys_all[ROUND],
+                pd.concat([y_combined, y_val], ignore_index=True),
+                feature_names,
+            )
+            logger.info(f"Rebuilt the similar-applications index over {len(index)} applications")
+        else:
+            added = index.add(
+                X_combined_transform[len(X_train) :], keys_new, [round_id] * len(keys_new), y_new
+            )
+            logger.info(f"Added {added} applications to the similar-applications index")
+        index.save(similar_index_path)
+
+    seconds = time.perf_counter() - start
+    logger.success(f"Published model version {version_dir.name} in {seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    app()
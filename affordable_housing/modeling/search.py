@@ -0,0 +1,266 @@
+import time
+from typing import NamedTuple
+
+from joblib import Parallel, delayed, effective_n_jobs
+from loguru import logger
+import numpy as np
+import pandas as pd
+from scipy.stats import uniform
+from sklearn.linear_model import LogisticRegression, LogisticRegressionCV
+from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold, check_cv
+from sklearn.pipeline import Pipeline, make_pipeline
+
+PATH_PENALTIES = {"l1": "saga", "l2": "lbfgs"}  # solvers that warm-start along the path
+PATH_CLASS_WEIGHTS = [None, "balanced"]
+# Mean CV F1 scores closer than this count as a tie, broken by fold std then by larger C
+F1_TIE_TOLERANCE = 1e-9
+
+
+class SearchResult(NamedTuple):
+    estimator: Pipeline  # refit on all the training data
+    best_params: dict
+    best_score: float  # mean cross-validated F1
+    n_candidates: int  # hyperparameter combinations evaluated
+    n_fits: int  # solver runs (a warm-started path counts once per fold), not counting the refit
+    seconds: float
+    trials: pd.DataFrame  # one row per candidate: params, mean/std/fold F1, fit seconds
+
+
+def random_search_trials(cv_results: dict, n_splits: int) -> pd.DataFrame:
+    """Per-candidate rows of a RandomizedSearchCV's cv_results_."""
+    fold_scores = np.column_stack(
+        [cv_results[f"split{i}_test_score"] for i in range(n_splits)]
+    ).tolist()
+    return pd.DataFrame(
+        {
+            "params": cv_results["params"],
+            "mean_score": cv_results["mean_test_score"],
+            "std_score": cv_results["std_test_score"],
+            "fold_scores": fold_scores,
+            "fit_seconds": cv_results["mean_fit_time"] * n_splits,
+        }
+    )
+
+
+def get_cv(n_splits: int = 3) -> StratifiedKFold:
+    return StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+
+
+def random_search(X, y, cv=None, n_iter: int = 50) -> SearchResult:
+    """The original search: `n_iter` random draws, each refit from scratch on every fold."""
+    cv = cv or get_cv()
+    param_dist = {
+        "logisticregression__C": uniform(0.001, 1000),
+        "logisticregression__penalty": ["l1", "l2"],
+        "logisticregression__solver": ["liblinear", "saga", "lbfgs"],
+        "logisticregression__class_weight": [None, "balanced"],
+        "logisticregression__max_iter": [100, 200, 500],
+    }
+    search = RandomizedSearchCV(
+        make_pipeline(LogisticRegression(random_state=42)),
+        param_distributions=param_dist,
+        n_iter=n_iter,
+        cv=cv,
+        scoring="f1",
+        random_state=42,
+        verbose=1,
+    )
+    start = time.perf_counter()
+    search.fit(X, y)
+    seconds = time.perf_counter() - start
+    return SearchResult(
+        search.best_estimator_,
+        search.best_params_,
+        float(search.best_score_),
+        n_iter,
+        n_iter * cv.get_n_splits(),
+        seconds,
+        random_search_trials(search.cv_results_, cv.get_n_splits()),
+    )
+
+
+def fit_path(X, y, cv, Cs, penalty: str, class_weight: str | None, max_iter: int, n_jobs: int = 1):
+    """
+    Cross-validated regularization path of one penalty / class weight, warm-started along Cs,
+    its folds fitted by `n_jobs` processes.
+    Returns the (n_folds, n_Cs) F1 scores, an (n_folds, n_Cs) mask of the grid points that
+    predict a single class on the held-out fold, and the seconds the path took.
+    """
+    start = time.perf_counter()
+    path = LogisticRegressionCV(
+        Cs=Cs,
+        cv=cv,
+        penalty=penalty,
+        solver=PATH_PENALTIES[penalty],
+        class_weight=class_weight,
+        scoring="f1",
+        max_iter=max_iter,
+        refit=False,
+        random_state=42,
+        n_jobs=n_jobs,
+    )
+    path.fit(X, y)
+    # scores_[label] has shape (n_folds, n_Cs), coefs_paths_[label] (n_folds, n_Cs, n_coef + 1)
+    fold_scores = next(iter(path.scores_.values()))
+    coefs_paths = next(iter(path.coefs_paths_.values()))
+    constant = np.zeros(fold_scores.shape, dtype=bool)
+    # Same splits as LogisticRegressionCV's (the splitter is deterministic)
+    for fold, (_, test) in enumerate(check_cv(cv, y, classifier=True).split(X, y)):
+        X_test = X.iloc[test].to_numpy() if hasattr(X, "iloc") else X[test]
+        decision = X_test @ coefs_paths[fold, :, :-1].T + coefs_paths[fold, :, -1]
+        positive = decision > 0
+        constant[fold] = positive.all(axis=0) | ~positive.any(axis=0)
+    return penalty, class_weight, fold_scores, constant, time.perf_counter() - start
+
+
+def path_search(
+    X,
+    y,
+    cv=None,
+    n_cs: int = 25,
+    c_min: float = 1e-3,
+    c_max: float = 1e3,
+    max_iter: int = 2000,
+    n_jobs: int = -1,
+) -> SearchResult:
+    """
+    Regularization-path search: for every penalty (L1, L2) and class weight, compute the
+    cross-validated path over a log-spaced C grid. Each fold solves the grid from strong to
+    weak regularization, warm-starting from the previous solution, and the paths of the
+    penalty / class weight combinations run in parallel.
+    Grid points predicting a single class on any held-out fold (e.g. all coefficients zeroed
+    by a strong L1 penalty) are not selected. Ties on mean F1 go to the lower fold std, then
+    to the larger C.
+    Args:
+        X: Transformed training features (dense or sparse).
+        y: Binary labels.
+        cv: CV splitter, defaults to the same 3-fold split as the random search.
+        n_cs (int): Grid points between c_min and c_max.
+        c_min (float), c_max (float): C range, the one the random search samples from.
+        max_iter (int): Solver iteration cap per grid point.
+        n_jobs (int): Processes (joblib semantics, -1 for one per core), split between the
+            paths and the folds of each path.
+    Returns:
+        SearchResult: Best C / penalty / class weight, refit as the usual pipeline.
+    """
+    cv = cv or get_cv()
+    Cs = np.logspace(np.log10(c_min), np.log10(c_max), n_cs)
+    configs = [(p, w) for p in PATH_PENALTIES for w in PATH_CLASS_WEIGHTS]
+
+    # One process per path, the remaining cores shared among the folds of each path
+    n_jobs = effective_n_jobs(n_jobs)
+    path_jobs = min(len(configs), n_jobs)
+    fold_jobs = max(1, n_jobs // path_jobs)
+
+    start = time.perf_counter()
+    paths = Parallel(n_jobs=path_jobs)(
+        delayed(fit_path)(X, y, cv, Cs, penalty, class_weight, max_iter, fold_jobs)
+        for penalty, class_weight in configs
+    )
+    scores = pd.DataFrame(
+        [
+            {
+                "penalty": p,
+                "class_weight": w or "none",
+                "C": C,
+                "f1": C_scores.mean(),
+                "std": C_scores.std(),
+                "fold_scores": C_scores.tolist(),
+                "constant": bool(C_constant.any()),
+                # A path is solved as a whole: its time is spread evenly over the grid points
+                "fit_seconds": path_seconds / n_cs,
+            }
+            for p, w, fold_scores, constant, path_seconds in paths
+            for C, C_scores, C_constant in zip(Cs, fold_scores.T, constant.T)
+        ]
+    )
+    params = [path_params(row, max_iter) for _, row in scores.iterrows()]
+    n_constant = int(scores["constant"].sum())
+    if n_constant == len(scores):
+        logger.warning("Every candidate predicts a single class on some held-out fold")
+    elif n_constant:
+        logger.info(f"Skipped {n_constant} candidates predicting a single class on some fold")
+    best = select_candidate(scores)
+    best_params = params[best]
+    best_score = scores.loc[best, "f1"]
+    if scores.loc[best, "C"] in (Cs[0], Cs[-1]):
+        logger.warning(
+            f"Best C {scores.loc[best, 'C']:.3g} is on the edge of the searched range "
+            f"[{c_min:g}, {c_max:g}]; the optimum may lie outside it"
+        )
+    estimator = make_pipeline(LogisticRegression(random_state=42))
+    estimator.set_params(**best_params)
+    estimator.fit(X, y)
+    seconds = time.perf_counter() - start
+    logger.info(
+        "Best F1 per penalty / class weight:\n"
+        + best_per_config(scores.drop(columns=["fold_scores"])).to_string()
+    )
+    trials = pd.DataFrame(
+        {
+            "params": params,
+            "mean_score": scores["f1"],
+            "std_score": scores["std"],
+            "fold_scores": scores["fold_scores"],
+            "fit_seconds": scores["fit_seconds"],
+        }
+    )
+    return SearchResult(
+        estimator,
+        best_params,
+        float(best_score),
+        len(configs) * n_cs,
+        len(configs) * cv.get_n_splits(),
+        seconds,
+        trials,
+    )
+
+
+def select_candidate(scores: pd.DataFrame) -> int:
+    """
+    Index of the best path search grid point: the highest mean F1 among those that never
+    predict a single class, ties going to the lower fold std, then to the larger C.
+    """
+    eligible = scores[~scores["constant"]]
+    if eligible.empty:
+        eligible = scores
+    tied = eligible[eligible["f1"] >= eligible["f1"].max() - F1_TIE_TOLERANCE]
+    return tied.sort_values(["std", "C"], ascending=[True, False], kind="stable").index[0]
+
+
+def path_params(row: pd.Series, max_iter: int) -> dict:
+    """Pipeline parameters of one grid point of a path search."""
+    return {
+        "logisticregression__C": float(row["C"]),
+        "logisticregression__penalty": row["penalty"],
+        "logisticregression__solver": PATH_PENALTIES[row["penalty"]],
+        "logisticregression__class_weight": None
+        if row["class_weight"] == "none"
+        else row["class_weight"],
+        "logisticregression__max_iter": max_iter,
+    }
+
+
+def best_per_config(scores: pd.DataFrame) -> pd.DataFrame:
+    rows = scores.loc[
+        [select_candidate(group) for _, group in scores.groupby(["penalty", "class_weight"])]
+    ]
+    return rows.set_index(["penalty", "class_weight"])
+
+
+def compare_searches(random: SearchResult, path: SearchResult) -> pd.DataFrame:
+    """Side by side timing, number of solver runs and best CV F1 of the two searches."""
+    return pd.DataFrame(
+        {
+            name: {
+                "seconds": result.seconds,
+                "candidates": result.n_candidates,
+                "solver_runs": result.n_fits,
+                "best_cv_f1": result.best_score,
+                "C": result.best_params["logisticregression__C"],
+                "penalty": result.best_params["logisticregression__penalty"],
+                "class_weight": result.best_params["logisticregression__class_weight"],
+            }
+            for name, result in (("random", random), ("path", path))
+        }
+    )
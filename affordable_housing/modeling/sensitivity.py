@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+NUMERIC_FIELDS = [
+    "avg_targeted_affordability",
+    "CDLAC_total_points_score",
+    "CDLAC_tie_breaker_self_score",
+    "bond_request_amount",
+    "homeless_percent",
+]
+MAX_GRID_POINTS = 250_000
+
+
+def build_grid(base: dict, axes: dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Build one scoring matrix holding the full grid over `axes` followed by one 1-D sweep per
+    axis (other fields held at their base values), so everything is scored in a single call.
+    Args:
+        base (dict): One PredictionInput as a dict of raw field values.
+        axes (dict): Field name -> 1-D array of candidate values.
+    Returns:
+        pd.DataFrame: Rows in raw feature format; the first prod(len(axis)) rows are the grid
+            in C order, then the per-field sweeps in the order of `axes`.
+    """
+    fields = list(axes)
+    mesh = np.meshgrid(*[axes[f] for f in fields], indexing="ij")
+    n_grid = mesh[0].size if fields else 0
+    n_total = n_grid + sum(len(axes[f]) for f in fields)
+
+    columns = {}
+    for name, value in base.items():
+        if name in axes:
+            sweeps = [axes[f] if f == name else np.full(len(axes[f]), value) for f in fields]
+            columns[name] = np.concatenate([mesh[fields.index(name)].ravel(), *sweeps])
+        else:
+            columns[name] = np.full(
+                n_total, value, dtype=object if isinstance(value, str) else None
+            )
+    return pd.DataFrame(columns)
+
+
+def minimum_change(
+    values: np.ndarray, probabilities: np.ndarray, current: float, threshold: float
+) -> int | None:
+    """
+    Index of the value closest to `current` whose probability reaches `threshold`, or None if
+    no value in the range crosses it.
+    """
+    crossing = probabilities >= threshold
+    if not crossing.any():
+        return None
+    distance = np.where(crossing, np.abs(values - current), np.inf)
+    return int(np.argmin(distance))
+
+
+def sensitivity(base: dict, axes: dict[str, np.ndarray], score, threshold: float) -> dict:
+    """
+    Score the grid around one application and find the smallest changes that cross the award
+    threshold.
+    Args:
+        base (dict): One PredictionInput as a dict of raw field values.
+        axes (dict): Field name -> 1-D array of candidate values (numeric fields only).
+        score (callable): Maps a raw feature DataFrame to positive-class probabilities.
+        threshold (float): Award decision threshold.
+    Returns:
+        dict: Base probability, probability surface over the grid, and per-field and joint
+            minimum-change suggestions: the current values, a change of 0, when the base
+            probability already reaches the threshold.
+    """
+    fields = list(axes)
+    grid = build_grid(base, axes)
+    base_row = pd.DataFrame([base])
+    probabilities = score(pd.concat([base_row, grid], ignore_index=True))
+    base_probability, probabilities = float(probabilities[0]), probabilities[1:]
+
+    shape = tuple(len(axes[f]) for f in fields)
+    n_grid = int(np.prod(shape))
+    surface = probabilities[:n_grid].reshape(shape)
+    result = {
+        "threshold": threshold,
+        "base_probability": base_probability,
+        "axes": {field: np.asarray(axes[field], dtype=float).tolist() for field in fields},
+        "surface": surface.tolist(),
+    }
+
+    if base_probability >= threshold:
+        # Already awarded: no change is needed, rather than the closest crossing grid value
+        suggestions = [
+            {
+                "field": field,
+                "current": float(base[field]),
+                "required": float(base[field]),
+                "change": 0.0,
+                "probability": base_probability,
+            }
+            for field in fields
+        ]
+        best_combination = {
+            "values": {field: float(base[field]) for field in fields},
+            "probability": base_probability,
+        }
+        return {**result, "suggestions": suggestions, "best_combination": best_combination}
+
+    suggestions = []
+    offset = n_grid
+    for field in fields:
+        values = np.asarray(axes[field], dtype=float)
+        sweep = probabilities[offset : offset + len(values)]
+        offset += len(values)
+        idx = minimum_change(values, sweep, float(base[field]), threshold)
+        suggestions.append(
+            {
+                "field": field,
+                "current": float(base[field]),
+                "required": None if idx is None else float(values[idx]),
+                "change": None if idx is None else float(values[idx] - base[field]),
+                "probability": None if idx is None else float(sweep[idx]),
+            }
+        )
+
+    # Joint suggestion: grid point that crosses the threshold with the smallest total change,
+    # each field's change measured relative to the width of its range
+    best_combination = None
+    crossing = surface >= threshold
+    if crossing.any():
+        mesh = np.meshgrid(*[np.asarray(axes[f], dtype=float) for f in fields], indexing="ij")
+        cost = np.zeros(shape)
+        for field, values in zip(fields, mesh):
+            width = np.ptp(axes[field]) or 1.0
+            cost += np.abs(values - float(base[field])) / width
+        cost[~crossing] = np.inf
+        idx = np.unravel_index(np.argmin(cost), shape)
+        best_combination = {
+            "values": {field: float(mesh[i][idx]) for i, field in enumerate(fields)},
+            "probability": float(surface[idx]),
+        }
+
+    return {**result, "suggestions": suggestions, "best_combination": best_combination}
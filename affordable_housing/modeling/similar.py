@@ -0,0 +1,197 @@
+from pathlib import Path
+import time
+
+import joblib
+from loguru import logger
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.neighbors import BallTree
+import typer
+
+from affordable_housing.config import (
+    EXTERNAL_DATA_DIR,
+    MODELS_DIR,
+    PROCESSED_DATA_DIR,
+    SIMILAR_INDEX_PATH,
+)
+from affordable_housing.feature_store import (
+    KEY,
+    ROUND,
+    find_application_number_column,
+    read_keys,
+)
+from affordable_housing.modeling.applicants import prepare_round_features, read_round_file
+from affordable_housing.utils import load_feature_matrix
+
+app = typer.Typer()
+
+LEAF_SIZE = 20
+# Rows added since the last build are searched brute force; past this fraction of the tree's
+# size the tree is rebuilt over everything
+REBUILD_FRACTION = 0.2
+
+
+def dense(X) -> np.ndarray:
+    if sparse.issparse(X):
+        return X.toarray()
+    return np.asarray(X, dtype=np.float64)
+
+
+class SimilarityIndex:
+    """
+    Historical applications in the preprocessor's feature space, for nearest-neighbour lookup.
+
+    The bulk of the rows sit in a BallTree built once; rows added later (a newly labeled
+    round) go to a small pending block searched brute force, and the tree is rebuilt when the
+    pending block outgrows REBUILD_FRACTION of it.
+    """
+
+    def __init__(self, X, keys, rounds, awards, feature_names=None):
+        self.X = dense(X)
+        self.keys = np.asarray(keys, dtype=object)
+        self.rounds = np.asarray(rounds, dtype=object)
+        self.awards = np.asarray(awards, dtype=np.int64)
+        self.feature_names = None if feature_names is None else np.asarray(feature_names, str)
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the tree over every row, emptying the pending block."""
+        self.tree = BallTree(self.X, leaf_size=LEAF_SIZE)
+        self.n_indexed = len(self.X)
+
+    def __len__(self) -> int:
+        return len(self.X)
+
+    def add(self, X, keys, rounds, awards) -> int:
+        """
+        Add applications not in the index yet (by key), rebuilding the tree if needed.
+        Returns:
+            int: Number of rows added.
+        """
+        keys = np.asarray(keys, dtype=object)
+        new = ~pd.Index(keys).isin(self.keys)
+        if not new.any():
+            return 0
+        self.X = np.vstack([self.X, dense(X)[new]])
+        self.keys = np.concatenate([self.keys, keys[new]])
+        self.rounds = np.concatenate([self.rounds, np.asarray(rounds, dtype=object)[new]])
+        self.awards = np.concatenate([self.awards, np.asarray(awards, dtype=np.int64)[new]])
+        if len(self.X) - self.n_indexed > REBUILD_FRACTION * self.n_indexed:
+            self.rebuild()
+        return int(new.sum())
+
+    def query(self, X, k: int = 5) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Distances and row positions of the k nearest applications of each query row, nearest
+        first, over the tree and the pending block.
+        """
+        X = dense(X)
+        k = min(k, len(self.X))
+        distances, indices = self.tree.query(X, k=min(k, self.n_indexed))
+        if len(self.X) > self.n_indexed:
+            pending = self.X[self.n_indexed :]
+            pending_distances = np.sqrt(((X[:, None, :] - pending[None, :, :]) ** 2).sum(axis=2))
+            distances = np.hstack([distances, pending_distances])
+            pending_indices = np.arange(self.n_indexed, len(self.X))
+            indices = np.hstack(
+                [indices, np.broadcast_to(pending_indices, pending_distances.shape)]
+            )
+            order = np.argsort(distances, axis=1, kind="stable")[:, :k]
+            distances = np.take_along_axis(distances, order, axis=1)
+            indices = np.take_along_axis(indices, order, axis=1)
+        return distances, indices
+
+    def neighbours(self, X, k: int = 5) -> pd.DataFrame:
+        """The k nearest applications of each query row as records (query, rank, key, ...)."""
+        distances, indices = self.query(X, k)
+        return pd.DataFrame(
+            {
+                "query": np.repeat(np.arange(len(indices)), indices.shape[1]),
+                "rank": np.tile(np.arange(1, indices.shape[1] + 1), len(indices)),
+                KEY: self.keys[indices.ravel()],
+                ROUND: self.rounds[indices.ravel()],
+                "awarded": self.awards[indices.ravel()],
+                "distance": distances.ravel(),
+            }
+        )
+
+    def save(self, path: Path = SIMILAR_INDEX_PATH) -> Path:
+        # The state, not the instance: a pickled class would be bound to the module that
+        # created it (__main__ when run as a script)
+        joblib.dump(vars(self), path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = SIMILAR_INDEX_PATH) -> "SimilarityIndex":
+        index = cls.__new__(cls)
+        index.__dict__.update(joblib.load(path))
+        return index
+
+
+def read_split(features_dir: Path, split: str):
+    """Transformed features, keys, rounds and labels of a features.py split (train or test)."""
+    npz_path = features_dir / f"X_{split}_transform.npz"
+    X = load_feature_matrix(
+        npz_path if npz_path.exists() else features_dir / f"X_{split}_transform.csv"
+    )
+    keys = read_keys(features_dir / f"X_{split}_keys.csv")
+    awards = pd.read_csv(features_dir / f"y_{split}.csv").squeeze("columns")
+    return X, keys[KEY], keys[ROUND], awards
+
+
+def build_index(features_dir: Path = PROCESSED_DATA_DIR, feature_names=None) -> SimilarityIndex:
+    """Index every training and test application saved by features.py."""
+    X_train, keys_train, rounds_train, y_train = read_split(features_dir, "train")
+    X_test, keys_test, rounds_test, y_test = read_split(features_dir, "test")
+    return SimilarityIndex(
+        np.vstack([dense(X_train), dense(X_test)]),
+        pd.concat([keys_train, keys_test]),
+        pd.concat([rounds_train, rounds_test]),
+        pd.concat([y_train, y_test]),
+        feature_names,
+    )
+
+
+@app.command()
+def build(
+    features_dir: Path = PROCESSED_DATA_DIR,
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+    output_path: Path = SIMILAR_INDEX_PATH,
+):
+    """Build the nearest-historical-applications index from the features.py outputs."""
+    feature_names = joblib.load(preprocessor_path).get_feature_names_out()
+    index = build_index(features_dir, feature_names)
+    index.save(output_path)
+    logger.success(f"Indexed {len(index)} applications in {output_path}")
+
+
+@app.command()
+def query(
+    input_path: Path = EXTERNAL_DATA_DIR / "2025-R2-ApplicantList.xlsx",
+    output_path: Path = PROCESSED_DATA_DIR / "predictions/2025-R2-similar.csv",
+    preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
+    index_path: Path = SIMILAR_INDEX_PATH,
+    k: int = 5,
+):
+    """Write the k most similar historical applications of each application in a round."""
+    index = SimilarityIndex.load(index_path)
+    preprocessor = joblib.load(preprocessor_path)
+    raw_df, X = prepare_round_features(read_round_file(input_path))
+    start = time.perf_counter()
+    neighbours = index.neighbours(preprocessor.transform(X), k)
+    seconds = time.perf_counter() - start
+    logger.info(
+        f"{len(X)} lookups in {seconds * 1000:.1f} ms ({seconds / len(X) * 1e6:.0f} us each)"
+    )
+
+    key_column = find_application_number_column(raw_df)
+    if key_column is not None:
+        applications = raw_df[key_column].astype(str).to_numpy()
+        neighbours.insert(0, "query_application_number", applications[neighbours["query"]])
+    neighbours.drop(columns="query").to_csv(output_path, index=False)
+    logger.success(f"Similar applications saved to {output_path}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,141 @@
+from pathlib import Path
+
+import joblib
+from loguru import logger
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.model_selection import (
+    FixedThresholdClassifier,
+    StratifiedKFold,
+    cross_val_predict,
+)
+import typer
+
+from affordable_housing.config import MODELS_DIR, PROCESSED_DATA_DIR
+from affordable_housing.modeling.decision import FALLBACK_THRESHOLD
+from affordable_housing.utils import load_feature_matrix
+
+app = typer.Typer()
+
+CALIBRATION_METHODS = ["none", "sigmoid", "isotonic"]
+
+
+def get_base_estimator(model):
+    """Strip a FixedThresholdClassifier wrapper to get the underlying fitted estimator."""
+    if isinstance(model, FixedThresholdClassifier):
+        return model.estimator
+    return model
+
+
+def sweep_thresholds(y_true, y_proba) -> pd.DataFrame:
+    """
+    Evaluate every distinct threshold in one vectorized pass.
+
+    Probabilities are sorted once in descending order; cumulative sums of the sorted labels
+    give the true/false positive counts when predicting positive for p >= threshold.
+    Args:
+        y_true: Binary labels (0/1).
+        y_proba: Positive-class probabilities.
+    Returns:
+        pd.DataFrame: One row per distinct threshold with tp, fp, precision, recall and f1.
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    y_proba = np.asarray(y_proba, dtype=np.float64)
+    order = np.argsort(-y_proba, kind="mergesort")
+    proba_sorted = y_proba[order]
+    labels_sorted = y_true[order]
+
+    tp = np.cumsum(labels_sorted)
+    fp = np.cumsum(1 - labels_sorted)
+    # Keep the last position of each run of equal probabilities: all of them are predicted
+    # positive together once the threshold drops to that value
+    last_of_run = np.r_[proba_sorted[1:] != proba_sorted[:-1], True]
+    tp, fp, thresholds = tp[last_of_run], fp[last_of_run], proba_sorted[last_of_run]
+
+    n_positive = y_true.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = tp / n_positive if n_positive else np.zeros_like(tp, dtype=np.float64)
+        f1 = np.where(tp + fp + n_positive > 0, 2 * tp / (tp + fp + n_positive), 0.0)
+
+    return pd.DataFrame(
+        {
+            "threshold": thresholds,
+            "tp": tp,
+            "fp": fp,
+            "precision": precision,
+            "recall": recall,
+            "f1": f1,
+        }
+    )
+
+
+@app.command()
+def main(
+    features_path: Path = PROCESSED_DATA_DIR / "X_train_transform.csv",
+    labels_path: Path = PROCESSED_DATA_DIR / "y_train.csv",
+    model_path: Path = MODELS_DIR / "model.pkl",
+    output_model_path: Path = MODELS_DIR / "model.pkl",
+    sweep_path: Path = PROCESSED_DATA_DIR / "threshold_sweep.csv",
+    calibration: str = "none",  # "none", "sigmoid" (Platt) or "isotonic"
+    n_splits: int = 3,
+):
+    """
+    Tune the decision threshold on out-of-fold probabilities, optionally calibrate the model,
+    and write the chosen threshold into the model artifact.
+    """
+    if calibration not in CALIBRATION_METHODS:
+        raise typer.BadParameter(f"calibration must be one of {CALIBRATION_METHODS}")
+
+    logger.info("Loading training data and model...")
+    X_train = load_feature_matrix(features_path)
+    y_train = pd.read_csv(labels_path).squeeze()
+    base_model = get_base_estimator(joblib.load(model_path))
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+
+    if calibration == "none":
+        final_model = base_model
+    else:
+        logger.info(f"Calibrating probabilities with {calibration} regression")
+        final_model = CalibratedClassifierCV(
+            clone(base_model), method=calibration, cv=cv, ensemble=False
+        )
+
+    logger.info("Computing out-of-fold probabilities...")
+    oof_proba = cross_val_predict(
+        clone(final_model), X_train, y_train, cv=cv, method="predict_proba"
+    )[:, 1]
+    if calibration != "none":
+        final_model.fit(X_train, y_train)
+
+    sweep = sweep_thresholds(y_train, oof_proba)
+    best_idx = sweep["f1"].idxmax()
+    best = sweep.loc[best_idx]
+    # Cut halfway to the next lower probability so the threshold is not tied to one OOF value
+    threshold = best["threshold"]
+    if best_idx + 1 < len(sweep):
+        threshold = (threshold + sweep.loc[best_idx + 1, "threshold"]) / 2
+    logger.info(
+        f"Best threshold {threshold:.3f}: F1 {best['f1']:.3f}, "
+        f"precision {best['precision']:.3f}, recall {best['recall']:.3f}"
+    )
+    fallback_f1 = sweep.loc[sweep["threshold"] >= FALLBACK_THRESHOLD, "f1"]
+    if not fallback_f1.empty:
+        logger.info(
+            f"F1 at the fallback {FALLBACK_THRESHOLD} threshold: {fallback_f1.iloc[-1]:.3f}"
+        )
+
+    sweep.to_csv(sweep_path, index=False)
+    logger.info(f"Threshold sweep saved to {sweep_path}")
+
+    tuned_model = FixedThresholdClassifier(
+        final_model, threshold=float(threshold), response_method="predict_proba"
+    )
+    joblib.dump(tuned_model, output_model_path)
+    logger.success(f"Model with threshold {threshold:.3f} saved to {output_model_path}")
+
+
+if __name__ == "__main__":
+    app()
@@ -2,66 +2,108 @@ from pathlib import Path
 
 import joblib
 from loguru import logger
-import mlflow
 import pandas as pd
-from scipy.stats import uniform
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold
-from sklearn.pipeline import make_pipeline
 import typer
 
-from affordable_housing.config import MODELS_DIR, PROCESSED_DATA_DIR
+from affordable_housing.config import (
+    BOOTSTRAP_PATH,
+    EXPERIMENT_DB,
+    MODELS_DIR,
+    PROCESSED_DATA_DIR,
+)
+from affordable_housing.modeling.bootstrap import fit_bootstrap
+from affordable_housing.modeling.search import (
+    compare_searches,
+    get_cv,
+    path_search,
+    random_search,
+)
+from affordable_housing.prediction_log import file_version
+from affordable_housing.tracking import Tracker, export_to_mlflow
+from affordable_housing.utils import load_feature_matrix
 
 app = typer.Typer()
 
+EXPERIMENT = "AffordableHousing"
+
 
 @app.command()
 def main(
     features_path: Path = PROCESSED_DATA_DIR / "X_train_transform.csv",
     labels_path: Path = PROCESSED_DATA_DIR / "y_train.csv",
     model_path: Path = MODELS_DIR / "model.pkl",
+    search: str = "random",  # "random" (50 random draws) or "path" (warm-started C paths)
+    n_cs: int = 25,  # log-spaced C values per path in path mode
+    n_jobs: int = -1,  # path mode processes, -1 for one per core
+    compare: bool = False,  # run both searches and log their timing and best CV F1
+    run_name: str = "2025R1Train",
+    # Dataset label the tracker groups results by, defaults to the features file name
+    dataset: str | None = None,
+    tracking_db: Path = EXPERIMENT_DB,
+    mlflow: bool = False,  # also copy the tracked run to mlflow (optional dependency)
+    # Bootstrap replicas of the best model fitted for served probability intervals, 0 to skip
+    bootstrap: int = 0,
+    bootstrap_path: Path = BOOTSTRAP_PATH,
 ):
     logger.info("Loading training data...")
-    X_train = pd.read_csv(features_path)
+    X_train = load_feature_matrix(features_path)  # .npz keeps sparse one-hot features sparse
     y_train = pd.read_csv(labels_path).squeeze()
+    if search not in ("random", "path"):
+        raise typer.BadParameter(f"Unknown search {search!r}, expected 'random' or 'path'")
 
     logger.info("Setting up model pipeline and hyperparameter search...")
+    cv = get_cv()
 
-    # Since we have already transformed features, no need for preprocessing
-    full_pipeline = make_pipeline(LogisticRegression(random_state=42))
-
-    param_dist = {
-        "logisticregression__C": uniform(0.001, 1000),
-        "logisticregression__penalty": ["l1", "l2"],
-        "logisticregression__solver": ["liblinear", "saga", "lbfgs"],
-        "logisticregression__class_weight": [None, "balanced"],
-        "logisticregression__max_iter": [100, 200, 500],
-    }
+    tracker = Tracker(tracking_db)
+    with tracker.start_run(
+        EXPERIMENT,
+        run_name,
+        model_type="LogisticRegression",
+        dataset=dataset or features_path.stem,
+        data_paths=(features_path, labels_path),
+    ) as run:
+        logger.info(f"Fitting model ({search} search)...")
+        results = {}
+        if search == "random" or compare:
+            results["random"] = random_search(X_train, y_train, cv)
+        if search == "path" or compare:
+            results["path"] = path_search(X_train, y_train, cv, n_cs=n_cs, n_jobs=n_jobs)
+        if compare:
+            comparison = compare_searches(results["random"], results["path"])
+            logger.info("Search comparison:\n" + comparison.to_string())
 
-    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
-    random_search = RandomizedSearchCV(
-        full_pipeline,
-        param_distributions=param_dist,
-        n_iter=50,
-        cv=cv,
-        scoring="f1",
-        random_state=42,
-        verbose=1,
-    )
-    mlflow.set_experiment("AffordableHousing")
-    mlflow.sklearn.autolog()
-    with mlflow.start_run(run_name="2025R1Train"):
-        logger.info("Fitting model...")
-        random_search.fit(X_train, y_train)
-        logger.info(f"Best Validation F1 (CV): {random_search.best_score_:.3f}")
-        logger.info(f"Best Parameters: {random_search.best_params_}")
+        for name, searched in results.items():
+            run.log_trials(searched.trials, "LogisticRegression")
+            run.log_metric(f"{name}_search_seconds", searched.seconds)
+            run.log_metric(f"{name}_best_cv_f1", searched.best_score)
+        result = results[search]
+        run.log_best(result.best_params, result.best_score)
+        logger.info(f"Best Validation F1 (CV): {result.best_score:.3f}")
+        logger.info(f"Best Parameters: {result.best_params}")
 
-        best_model_pipeline = random_search.best_estimator_
+        best_model_pipeline = result.estimator
 
         logger.info(f"Saving best model to {model_path}")
         joblib.dump(best_model_pipeline, model_path)
+        run.log_artifact("model", model_path)
+        if bootstrap:
+            logger.info(f"Fitting {bootstrap} bootstrap replicas of the best model...")
+            ensemble = fit_bootstrap(
+                best_model_pipeline,
+                X_train,
+                y_train,
+                bootstrap,
+                feature_names=getattr(X_train, "columns", None),
+                model_version=file_version(model_path),
+            )
+            ensemble.save(bootstrap_path)
+            run.log_artifact("bootstrap", bootstrap_path)
         logger.success("Model training and saving complete.")
 
+    if mlflow:
+        mlflow_run_id = export_to_mlflow(tracker, run.id)
+        logger.info(f"Exported run {run.id} to mlflow run {mlflow_run_id}")
+
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,214 @@
+from pathlib import Path
+
+import joblib
+from loguru import logger
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+import typer
+
+from affordable_housing.config import MODELS_DIR, PROCESSED_DATA_DIR
+from affordable_housing.features import RENAMED_CAT, build_preprocessor
+
+app = typer.Typer()
+
+CHUNK_SIZE = 100_000
+SEED = 42
+OUTPUT_DIR = MODELS_DIR / "online"  # away from the deployed model.pkl / preprocessor.pkl
+# Rows of CDLAC_total_points_score sampled uniformly from the whole stream to fit Yeo-Johnson
+POINTS_SAMPLE_ROWS = 100_000
+
+
+def iter_chunks(features_path: Path, labels_path: Path, chunksize: int = CHUNK_SIZE):
+    """
+    Stream aligned (features, labels) chunks from the raw feature and label CSVs.
+    Args:
+        features_path (Path): CSV of renamed, untransformed features (X_train.csv).
+        labels_path (Path): CSV of 0/1 labels in the same row order (y_train.csv).
+        chunksize (int): Number of rows held in memory at a time.
+    Yields:
+        tuple[pd.DataFrame, np.ndarray]: Feature chunk and its labels.
+    """
+    features = pd.read_csv(features_path, chunksize=chunksize)
+    labels = pd.read_csv(labels_path, chunksize=chunksize)
+    for X_chunk, y_chunk in zip(features, labels):
+        yield X_chunk, y_chunk.iloc[:, 0].to_numpy()
+
+
+def chunk_offsets(path: Path, chunksize: int = CHUNK_SIZE) -> list[int]:
+    """
+    Byte offset of the first row of every `chunksize` rows of a CSV, so chunks can be read in
+    any order. Assumes one record per line, as features.py writes them.
+    """
+    offsets = []
+    with open(path, "rb") as f:
+        f.readline()  # header
+        offset = f.tell()
+        for n_rows, line in enumerate(f):
+            if n_rows % chunksize == 0:
+                offsets.append(offset)
+            offset += len(line)
+    return offsets
+
+
+def read_chunk(path: Path, columns: list, offset: int, chunksize: int) -> pd.DataFrame:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return pd.read_csv(f, header=None, names=columns, nrows=chunksize)
+
+
+def iter_shuffled_chunks(
+    features_path: Path,
+    labels_path: Path,
+    offsets: tuple,
+    rng: np.random.Generator,
+    chunksize: int = CHUNK_SIZE,
+):
+    """
+    Like iter_chunks, but visit the chunks in a random order and shuffle the rows of each, so
+    SGD does not see the file order (e.g. sorted by round). Peak memory is still one chunk.
+    Args:
+        offsets (tuple): chunk_offsets of the feature and of the label CSV.
+        rng (np.random.Generator): Source of the chunk and row orders.
+    """
+    feature_offsets, label_offsets = offsets
+    feature_columns = list(pd.read_csv(features_path, nrows=0).columns)
+    label_columns = list(pd.read_csv(labels_path, nrows=0).columns)
+    for i in rng.permutation(len(feature_offsets)):
+        X_chunk = read_chunk(features_path, feature_columns, feature_offsets[i], chunksize)
+        y_chunk = read_chunk(labels_path, label_columns, label_offsets[i], chunksize)
+        if len(X_chunk) != len(y_chunk):
+            raise ValueError(f"Chunk {i} of {features_path} and {labels_path} are not aligned")
+        order = rng.permutation(len(X_chunk))
+        yield X_chunk.iloc[order], y_chunk.iloc[order, 0].to_numpy()
+
+
+def fit_streaming_preprocessor(
+    features_path: Path, labels_path: Path, chunksize: int = CHUNK_SIZE, sparse: bool = True
+):
+    """
+    Fit the standard preprocessor in one streaming pass over the feature CSV.
+
+    The category vocabulary and the StandardScaler statistics are accumulated chunk by chunk
+    with partial_fit. The Yeo-Johnson lambda has no incremental estimator, so it is fitted on
+    a uniform sample of up to POINTS_SAMPLE_ROWS rows drawn from every chunk. Yeo-Johnson is
+    monotonic, so the MinMaxScaler after it is fitted on the transformed streamed min and max.
+    Args:
+        features_path (Path): CSV of renamed, untransformed features.
+        labels_path (Path): CSV of labels, used only to keep chunks aligned.
+        chunksize (int): Number of rows held in memory at a time.
+        sparse (bool): Keep one-hot output sparse.
+    Returns:
+        tuple[ColumnTransformer, pd.Series]: Fitted preprocessor and label counts per class.
+    """
+    first_chunk = None
+    vocab = {col: set() for col in RENAMED_CAT}
+    remainder_scaler = StandardScaler()
+    rng = np.random.default_rng(SEED)
+    # Uniform sample without replacement: the rows with the smallest random keys so far
+    points_sample, sample_keys = np.empty(0), np.empty(0)
+    points_min, points_max = np.inf, -np.inf
+    class_counts = pd.Series(dtype="int64")
+    n_rows = 0
+
+    for X_chunk, y_chunk in iter_chunks(features_path, labels_path, chunksize):
+        if first_chunk is None:
+            first_chunk = X_chunk
+            preprocessor = build_preprocessor(sparse=sparse)
+            # Fit once on the first chunk to get a fitted ColumnTransformer skeleton
+            preprocessor.fit(first_chunk)
+            remainder_cols = [
+                preprocessor.feature_names_in_[col] if isinstance(col, (int, np.integer)) else col
+                for col in preprocessor.transformers_[-1][2]
+            ]
+
+        for col in RENAMED_CAT:
+            vocab[col].update(X_chunk[col].dropna().unique())
+        remainder_scaler.partial_fit(X_chunk[remainder_cols])
+        points = X_chunk["CDLAC_total_points_score"].to_numpy(dtype=np.float64)
+        points_min = np.fmin(points_min, np.nanmin(points, initial=np.inf))
+        points_max = np.fmax(points_max, np.nanmax(points, initial=-np.inf))
+        points_sample = np.r_[points_sample, points]
+        sample_keys = np.r_[sample_keys, rng.random(len(points))]
+        if len(sample_keys) > POINTS_SAMPLE_ROWS:
+            keep = np.argpartition(sample_keys, POINTS_SAMPLE_ROWS)[:POINTS_SAMPLE_ROWS]
+            points_sample, sample_keys = points_sample[keep], sample_keys[keep]
+        class_counts = class_counts.add(pd.Series(y_chunk).value_counts(), fill_value=0)
+        n_rows += len(X_chunk)
+
+    if first_chunk is None:
+        raise ValueError(f"No rows found in {features_path}")
+    logger.info(f"Streamed {n_rows} rows to fit preprocessing statistics")
+    if n_rows > len(points_sample):
+        logger.info(f"Yeo-Johnson fitted on a uniform sample of {len(points_sample)} rows")
+
+    # Swap the chunk-fitted statistics into the skeleton
+    categories = [sorted(vocab[col], key=str) for col in RENAMED_CAT]
+    encoder = preprocessor.named_transformers_["category"][0]
+    encoder.set_params(categories=categories)
+    encoder.fit(first_chunk[RENAMED_CAT])
+    points_power = preprocessor.named_transformers_["points_power"][0]
+    points_power.fit(pd.DataFrame({"CDLAC_total_points_score": points_sample}))
+    points_range = pd.DataFrame({"CDLAC_total_points_score": [points_min, points_max]})
+    points_scaler = MinMaxScaler().fit(points_power.transform(points_range))
+    preprocessor.named_transformers_["points_power"].steps[-1] = ("minmaxscaler", points_scaler)
+    preprocessor.named_transformers_["remainder"].steps[-1] = ("standardscaler", remainder_scaler)
+    return preprocessor, class_counts.sort_index().astype("int64")
+
+
+@app.command()
+def main(
+    features_path: Path = PROCESSED_DATA_DIR / "X_train.csv",
+    labels_path: Path = PROCESSED_DATA_DIR / "y_train.csv",
+    model_path: Path = OUTPUT_DIR / "model.pkl",
+    preprocessor_path: Path = OUTPUT_DIR / "preprocessor.pkl",
+    chunksize: int = CHUNK_SIZE,
+    epochs: int = 5,
+    alpha: float = 1e-4,
+    class_weight: str = "none",  # "none" or "balanced" (weights from the streamed label counts)
+):
+    """
+    Out-of-core training: stream the raw feature CSV in chunks, fit the preprocessor with
+    partial_fit statistics, then train an SGDClassifier with log loss via partial_fit, visiting
+    the chunks and their rows in a new random order every epoch.
+    Peak memory is bounded by chunksize, independent of dataset size.
+    The outputs default to models/online/, so a run does not replace the deployed model.
+    """
+    logger.info("Fitting preprocessor with a streaming pass...")
+    preprocessor, class_counts = fit_streaming_preprocessor(features_path, labels_path, chunksize)
+    classes = class_counts.index.to_numpy()
+    logger.info(f"Label counts: {class_counts.to_dict()}")
+
+    weight_lookup = None
+    if class_weight == "balanced":
+        weight_lookup = (class_counts.sum() / (len(classes) * class_counts)).to_numpy()
+        logger.info(f"Balanced class weights: {dict(zip(classes, weight_lookup))}")
+
+    offsets = (chunk_offsets(features_path, chunksize), chunk_offsets(labels_path, chunksize))
+    if len(offsets[0]) != len(offsets[1]):
+        raise ValueError(f"{features_path} and {labels_path} have different row counts")
+    rng = np.random.default_rng(SEED)
+    model = SGDClassifier(loss="log_loss", alpha=alpha, random_state=SEED)
+    for epoch in range(epochs):
+        logger.info(f"Epoch {epoch + 1}/{epochs}")
+        chunks = iter_shuffled_chunks(features_path, labels_path, offsets, rng, chunksize)
+        for X_chunk, y_chunk in chunks:
+            X_transformed = preprocessor.transform(X_chunk)
+            weights = None
+            if weight_lookup is not None:
+                weights = weight_lookup[np.searchsorted(classes, y_chunk)]
+            model.partial_fit(X_transformed, y_chunk, classes=classes, sample_weight=weights)
+
+    preprocessor_path.parent.mkdir(parents=True, exist_ok=True)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Saving preprocessor to {preprocessor_path}")
+    joblib.dump(preprocessor, preprocessor_path)
+    logger.info(f"Saving model to {model_path}")
+    joblib.dump(make_pipeline(model), model_path)
+    logger.success("Out-of-core training complete.")
+
+
+if __name__ == "__main__":
+    app()
@@ -7,68 +7,79 @@ from sklearn.metrics import classification_report, f1_score
 import typer
 
 from affordable_housing.config import EXTERNAL_DATA_DIR, MODELS_DIR, PROCESSED_DATA_DIR
+from affordable_housing.dataset import round_id_from_path
+from affordable_housing.feature_store import FeatureStore, find_application_number_column
+from affordable_housing.modeling.applicants import prepare_round_features, read_round_file
+from affordable_housing.modeling.decision import decision_threshold as model_threshold
+from affordable_housing.modeling.explain import build_contribution_table
+from affordable_housing.modeling.explain import explain as explain_contributions
 
 app = typer.Typer()
 
 
-def transform_new_construction_set_aside(df_round2: pd.DataFrame) -> pd.DataFrame:
+def score_round(
+    raw_df: pd.DataFrame,
+    model,
+    preprocessor,
+    decision_threshold: float | None = None,
+    explain: bool = False,
+    feature_store: FeatureStore | None = None,
+    round_id: str | None = None,
+) -> pd.DataFrame:
     """
-    Transform Round 2 Homeless, ELI/VLI, and MIP columns into a single NEW CONSTRUCTION SET ASIDE column
-    to match Round 1 format.
+    Score a raw applicant list and return it with prediction columns appended.
 
     Args:
-        df_round2 (pd.DataFrame): Round 2 dataset with Homeless, ELI/VLI, and MIP columns.
-
+        raw_df (pd.DataFrame): Applicant list as read by read_round_file.
+        model: Model artifact (joblib or exported).
+        preprocessor: Fitted preprocessor matching the model.
+        decision_threshold (float, optional): Defaults to the threshold stored in the model,
+            or FALLBACK_THRESHOLD (0.44) if it stores none.
+        explain (bool): Add per-field log-odds CONTRIBUTION_* columns.
+        feature_store (FeatureStore, optional): Reuse stored transformed features for unchanged
+            applications of `round_id` instead of re-running the preprocessor on every row.
+        round_id (str, optional): Round partition of the feature store, e.g. "2025-R2".
     Returns:
-        pd.DataFrame: Transformed DataFrame with NEW CONSTRUCTION SET ASIDE column and original columns dropped.
+        pd.DataFrame: Raw data plus PREDICTED_AWARD ("Yes"/"No") and PREDICTION_PROBABILITY.
     """
-    logger.info("Transforming NEW CONSTRUCTION SET ASIDE for Round 2 data...")
-
-    # Copy the DataFrame to avoid modifying the original
-    df = df_round2.copy()
-
-    # Log unique values for debugging
-    for col in ["HOMELESS", "ELI/VLI", "MIP"]:
-        if col in df.columns:
-            logger.info(f"{col} values: {df[col].unique()}")
-        else:
-            logger.error(f"Column {col} not found in Round 2 dataset")
-            raise ValueError(f"Missing column {col}")
-
-    # Convert YES/NO to 1/0 if necessary
-    for col in ["HOMELESS", "ELI/VLI", "MIP"]:
-        if df[col].dtype == "object":
-            df[col] = df[col].replace({"Yes": 1, "No": 0}).fillna(0).astype(int)
-        elif df[col].isna().any():
-            logger.warning(f"Found missing values in {col}, imputing with 0")
-            df[col] = df[col].fillna(0).astype(int)
-
-    # Create NEW CONSTRUCTION SET ASIDE column
-    def map_set_aside(row):
-        if row["HOMELESS"] == 1 and row["ELI/VLI"] == 1:
-            return "Homeless, ELI/VLI"
-        elif row["ELI/VLI"] == 1:
-            return "ELI/VLI"
-        else:
-            return "none"  # MIP = 1 or all 0s map to 'none'
-
-    df["NEW CONSTRUCTION SET ASIDE"] = df.apply(map_set_aside, axis=1)
-
-    # Verify valid categories
-    valid_categories = ["none", "Homeless, ELI/VLI", "ELI/VLI"]
-    invalid_categories = df[~df["NEW CONSTRUCTION SET ASIDE"].isin(valid_categories)][
-        "NEW CONSTRUCTION SET ASIDE"
-    ].unique()
-    if len(invalid_categories) > 0:
-        logger.error(f"Invalid NEW CONSTRUCTION SET ASIDE values: {invalid_categories}")
-        raise ValueError("Invalid NEW CONSTRUCTION SET ASIDE values detected")
-
-    # Drop original columns
-    df = df.drop(columns=["HOMELESS", "ELI/VLI", "MIP"])
-    logger.info("Dropped Homeless, ELI/VLI, and MIP columns")
-
-    logger.info("NEW CONSTRUCTION SET ASIDE transformation complete")
-    return df
+    raw_df, X_values = prepare_round_features(raw_df)
+    if decision_threshold is None:
+        decision_threshold = model_threshold(model)
+    logger.info(f"Using decision threshold {decision_threshold:.3f}")
+
+    # Transform features
+    logger.info("Transforming features...")
+    if feature_store is not None:
+        key_column = find_application_number_column(raw_df)
+        if key_column is None:
+            raise ValueError("The feature store needs an application number column")
+        X_transformed = feature_store.transform(X_values, raw_df[key_column], round_id)
+    else:
+        X_transformed = preprocessor.transform(X_values)
+    logger.info("Feature transformation complete")
+
+    # Generate predictions
+    logger.info("Performing inference...")
+    y_pred_proba = model.predict_proba(X_transformed)[:, 1]
+    y_pred = (y_pred_proba >= decision_threshold).astype(int)
+    logger.info(f"First 20 predictions: {y_pred[:20]}")
+
+    # Create output DataFrame with raw data and predictions
+    logger.info("Merging raw data with predictions")
+    output_df = raw_df.copy()
+    output_df["PREDICTED_AWARD"] = y_pred
+    output_df["PREDICTION_PROBABILITY"] = y_pred_proba
+    if explain:
+        logger.info("Computing per-field log-odds contributions")
+        table = build_contribution_table(model, preprocessor)
+        contributions = explain_contributions(X_transformed, table)
+        for field in contributions.columns:
+            output_df[f"CONTRIBUTION_{field}"] = contributions[field].to_numpy()
+        output_df["CONTRIBUTION_INTERCEPT"] = table.intercept
+
+    # Map numeric predictions back to Yes/No for readability
+    output_df["PREDICTED_AWARD"] = output_df["PREDICTED_AWARD"].map({1: "Yes", 0: "No"})
+    return output_df
 
 
 @app.command()
@@ -77,7 +88,17 @@ def main(
     preprocessor_path: Path = MODELS_DIR / "preprocessor.pkl",
     model_path: Path = MODELS_DIR / "model.pkl",
     output_path: Path = PROCESSED_DATA_DIR / "predictions/2025-R2-predictions-with-raw.csv",
-    decision_threshold: float = 0.44,  # Lowered to reflect OBBBA's increased LIHTC
+    # Defaults to the threshold stored in the model artifact (see threshold.py), or 0.44 (lowered
+    # by hand to reflect OBBBA's increased LIHTC) if it stores none
+    decision_threshold: float | None = None,
+    explain: bool = False,  # add per-field log-odds contribution columns
+    use_feature_store: bool = False,  # transform only new or changed applications
+    # Feature store round, defaults to the round in the file name (e.g. 2025-R2)
+    round_id: str | None = None,
+    # Parse only the model input, set-aside, application number and award columns (resolved
+    # from the header), so the output carries only those; --no-project-columns keeps every
+    # input column
+    project_columns: bool = True,
 ):
     """
     Transform raw data using the preprocessor, generate predictions using the model,
@@ -88,99 +109,46 @@ def main(
     try:
         # Load raw data
         logger.info(f"Loading raw dataset from {input_path}")
-        raw_df = pd.read_excel(input_path, header=1, index_col=None)
+        raw_df = read_round_file(input_path, project_columns)
         logger.info(f"Loaded dataset with {len(raw_df)} rows and {len(raw_df.columns)} columns")
 
-        # Create new column "NEW CONSTRUCTION SET ASIDE"
-        logger.info("Creating new column to match round 1")
-        raw_df = transform_new_construction_set_aside(raw_df)
-
-        # modify the column "CONSTRUCTION TYPE"
-        raw_df["CONSTRUCTION TYPE"] = raw_df["CONSTRUCTION TYPE"].replace(
-            {"Acquisition/Rehabilitation": "Acq and Rehabilitation"}
-        )
-
-        # Extract features for transformation
-        logger.info("Extracting features for transformation")
-        numeric = [
-            "AVERAGE TARGETED AFFORDABILITY",
-            "CDLAC TOTAL POINTS",
-            "TIEBREAKER SELF SCORE",
-            "BOND REQUEST",
-            "HOMELESS %",
-        ]
-        cat = [
-            "CONSTRUCTION TYPE",
-            "HOUSING TYPE",
-            "CDLAC POOL",
-            "NEW CONSTRUCTION SET ASIDE",  # Newly created column
-            "CDLAC REGION",
-        ]
-        X_values = raw_df[numeric + cat]
-        logger.info("Feature extraction complete")
-
-        # rename column names to single word and lowercase
-        logger.info("rename columns")
-        rename_dict = {
-            "AVERAGE TARGETED AFFORDABILITY": "avg_targeted_affordability",
-            "CDLAC TOTAL POINTS": "CDLAC_total_points_score",
-            "TIEBREAKER SELF SCORE": "CDLAC_tie_breaker_self_score",
-            "BOND REQUEST": "bond_request_amount",
-            "HOMELESS %": "homeless_percent",
-            "CONSTRUCTION TYPE": "construction_type",
-            "HOUSING TYPE": "housing_type",
-            "CDLAC POOL": "CDLAC_pool_type",
-            "NEW CONSTRUCTION SET ASIDE": "new_construction_set_aside",
-            "CDLAC REGION": "CDLAC_region",
-        }
-        X_values = X_values.rename(columns=rename_dict)
-        print(X_values.columns)
-        logger.info("rename columns successful!")
-
         # Load preprocessor and model
         logger.info(f"Loading preprocessor from {preprocessor_path}")
         preprocessor = joblib.load(preprocessor_path)
         logger.info(f"Loading model from {model_path}")
         model = joblib.load(model_path)
 
-        # Transform features
-        logger.info("Transforming features...")
-        X_transformed = preprocessor.transform(X_values)
-        # X_transformed_df = pd.DataFrame(
-        #     X_transformed, columns=preprocessor.get_feature_names_out()
-        # )
-        logger.info("Feature transformation complete")
-
-        # Generate predictions
-        logger.info("Performing inference...")
-        y_pred_proba = model.predict_proba(X_transformed)[:, 1]
-        y_pred = (y_pred_proba >= decision_threshold).astype(int)
-        logger.info(f"First 20 predictions: {y_pred[:20]}")
+        feature_store = (
+            FeatureStore(preprocessor_path, preprocessor=preprocessor)
+            if use_feature_store
+            else None
+        )
+        output_df = score_round(
+            raw_df,
+            model,
+            preprocessor,
+            decision_threshold,
+            explain,
+            feature_store,
+            round_id or round_id_from_path(input_path),
+        )
 
         # Optionally compare to actual labels if available
         if "AWARD" in raw_df.columns:
             y_true = raw_df["AWARD"].map({"Yes": 1, "No": 0})
+            y_pred = output_df["PREDICTED_AWARD"].map({"Yes": 1, "No": 0})
             logger.info(f"First 20 actual values: {y_true[:20].values}")
             f1 = f1_score(y_true, y_pred)
             logger.info(f"F1 score: {f1:.3f}")
             logger.info("Classification report:\n" + classification_report(y_true, y_pred))
 
-        # Create output DataFrame with raw data and predictions
-        logger.info("Merging raw data with predictions")
-        output_df = raw_df.copy()
-        output_df["PREDICTED_AWARD"] = y_pred
-        output_df["PREDICTION_PROBABILITY"] = y_pred_proba
-
-        # Map numeric predictions back to Yes/No for readability
-        output_df["PREDICTED_AWARD"] = output_df["PREDICTED_AWARD"].map({1: "Yes", 0: "No"})
-
         # Save merged dataset
         logger.info(f"Saving merged dataset with predictions to {output_path}")
         output_df.to_csv(output_path, index=False)
         logger.success(f"Processing complete. Saved to {output_path}")
 
     except Exception as e:
-        logger.error(f"Error during processing: {str(e)}")
+        logger.error(f"Error during processing: {e!s}")
         raise
 
 
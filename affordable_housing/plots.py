@@ -1,28 +1,243 @@
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import inspect
+import json
+import os
 from pathlib import Path
+from typing import NamedTuple
 
 from loguru import logger
-from tqdm import tqdm
+import pandas as pd
 import typer
 
 from affordable_housing.config import FIGURES_DIR, PROCESSED_DATA_DIR
 
 app = typer.Typer()
 
+NUMERIC = [
+    "avg_targeted_affordability",
+    "total_points",
+    "tie_breaker_self_score",
+    "bond_request_amount",
+    "num_homeless_units",
+]
+CATEGORICAL = [
+    "construction_type",
+    "housing_type",
+    "CDLAC_region",
+    "combined_CDLAC_pool",
+    "combined_set_aside",
+]
+# Transformed columns written by features.py (X_train_transform.csv)
+TRANSFORMED_NUMERIC = [
+    "points_power__CDLAC_total_points_score",
+    "remainder__avg_targeted_affordability",
+    "remainder__CDLAC_tie_breaker_self_score",
+    "remainder__bond_request_amount",
+]
+CACHE_FILE = ".plots_cache.json"  # figure name -> hash of its inputs, next to the figures
+
+
+def title(column: str) -> str:
+    return column.replace("_", " ").title()
+
+
+def subplot_grid(plt, n: int, figsize: tuple, ncols: int = 3):
+    """Figure and flat axes for `n` subplots, extra axes removed."""
+    nrows = -(-n // ncols)
+    fig, axes = plt.subplots(nrows=nrows, ncols=ncols, figsize=figsize)
+    axes = axes.flatten()
+    for ax in axes[n:]:
+        fig.delaxes(ax)
+    return fig, axes[:n]
+
+
+def histograms(plt, sb, data: pd.DataFrame):
+    fig, axes = subplot_grid(plt, len(data.columns), (15, 8))
+    for ax, column in zip(axes, data.columns):
+        sb.histplot(data=data, x=column, ax=ax)
+        ax.set_xlabel(title(column))
+        ax.set_ylabel("Count")
+        ax.set_title(f"Histogram of {title(column)}")
+    return fig
+
+
+def award_boxplots(plt, sb, data: pd.DataFrame):
+    numeric = [column for column in data.columns if column != "award"]
+    fig, axes = subplot_grid(plt, len(numeric), (15, 8))
+    for ax, column in zip(axes, numeric):
+        sb.boxplot(data=data, x=column, hue="award", orient="h", ax=ax)
+        ax.set_xlabel(title(column))
+        ax.set_title(f"Box plot of {title(column)} by award")
+    return fig
+
+
+def correlation_heatmap(plt, sb, data: pd.DataFrame):
+    fig, ax = plt.subplots(figsize=(9, 7))
+    sb.heatmap(data.corr(), annot=True, fmt=".2f", ax=ax)
+    ax.set_title("Correlation of numeric features")
+    return fig
+
+
+def scatter_matrix(plt, sb, data: pd.DataFrame):
+    axes = pd.plotting.scatter_matrix(data, figsize=(12, 12))
+    return axes[0, 0].get_figure()
+
+
+def category_counts(plt, sb, data: pd.DataFrame):
+    fig, axes = subplot_grid(plt, len(data.columns), (20, 12))
+    for ax, column in zip(axes, data.columns):
+        sb.countplot(data=data, y=column, ax=ax)
+        ax.set_xlabel("Count")
+        ax.set_ylabel(title(column))
+        ax.set_title(f"Counts of {title(column)}")
+    return fig
+
+
+class FigureSpec(NamedTuple):
+    name: str  # file name under the figures directory
+    source: str  # "dataset" or "transformed"
+    columns: list[str]
+    draw: Callable  # (pyplot, seaborn, data) -> matplotlib Figure
+
+
+FIGURES = [
+    FigureSpec("3yr-numeric.png", "dataset", NUMERIC, histograms),
+    FigureSpec("3yr-numeric-boxplot.png", "dataset", NUMERIC + ["award"], award_boxplots),
+    FigureSpec("3yr-numeric-corr.png", "dataset", NUMERIC, correlation_heatmap),
+    FigureSpec("3yr-numeric-corr2.png", "dataset", NUMERIC, scatter_matrix),
+    FigureSpec("3yr-categorical-counts.png", "dataset", CATEGORICAL, category_counts),
+    FigureSpec("3yr-numeric-transformed.png", "transformed", TRANSFORMED_NUMERIC, histograms),
+]
+
+
+def read_columns(path: Path, columns: list[str]) -> pd.DataFrame:
+    """The needed columns of a processed .parquet or .csv file."""
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)[columns]
+
+
+def input_hash(spec: FigureSpec, data: pd.DataFrame) -> str:
+    """
+    Hash of a figure's input columns (names, dtypes and values) and of its drawing code, so a
+    figure is redrawn when either changes and only then.
+    """
+    digest = hashlib.sha256(inspect.getsource(spec.draw).encode())
+    digest.update(json.dumps([[c, str(t)] for c, t in data.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def start_render_process() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")  # non-interactive: render straight to files, no display needed
+
+
+def render(spec: FigureSpec, data: pd.DataFrame, output_path: Path) -> Path:
+    """Draw one figure and save it, in a worker process."""
+    import matplotlib.pyplot as plt
+    import seaborn as sb
+
+    fig = spec.draw(plt, sb, data)
+    fig.tight_layout()
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    fig.savefig(tmp_path, dpi=100, format=output_path.suffix.lstrip("."))
+    plt.close(fig)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def generate_figures(
+    sources: dict,
+    output_dir: Path = FIGURES_DIR,
+    n_jobs: int = -1,
+    force: bool = False,
+    figures: list[FigureSpec] | None = None,
+) -> dict:
+    """
+    Render the figures whose inputs changed since they were last drawn.
+
+    Args:
+        sources (dict): Source name ("dataset", "transformed") -> processed data file.
+        output_dir (Path): Figures directory, also holding the hash cache.
+        n_jobs (int): Render processes; -1 for one per core.
+        force (bool): Redraw every figure regardless of the cache.
+        figures (list, optional): Figures to consider, all of FIGURES by default.
+
+    Returns:
+        dict: Figure name -> "drawn", "cached" or "skipped" (source file missing).
+    """
+    try:
+        import matplotlib  # noqa: F401
+        import seaborn  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(
+            "matplotlib and seaborn are not installed: pip install -r requirements-jupyter.txt"
+        ) from e
+    figures = FIGURES if figures is None else figures
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = output_dir / CACHE_FILE
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+
+    # Each source is read once, with only the columns its figures use
+    needed = {}
+    for spec in figures:
+        columns = needed.setdefault(spec.source, [])
+        columns += [c for c in spec.columns if c not in columns]
+    tables = {}
+    for source, columns in needed.items():
+        path = sources.get(source)
+        if path is None or not Path(path).exists():
+            logger.warning(f"No {source} data at {path}, skipping its figures")
+            continue
+        tables[source] = read_columns(Path(path), columns)
+
+    status, stale = {}, []
+    for spec in figures:
+        if spec.source not in tables:
+            status[spec.name] = "skipped"
+            continue
+        data = tables[spec.source][spec.columns]
+        key = input_hash(spec, data)
+        if not force and cache.get(spec.name) == key and (output_dir / spec.name).exists():
+            status[spec.name] = "cached"
+        else:
+            stale.append((spec, data, key))
+
+    if stale:
+        max_workers = min(len(stale), (os.cpu_count() or 1) if n_jobs < 1 else n_jobs)
+        with ProcessPoolExecutor(max_workers, initializer=start_render_process) as pool:
+            futures = [
+                (spec, key, pool.submit(render, spec, data, output_dir / spec.name))
+                for spec, data, key in stale
+            ]
+            for spec, key, future in futures:
+                logger.info(f"Drew {future.result()}")
+                cache[spec.name] = key
+                status[spec.name] = "drawn"
+        cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    return status
+
 
 @app.command()
 def main(
-    # ---- REPLACE DEFAULT PATHS AS APPROPRIATE ----
-    input_path: Path = PROCESSED_DATA_DIR / "dataset.csv",
-    output_path: Path = FIGURES_DIR / "plot.png",
-    # -----------------------------------------
+    input_path: Path = PROCESSED_DATA_DIR / "3yr_dataset_train.csv",  # .csv or .parquet
+    transformed_path: Path = PROCESSED_DATA_DIR / "X_train_transform.csv",
+    output_dir: Path = FIGURES_DIR,
+    n_jobs: int = -1,
+    force: bool = False,  # redraw every figure, ignoring the cache
 ):
-    # ---- REPLACE THIS WITH YOUR OWN CODE ----
-    logger.info("Generating plot from data...")
-    for i in tqdm(range(10), total=10):
-        if i == 5:
-            logger.info("Something happened for iteration 5.")
-    logger.success("Plot generation complete.")
-    # -----------------------------------------
+    logger.info("Generating figures from processed data...")
+    status = generate_figures(
+        {"dataset": input_path, "transformed": transformed_path}, output_dir, n_jobs, force
+    )
+    for name, state in status.items():
+        logger.info(f"{name}: {state}")
+    drawn = sum(state == "drawn" for state in status.values())
+    logger.success(f"Figure generation complete: {drawn} of {len(status)} drawn in {output_dir}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,599 @@
+from collections.abc import Iterator
+from pathlib import Path
+import re
+import time
+
+from loguru import logger
+import numpy as np
+import pandas as pd
+from scipy import stats
+import typer
+
+from affordable_housing.config import DATA_DIR, PROCESSED_DATA_DIR
+from affordable_housing.dataset import standard_column_name
+
+app = typer.Typer()
+
+NUMERIC = [
+    "avg_targeted_affordability",
+    "total_points",
+    "tie_breaker_self_score",
+    "bond_request_amount",
+    "num_homeless_units",
+]
+INTEGER = ["total_points", "num_homeless_units"]
+# Sampled jointly from their observed combinations; the award links them to the numerics
+CATEGORICAL = [
+    "construction_type",
+    "housing_type",
+    "CDLAC_region",
+    "combined_CDLAC_pool",
+    "combined_set_aside",
+    "award",
+]
+
+CHUNK_ROWS = 200_000
+EXCEL_MAX_ROWS = 1_048_576 - 2  # sheet limit minus the title and header rows
+
+# Headers as published (typos included) for the rounds dataset.py reads
+PUBLISHED_POINTS = [
+    "PRESERVATION AND OTHER REHAB. PROJECT PRIORITIES (20 PTS)",
+    "NEW CONSTRUCTION DENSITY & LOCAL INCENTIVES (10 PTS)",
+    "EXCEEDING MINIMUM INCOME RESTRICTIONS (20 PTS)",
+    "EXCEEDING MINIMUM RENT RESTRICTIONS (10 PTS)",
+    "GP & MGMT. CO. EXPERIENCE (10 PTS)",
+    "HOUSING NEEDS (10 PTS)",
+    "LEVERAGED SOFT RESOURCES (8 PTS)",
+    "READINESS TO PROCEED (10 PTS)",
+    "AFFIRMATIVELY FURTHERING FAIR HOUSING (10 PTS)",
+    "SERVICE AMENITIES (10 PTS)",
+    "COST CONTAINMENT (12 PTS)",
+    "SITE AMENITIES (10 PTS)",
+]
+PUBLISHED_GP = [
+    f"GP {i} {part}"
+    for i in (1, 2, 3)
+    for part in ("COMPANY NAME", "CONTACT NAME", "PARENT COMPANY")
+]
+PROJECT_HEADERS = ["APPLICATION NUMBER", "PROJECT NAME", "CONSTRUCTION TYPE", "HOUSING TYPE"]
+UNIT_HEADERS = ["CITY", "COUNTY", "TOTAL UNITS", "LOW INCOME UNITS", "MARKET RATE UNITS"]
+HEADERS_2023 = (
+    PROJECT_HEADERS
+    + UNIT_HEADERS
+    + ["UNITS FOR HOMELESS INDIVIDUALS", "AVERAGE AFFORDABILTY (TARGETED AMI)"]
+    + ["TOTAL PROJECT COST", "CONSTRUCTION BOND TAX-EXEMPT FINANCING AMOUNT"]
+    + ["ANNUAL FEDERAL CREDIT REQUESTED", "TOTAL STATE CREDIT REQUESTED"]
+    + ["CDLAC NON-GEOGRAPHIC POOL ", "NEW CONSTRUCTION SET ASIDES"]
+    + ["SECONDARY NEW CONSTRUCTION SET ASIDE IF APPLICABLE"]
+    + ["TCAC GEOGRAPHIC REGION", "CDLAC GEOGRAPHIC REGION", "CDLAC TOTAL POINTS SCORE"]
+    + PUBLISHED_POINTS
+    + ["CDLAC TIE-BREAKER SELF SCORE", "CDLAC APPLICANT", "TCAC APPILCANT"]
+    + PUBLISHED_GP
+)
+HEADERS_2024 = [
+    {
+        "NEW CONSTRUCTION SET ASIDES": "NEW CONSTRUCTION SET ASIDE",
+        "CDLAC NON-GEOGRAPHIC POOL ": "CDLAC NON-GEPGRAPHIC POOL",
+        "TCAC GEOGRAPHIC REGION": "CTCAC GEOGRAPHIC REGION",
+        "TCAC APPILCANT": "CTCAC APPLICANT",
+    }.get(header, header)
+    for header in HEADERS_2023
+]
+HEADERS_2024_R2 = [
+    "Application Number", "Project Name", "Construction Type", "Housing Type", "City", "County",
+    "Total Units", "Low Income Units", "Market Rate Units", "Units for Homeless", "Homeless %",
+    "Average Targeted Affordability", "Total Project Cost", "Bond Request",
+    "Annual Federal Credit Request", "State Credit Request", "State Credit Type", "CDLAC Pool",
+    "BIPOC Pool Requested", "New Construction Set Asides", "CTCAC Region", "CDLAC Region",
+    "Tie-Breaker Self Score", "CDLAC Total Points", "Points, Preservation and Other Rehab",
+    "Points, New Con Density", "Points, Exceeding Min Income", "Points, Exceeding Min Rent",
+    "Points, Experience", "Points, Housing Need", "Points, Leveraged Soft Resources",
+    "Points, Readiness", "Points, AFFH", "Points, Service Amenities", "Points, Cost Containment",
+    "Points, Site Amenities", "CDLAC Applicant", "CTCAC Applicant", "GP 1 Company",
+    "GP 1 Contact", "GP 1 Parent Org", "GP 2 Company", "GP 2 Contact", "GP 2 Parent Org",
+    "GP 3 Company", "GP 3 Contact", "GP 3 Parent Org",
+]  # fmt: skip
+HEADERS_2025 = (
+    PROJECT_HEADERS
+    + UNIT_HEADERS
+    + ["UNITS FOR HOMELESS", "HOMELESS %", "AVERAGE TARGETED AFFORDABILITY"]
+    + ["TOTAL PROJECT COSTS", "BOND REQUEST", "ANNUAL FEDERAL CREDIT REQUEST"]
+    + ["STATE CREDIT REQUEST", "CDLAC POOL", "NEW CONSTRUCTION SET ASIDE", "BIPOC PRE-QUALIFIED"]
+    + ["CTCAC REGION", "CDLAC REGION", "CDLAC TOTAL POINTS SCORE"]
+    + PUBLISHED_POINTS
+    + ["CDLAC TIE-BREAKER SELF SCORE", "CDLAC APPLICANT", "CTCAC APPLICANT"]
+    + [f"GP{i} {part}" for i in (1, 2, 3) for part in ("COMPANY", "CONTACT", "PARENT COMPANY")]
+)
+# Scoring input (transform_predict.py / the API): set-aside flags instead of a set-aside column
+HEADERS_SCORING = (
+    PROJECT_HEADERS
+    + UNIT_HEADERS
+    + ["HOMELESS %", "AVERAGE TARGETED AFFORDABILITY", "BOND REQUEST", "CDLAC POOL"]
+    + ["HOMELESS", "ELI/VLI", "MIP", "CDLAC REGION", "CDLAC TOTAL POINTS", "TIEBREAKER SELF SCORE"]
+)
+# features.py input: the merged 2025 R1 applicant and award lists
+HEADERS_MERGED = [
+    "APPLICATION NUMBER",
+    "AVERAGE TARGETED AFFORDABILITY",
+    "CDLAC TOTAL POINTS SCORE",
+    "CDLAC TIE-BREAKER SELF SCORE",
+    "BOND REQUEST",
+    "HOMELESS %",
+    "CONSTRUCTION TYPE",
+    "HOUSING TYPE",
+    "CDLAC POOL",
+    "NEW CONSTRUCTION SET ASIDE",
+    "CDLAC REGION",
+    "AWARD",
+    "ROUND",
+]
+LAYOUTS = {
+    "2023-R1": HEADERS_2023,
+    "2023-R2": HEADERS_2023,
+    "2023-R3": HEADERS_2023,
+    "2024-R1": HEADERS_2024,
+    "2024-R2": HEADERS_2024_R2,
+    "2025-R1": HEADERS_2025,
+    "2025-R2": HEADERS_SCORING,
+}
+SCORING_ROUNDS = {"2025-R2"}
+TRAINING_ROUNDS = ["2023-R1", "2023-R2", "2023-R3", "2024-R1", "2024-R2", "2025-R1"]
+# Award lists dataset.py reads: (file stem, header of the application number, sheet index)
+AWARD_FILES = {
+    "2023": ("2023-Financing-data", "CTCAC #", 1),
+    "2024": ("2024-Financing-data", "CTCAC #", 1),
+    "2025-R1": ("2025-R1-AwardList", "APPLICATION NUMBER", 0),
+}
+AWARD_HEADERS = ["Project Name", "City", "County", "Construction Type", "Total Units"]
+
+# Published spellings of the cleaned values in 3yr_dataset.csv
+RAW_REGIONS = {
+    "BAY AREA": "Bay Area (Alameda, Contra Costa, Marin, San Francisco, San Mateo, Santa Clara, "
+    "and Santa Cruz Counties)",
+    "COASTAL": "Coastal (Monterey, Napa, Orange, San Benito, San Diego, San Luis Obispo, "
+    "Santa Barbara, Sonoma, and Ventura Counties) ",
+    "NORTHERN": "Northern (Butte, El Dorado, Placer, Sacramento, San Joaquin, Shasta, Solano, "
+    "Sutter, Yuba, and Yolo Counties)",
+    "INLAND": "Inland (Fresno, Imperial, Kern, Kings, Madera, Merced, Riverside, San Bernardino, "
+    "Stanislaus, and Tulare Counties)",
+    "CITY OF LA": "City of Los Angeles",
+    "BALANCE OF LA COUNTY": "Balance of Los Angeles County",
+    "NONE": None,
+}
+RAW_CONSTRUCTION_TYPES = {"ACQ AND REHAB": "Acquisition/Rehabilitation"}
+
+
+class RoundDistribution:
+    """
+    Distribution of applications learned from 3yr_dataset.csv.
+
+    The categorical fields and the award are sampled as one tuple from their observed
+    combinations. The numeric fields follow a Gaussian copula per award outcome: the observed
+    values are the marginals (interpolated empirical quantiles), and the correlation of their
+    normal scores carries the dependence between them.
+    """
+
+    def __init__(self, dataset: pd.DataFrame):
+        self.combinations = dataset[CATEGORICAL].value_counts(normalize=True)
+        self.groups = {}
+        for award, rows in dataset.groupby("award"):
+            values = rows[NUMERIC].to_numpy(dtype=np.float64)
+            # Normal scores of the ranks; the correlation is the copula's parameter
+            normal_scores = stats.norm.ppf(stats.rankdata(values, axis=0) / (len(values) + 1))
+            correlation = np.corrcoef(normal_scores, rowvar=False)
+            correlation = np.nan_to_num(correlation) + np.eye(len(NUMERIC)) * 1e-9
+            np.fill_diagonal(correlation, 1.0)
+            self.groups[award] = (np.sort(values, axis=0), correlation)
+        # BIPOC applications also name the pool they would otherwise compete in
+        pools = dataset["combined_CDLAC_pool"]
+        self.non_bipoc_pools = pools[~pools.str.contains("BIPOC")].value_counts(normalize=True)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "RoundDistribution":
+        return cls(pd.read_csv(path).dropna(subset=NUMERIC + CATEGORICAL))
+
+    def sample(self, n_rows: int, rng: np.random.Generator) -> pd.DataFrame:
+        """`n_rows` applications in the 3yr_dataset.csv schema (without application numbers)."""
+        picks = rng.choice(len(self.combinations), n_rows, p=self.combinations.to_numpy())
+        df = pd.DataFrame(
+            self.combinations.index.to_frame(index=False).to_numpy()[picks], columns=CATEGORICAL
+        )
+        for column in NUMERIC:
+            df[column] = 0.0
+        for award, (sorted_values, correlation) in self.groups.items():
+            rows = np.flatnonzero(df["award"].to_numpy() == award)
+            z = rng.multivariate_normal(np.zeros(len(NUMERIC)), correlation, len(rows))
+            positions = stats.norm.cdf(z) * (len(sorted_values) - 1)
+            grid = np.arange(len(sorted_values))
+            for j, column in enumerate(NUMERIC):
+                df.loc[rows, column] = np.interp(positions[:, j], grid, sorted_values[:, j])
+        df[INTEGER] = df[INTEGER].round()
+        return df
+
+
+def set_aside_parts(combined: pd.Series) -> tuple:
+    """Split "HOMELESS, ELI/VLI" into the primary and secondary set-aside columns."""
+    parts = combined.where(combined != "NONE").str.split(", ", n=1, expand=True)
+    parts = parts.reindex(columns=[0, 1])
+    return parts[0], parts[1]
+
+
+def model_set_aside(combined: pd.Series) -> pd.Series:
+    """The set-aside categories the model was trained on (see map_set_aside)."""
+    homeless = combined.str.contains("HOMELESS")
+    eli = combined.str.contains("ELI/VLI")
+    return pd.Series(
+        np.where(homeless & eli, "Homeless, ELI/VLI", np.where(eli, "ELI/VLI", "none")),
+        index=combined.index,
+    )
+
+
+def filler(header: str, n_rows: int, rng: np.random.Generator):
+    """Plausible values for a column the pipeline does not read, so sheets have their width."""
+    if re.search(r"PTS|Points", header, re.IGNORECASE):
+        return rng.integers(0, 21, n_rows)
+    if re.search(r"UNITS", header, re.IGNORECASE):
+        return rng.integers(20, 300, n_rows)
+    if re.search(r"COST|CREDIT|AMOUNT|FINANCING", header, re.IGNORECASE):
+        return rng.normal(5e7, 2e7, n_rows).round(2)
+    names = np.array([f"{header.strip().title()} {i}" for i in range(50)])
+    return names[rng.integers(0, len(names), n_rows)]
+
+
+def to_layout(
+    sample: pd.DataFrame,
+    headers: list[str],
+    round_id: str,
+    first: int,
+    rng: np.random.Generator,
+    model_vocabulary: bool = False,
+) -> pd.DataFrame:
+    """
+    Render sampled applications with one round's published headers and value spellings.
+    Args:
+        sample (pd.DataFrame): Output of RoundDistribution.sample.
+        headers (list): Layout of the round (see LAYOUTS).
+        round_id (str): e.g. "2024-R2"; the year goes into the application numbers.
+        first (int): Sequence number of the first application.
+        model_vocabulary (bool): Scoring and features.py inputs: BIPOC applications are listed
+            under the pool they would otherwise compete in, as the model has no BIPOC pool.
+    """
+    n_rows = len(sample)
+    yy = round_id[2:4]
+    numbers = [f"CA-{yy}-{first + i:03d}" for i in range(n_rows)]
+    has_secondary = any(
+        standard_column_name(h) == "secondary_new_construction_set_aside" for h in headers
+    )
+    has_bipoc = any(standard_column_name(h) == "bipoc_binary" for h in headers)
+    bipoc = sample["combined_CDLAC_pool"].str.contains("BIPOC")
+    pool = sample["combined_CDLAC_pool"]
+    if has_bipoc or model_vocabulary:
+        substitutes = rng.choice(
+            sample.attrs["non_bipoc_pools"].index,
+            n_rows,
+            p=sample.attrs["non_bipoc_pools"].to_numpy(),
+        )
+        pool = pool.where(~bipoc, substitutes)
+    primary, secondary = set_aside_parts(sample["combined_set_aside"])
+    total_units = sample["num_homeless_units"] + rng.integers(20, 200, n_rows)
+    construction_type = sample["construction_type"].map(
+        lambda value: RAW_CONSTRUCTION_TYPES.get(value, value.title())
+    )
+    values = {
+        "application_number": numbers,
+        "avg_targeted_affordability": sample["avg_targeted_affordability"],
+        "total_points": sample["total_points"],
+        "tie_breaker_self_score": sample["tie_breaker_self_score"],
+        "bond_request_amount": sample["bond_request_amount"].round(2),
+        "num_homeless_units": sample["num_homeless_units"],
+        "construction_type": construction_type,
+        "housing_type": sample["housing_type"],
+        "CDLAC_region": sample["CDLAC_region"].map(RAW_REGIONS),
+        "CDLAC_pool": pool.str.title(),
+        "bipoc_binary": np.where(bipoc, "Yes", "No"),
+        "new_construction_set_aside": primary
+        if has_secondary
+        else primary.str.cat(secondary, sep=", ", na_rep="").str.strip(", ").replace("", None),
+        "secondary_new_construction_set_aside": secondary,
+    }
+    special = {
+        "HOMELESS %": (sample["num_homeless_units"] / total_units * 100).round(1),
+        "TOTAL UNITS": total_units,
+        "HOMELESS": np.where(sample["combined_set_aside"].str.contains("HOMELESS"), "Yes", "No"),
+        "ELI/VLI": np.where(sample["combined_set_aside"].str.contains("ELI/VLI"), "Yes", "No"),
+        "MIP": np.where(sample["combined_set_aside"].str.contains("MIP"), "Yes", "No"),
+        "TIEBREAKER SELF SCORE": sample["tie_breaker_self_score"],
+        "AWARD": sample["award"],
+        "ROUND": np.full(n_rows, round_id),
+    }
+    columns = {}
+    for header in headers:
+        if header.upper() in special:
+            columns[header] = special[header.upper()]
+        elif standard_column_name(header) in values:
+            columns[header] = values[standard_column_name(header)]
+        else:
+            columns[header] = filler(header, n_rows, rng)
+    return pd.DataFrame({header: np.asarray(value) for header, value in columns.items()})
+
+
+def award_rows(applicants: pd.DataFrame, header: str, rng) -> pd.DataFrame:
+    """Award list rows for the awarded applications of a generated round."""
+    number_column = next(
+        h for h in applicants.columns if re.search("application", h, re.IGNORECASE)
+    )
+    awarded = applicants.loc[applicants.attrs["awarded"], number_column]
+    rows = {header: awarded.to_numpy()}
+    for extra in AWARD_HEADERS:
+        rows[extra] = filler(extra, len(awarded), rng)
+    return pd.DataFrame(rows)
+
+
+class TableWriter:
+    """
+    Append DataFrame chunks to a .csv, .parquet or .xlsx file without holding the whole table.
+    Workbooks are streamed with openpyxl's write-only mode, with an optional title row above
+    the header (as CDLAC publishes applicant lists) and empty sheets before the data sheet.
+    """
+
+    def __init__(self, path: Path, title: str | None = None, sheet_index: int = 0):
+        self.path = Path(path)
+        self.title = title
+        self.sheet_index = sheet_index
+        self.rows = 0
+        self.writer = None
+
+    def append(self, chunk: pd.DataFrame) -> None:
+        suffix = self.path.suffix
+        if suffix == ".csv":
+            chunk.to_csv(
+                self.path, mode="a" if self.rows else "w", header=not self.rows, index=False
+            )
+        elif suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self.writer is None:
+                # A column that is empty in the first chunk is typed as text, not null
+                schema = pa.schema(
+                    [
+                        field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                        for field in table.schema
+                    ]
+                )
+                self.writer = pq.ParquetWriter(self.path, schema)
+            self.writer.write_table(table.cast(self.writer.schema))
+        elif suffix == ".xlsx":
+            if self.rows + len(chunk) > EXCEL_MAX_ROWS:
+                raise ValueError(
+                    f"{self.path.name}: more than {EXCEL_MAX_ROWS} rows do not fit in a "
+                    "worksheet, use csv or parquet"
+                )
+            if self.writer is None:
+                from openpyxl import Workbook
+
+                self.writer = Workbook(write_only=True)
+                for i in range(self.sheet_index):
+                    self.writer.create_sheet(f"Notes {i + 1}")
+                self.sheet = self.writer.create_sheet("Data")
+                if self.title:
+                    self.sheet.append([self.title])
+                self.sheet.append(list(chunk.columns))
+            for row in chunk.itertuples(index=False):
+                self.sheet.append([None if pd.isna(value) else value for value in row])
+        else:
+            raise ValueError(f"Unsupported output type: {suffix}")
+        self.rows += len(chunk)
+
+    def close(self) -> None:
+        if self.path.suffix == ".parquet" and self.writer is not None:
+            self.writer.close()
+        elif self.path.suffix == ".xlsx" and self.writer is not None:
+            self.writer.save(self.path)
+
+
+def iter_round(
+    distribution: RoundDistribution,
+    round_id: str,
+    n_rows: int,
+    rng: np.random.Generator,
+    first_number: int = 400,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Generated applicant rows of one round in the round's layout, `chunk_rows` at a time.
+    Application numbers run from CA-<yy>-<first_number>.
+    """
+    headers = LAYOUTS[round_id]
+    for first in range(0, n_rows, chunk_rows):
+        sample = distribution.sample(min(chunk_rows, n_rows - first), rng)
+        sample.attrs["non_bipoc_pools"] = distribution.non_bipoc_pools
+        scoring = round_id in SCORING_ROUNDS
+        chunk = to_layout(sample, headers, round_id, first_number + first, rng, scoring)
+        chunk.attrs["awarded"] = (sample["award"] == "Yes").to_numpy()
+        yield chunk
+
+
+def generate(
+    distribution: RoundDistribution,
+    output_dir: Path,
+    rows_per_round: int,
+    file_format: str = "xlsx",
+    rounds: list[str] | None = None,
+    seed: int = 0,
+    chunk_rows: int = CHUNK_ROWS,
+) -> dict[str, Path]:
+    """
+    Write applicant lists for `rounds` and the award lists that dataset.py reads, named like
+    the published files (2023-R1-ApplicantList.xlsx, 2023-Financing-data.xlsx, ...).
+    Returns:
+        dict: File stem -> written path.
+    """
+    rng = np.random.default_rng(seed)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rounds = rounds or list(LAYOUTS)
+    written = {}
+    award_writers = {}
+    next_number = {}  # application numbers are unique within a year, across its rounds
+    for round_id in rounds:
+        stem = f"{round_id}-ApplicantList"
+        path = output_dir / f"{stem}.{file_format}"
+        writer = TableWriter(path, title=f"{round_id} Applicant List")
+        award_key = round_id[:4] if round_id[:4] in AWARD_FILES else round_id
+        award = AWARD_FILES.get(award_key)
+        if award is not None and award_key not in award_writers:
+            award_stem, _, sheet_index = award
+            award_path = output_dir / f"{award_stem}.{file_format}"
+            award_writers[award_key] = TableWriter(award_path, sheet_index=sheet_index)
+            written[award_stem] = award_path
+        first_number = next_number.get(round_id[:4], 400)
+        next_number[round_id[:4]] = first_number + rows_per_round
+        for chunk in iter_round(
+            distribution, round_id, rows_per_round, rng, first_number, chunk_rows
+        ):
+            writer.append(chunk)
+            if award is not None:
+                award_writers[award_key].append(award_rows(chunk, award[1], rng))
+        writer.close()
+        written[stem] = path
+        logger.info(f"Wrote {writer.rows} applications to {path}")
+    for award_writer in award_writers.values():
+        award_writer.close()
+    return written
+
+
+def generate_merged(
+    distribution: RoundDistribution, path: Path, n_rows: int, seed: int = 0
+) -> Path:
+    """features.py input (merged_dataset.csv layout) with an AWARD column."""
+    rng = np.random.default_rng(seed)
+    writer = TableWriter(path)
+    for first in range(0, n_rows, CHUNK_ROWS):
+        sample = distribution.sample(min(CHUNK_ROWS, n_rows - first), rng)
+        sample.attrs["non_bipoc_pools"] = distribution.non_bipoc_pools
+        chunk = to_layout(sample, HEADERS_MERGED, "2025-R1", 400 + first, rng, True)
+        chunk["NEW CONSTRUCTION SET ASIDE"] = model_set_aside(sample["combined_set_aside"])
+        writer.append(chunk)
+    writer.close()
+    return path
+
+
+@app.command("generate")
+def generate_command(
+    source_path: Path = PROCESSED_DATA_DIR / "3yr_dataset.csv",
+    output_dir: Path = DATA_DIR / "synthetic",
+    rows: int = 10_000,  # applications per round
+    file_format: str = "xlsx",  # xlsx, csv or parquet
+    rounds: str | None = None,  # comma separated, e.g. "2024-R2,2025-R2"; default all
+    merged: bool = True,  # also write merged_dataset.csv for features.py
+    seed: int = 0,
+):
+    """Generate synthetic applicant and award lists learned from 3yr_dataset.csv."""
+    if file_format not in ("xlsx", "csv", "parquet"):
+        raise typer.BadParameter("file_format must be xlsx, csv or parquet")
+    round_ids = rounds.split(",") if rounds else list(LAYOUTS)
+    unknown = set(round_ids) - set(LAYOUTS)
+    if unknown:
+        raise typer.BadParameter(f"Unknown rounds {sorted(unknown)}, expected {list(LAYOUTS)}")
+
+    distribution = RoundDistribution.from_csv(source_path)
+    start = time.perf_counter()
+    generate(distribution, output_dir, rows, file_format, round_ids, seed)
+    if merged:
+        path = generate_merged(distribution, output_dir / "merged_dataset.csv", rows, seed)
+        logger.info(f"Wrote {rows} merged rows to {path}")
+    logger.success(f"Generated data in {output_dir} in {time.perf_counter() - start:.1f}s")
+
+
+@app.command()
+def benchmark(
+    source_path: Path = PROCESSED_DATA_DIR / "3yr_dataset.csv",
+    output_dir: Path = DATA_DIR / "synthetic" / "benchmark",
+    rows: str = "10000",  # comma separated applications per round, e.g. "10000,100000"
+    file_format: str = "xlsx",  # applicant list format; dataset.py only reads xlsx
+    seed: int = 0,
+):
+    """
+    Time dataset.py, features.py and the scorers on generated rounds of increasing size.
+    """
+    # Imported here: the pipeline steps load sklearn, the model and the API stack
+    import joblib
+
+    from affordable_housing import dataset, features
+    from affordable_housing.config import MODELS_DIR
+    from affordable_housing.modeling.applicants import prepare_round_features, read_round_file
+    from affordable_housing.modeling.artifact import ExportedModel, ExportedPreprocessor
+    from affordable_housing.modeling.columnar import ColumnarScorer, score_dataframe
+    from affordable_housing.modeling.export import to_artifact
+    from affordable_housing.modeling.transform_predict import score_round
+
+    distribution = RoundDistribution.from_csv(source_path)
+    model = joblib.load(MODELS_DIR / "model.pkl")
+    preprocessor = joblib.load(MODELS_DIR / "preprocessor.pkl")
+    manifest, arrays = to_artifact(model, preprocessor)
+    scorer = ColumnarScorer(
+        ExportedModel(manifest, arrays), ExportedPreprocessor(manifest, arrays)
+    )
+
+    results = []
+    for n_rows in (int(value) for value in rows.split(",")):
+        run_dir = output_dir / str(n_rows)
+        processed_dir = run_dir / "processed"
+        processed_dir.mkdir(parents=True, exist_ok=True)
+        timings = {"rows_per_round": n_rows}
+
+        start = time.perf_counter()
+        generate(distribution, run_dir, n_rows, file_format, list(LAYOUTS), seed)
+        generate_merged(distribution, run_dir / "merged_dataset.csv", n_rows, seed)
+        timings["generate"] = time.perf_counter() - start
+
+        if file_format == "xlsx":
+            paths = {
+                f"input_path_{r.lower()[5:]}_{r[:4]}_applicant": run_dir
+                / f"{r}-ApplicantList.xlsx"
+                for r in TRAINING_ROUNDS
+            }
+            start = time.perf_counter()
+            dataset.main(
+                **paths,
+                input_path_labels_2023=run_dir / "2023-Financing-data.xlsx",
+                input_path_labels_2024=run_dir / "2024-Financing-data.xlsx",
+                input_path_labels_r1_2025=run_dir / "2025-R1-AwardList.xlsx",
+                output_path=processed_dir / "3yr_dataset.csv",
+                output_path_train=processed_dir / "3yr_dataset_train.csv",
+                output_path_test=processed_dir / "3yr_dataset_test.csv",
+            )
+            timings["dataset"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        features.main(
+            input_path=run_dir / "merged_dataset.csv",
+            output_path=processed_dir,
+            model_path=processed_dir / "preprocessor.pkl",
+            sparse=False,
+            use_feature_store=False,
+            # keep the deployed drift reference and similarity index out of the benchmark
+            similar_index_path=processed_dir / "similar_index.pkl",
+            drift_reference_path=processed_dir / "drift_reference.json",
+        )
+        timings["features"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        raw_df = read_round_file(run_dir / f"2025-R2-ApplicantList.{file_format}")
+        timings["read_round"] = time.perf_counter() - start
+        start = time.perf_counter()
+        score_round(raw_df.copy(), model, preprocessor)
+        timings["score_round"] = time.perf_counter() - start
+        _, X_values = prepare_round_features(raw_df)
+        start = time.perf_counter()
+        score_dataframe(X_values, scorer)
+        timings["columnar_score"] = time.perf_counter() - start
+        results.append(timings)
+
+    table = pd.DataFrame(results).set_index("rows_per_round")
+    logger.info("Seconds per step:\n" + table.round(2).to_string())
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,356 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import subprocess
+import time
+
+from loguru import logger
+import numpy as np
+import pandas as pd
+import typer
+
+from affordable_housing.config import EXPERIMENT_DB, MODELS_DIR, PROJ_ROOT
+
+app = typer.Typer()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    experiment TEXT NOT NULL,
+    name TEXT,
+    model_type TEXT,
+    dataset TEXT,
+    data_hash TEXT,
+    git_commit TEXT,
+    params TEXT,  -- JSON: the selected hyperparameters
+    started_at TEXT NOT NULL,
+    seconds REAL,
+    best_score REAL
+);
+CREATE TABLE IF NOT EXISTS trials (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    trial INTEGER NOT NULL,
+    model_type TEXT,
+    params TEXT NOT NULL,  -- JSON
+    mean_score REAL,
+    std_score REAL,
+    fold_scores TEXT,  -- JSON list, one score per CV fold
+    fit_seconds REAL,
+    PRIMARY KEY (run_id, trial)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    key TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS runs_dataset_model ON runs (dataset, model_type);
+CREATE INDEX IF NOT EXISTS trials_model_score ON trials (model_type, mean_score);
+"""
+
+# Best trial per model type and dataset; SQLite returns the other columns of the MAX row
+BEST_TRIALS_QUERY = """
+SELECT trials.model_type, runs.dataset, MAX(trials.mean_score) AS best_score,
+       trials.params, trials.run_id, runs.data_hash, runs.git_commit, runs.started_at
+FROM trials JOIN runs ON runs.id = trials.run_id
+WHERE (:experiment IS NULL OR runs.experiment = :experiment)
+GROUP BY trials.model_type, runs.dataset
+ORDER BY runs.dataset, best_score DESC
+"""
+
+
+def file_hash(*paths: Path) -> str:
+    """Short content hash of the data files a run was trained on."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def git_commit(cwd: Path = PROJ_ROOT) -> str | None:
+    """Commit of the working tree, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def to_json(value) -> str:
+    # numpy scalars and arrays show up in sklearn params and scores
+    def default(obj):
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        return str(obj)
+
+    return json.dumps(value, default=default, sort_keys=True)
+
+
+class Run:
+    """
+    One tracked run. Trials, metrics and artifacts are buffered in memory and written in a
+    single transaction when the run ends, so logging costs nothing during the search itself.
+    """
+
+    def __init__(self, tracker: "Tracker", run_id: int):
+        self.tracker = tracker
+        self.id = run_id
+        self.trials: list[tuple] = []
+        self.metrics: dict[str, float] = {}
+        self.artifacts: dict[str, str] = {}
+        self.best_score: float | None = None
+        self.params: dict | None = None
+
+    def log_trials(self, trials: pd.DataFrame, model_type: str) -> None:
+        """Buffer search candidates, as in SearchResult.trials (params, scores, fit seconds)."""
+        start = len(self.trials)
+        for i, row in enumerate(trials.itertuples(index=False), start):
+            self.trials.append(
+                (
+                    self.id,
+                    i,
+                    model_type,
+                    to_json(row.params),
+                    float(row.mean_score),
+                    float(row.std_score),
+                    to_json(row.fold_scores),
+                    float(row.fit_seconds),
+                )
+            )
+
+    def log_metric(self, key: str, value: float) -> None:
+        self.metrics[key] = float(value)
+
+    def log_artifact(self, name: str, path: Path) -> None:
+        self.artifacts[name] = str(Path(path).resolve())
+
+    def log_best(self, params: dict, score: float) -> None:
+        self.params, self.best_score = params, float(score)
+
+    def flush(self, seconds: float) -> None:
+        with self.tracker.transaction() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self.trials
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?)",
+                [(self.id, key, value) for key, value in self.metrics.items()],
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?)",
+                [(self.id, name, path) for name, path in self.artifacts.items()],
+            )
+            connection.execute(
+                "UPDATE runs SET seconds = ?, best_score = ?, params = ? WHERE id = ?",
+                (seconds, self.best_score, to_json(self.params), self.id),
+            )
+
+
+class Tracker:
+    """Experiment runs, search trials, metrics and artifact paths in an indexed SQLite file."""
+
+    def __init__(self, db_path: Path = EXPERIMENT_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.transaction() as connection:
+            connection.executescript(SCHEMA)
+
+    def connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self.connect()
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        connection = self.connect()
+        try:
+            return pd.read_sql_query(sql, connection, params=params)
+        finally:
+            connection.close()
+
+    @contextmanager
+    def start_run(
+        self,
+        experiment: str,
+        name: str | None = None,
+        model_type: str | None = None,
+        dataset: str | None = None,
+        data_paths=(),
+    ) -> Iterator[Run]:
+        """
+        Register a run and yield it; its buffered records are written when the block exits,
+        also when it raises, so failed searches keep their trials.
+        Args:
+            experiment (str): Experiment name, e.g. "AffordableHousing".
+            name (str, optional): Run name, e.g. "2025R1Train".
+            model_type (str, optional): Estimator class of the run.
+            dataset (str, optional): Dataset label used to group results.
+            data_paths: Training data files, hashed to tell dataset versions apart.
+        """
+        values = (
+            experiment,
+            name,
+            model_type,
+            dataset,
+            file_hash(*data_paths) if data_paths else None,
+            git_commit(),
+            datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (experiment, name, model_type, dataset, data_hash, git_commit,"
+                " started_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                values,
+            )
+        run = Run(self, cursor.lastrowid)
+        start = time.perf_counter()
+        try:
+            yield run
+        finally:
+            run.flush(time.perf_counter() - start)
+            logger.info(f"Tracked run {run.id}: {len(run.trials)} trials in {self.db_path}")
+
+    def best_per_model(self, experiment: str | None = None) -> pd.DataFrame:
+        """Best mean CV score per model type per dataset."""
+        return self.query(BEST_TRIALS_QUERY, {"experiment": experiment})
+
+    def runs(self, experiment: str | None = None) -> pd.DataFrame:
+        return self.query(
+            "SELECT * FROM runs WHERE (:experiment IS NULL OR experiment = :experiment)"
+            " ORDER BY id",
+            {"experiment": experiment},
+        )
+
+    def trials(self, run_id: int) -> pd.DataFrame:
+        return self.query("SELECT * FROM trials WHERE run_id = ? ORDER BY trial", (run_id,))
+
+    def import_record(self, record: dict, experiment: str = "AffordableHousing") -> int:
+        """Add a hand-written record in the models/experiment_results.json format."""
+        metrics = {
+            key: value
+            for key, value in record.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (experiment, name, model_type, dataset, git_commit, params,"
+                " started_at, best_score) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    experiment,
+                    record.get("experiment_id"),
+                    record.get("model"),
+                    record.get("train_data"),
+                    record.get("git_commit"),
+                    to_json(record.get("parameters")),
+                    record.get("date", ""),
+                    None,
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO metrics VALUES (?, ?, ?)",
+                [(cursor.lastrowid, key, value) for key, value in metrics.items()],
+            )
+        return cursor.lastrowid
+
+
+def export_to_mlflow(tracker: Tracker, run_id: int, experiment: str | None = None) -> str:
+    """
+    Copy a tracked run to mlflow (optional dependency): the run's params, metrics and artifact
+    files, with the trials logged as a table. Returns the mlflow run id.
+    """
+    try:
+        import mlflow
+    except ImportError as e:
+        raise RuntimeError("mlflow is not installed: pip install mlflow") from e
+
+    run = tracker.query("SELECT * FROM runs WHERE id = ?", (run_id,))
+    if run.empty:
+        raise ValueError(f"No tracked run {run_id}")
+    run = run.iloc[0]
+    metrics = tracker.query("SELECT key, value FROM metrics WHERE run_id = ?", (run_id,))
+    artifacts = tracker.query("SELECT name, path FROM artifacts WHERE run_id = ?", (run_id,))
+    trials = tracker.trials(run_id)
+
+    mlflow.set_experiment(experiment or run["experiment"])
+    with mlflow.start_run(run_name=run["name"]) as mlflow_run:
+        mlflow.log_params(json.loads(run["params"]) or {})
+        mlflow.set_tags(
+            {
+                "model_type": run["model_type"],
+                "dataset": run["dataset"],
+                "data_hash": run["data_hash"],
+                "git_commit": run["git_commit"],
+                "tracker_run_id": run_id,
+            }
+        )
+        mlflow.log_metrics(dict(zip(metrics["key"], metrics["value"])))
+        if run["best_score"] is not None and not pd.isna(run["best_score"]):
+            mlflow.log_metric("best_cv_score", run["best_score"])
+        for path in artifacts["path"]:
+            if Path(path).exists():
+                mlflow.log_artifact(path)
+        if not trials.empty:
+            mlflow.log_table(trials, "trials.json")
+    return mlflow_run.info.run_id
+
+
+@app.command()
+def best(db_path: Path = EXPERIMENT_DB, experiment: str | None = None):
+    """Best CV F1 per model type per dataset."""
+    logger.info(
+        "Best trial per model type and dataset:\n"
+        + Tracker(db_path).best_per_model(experiment).to_string(index=False)
+    )
+
+
+@app.command()
+def runs(db_path: Path = EXPERIMENT_DB, experiment: str | None = None):
+    """List tracked runs."""
+    logger.info("Tracked runs:\n" + Tracker(db_path).runs(experiment).to_string(index=False))
+
+
+@app.command("import-json")
+def import_json(
+    input_path: Path = MODELS_DIR / "experiment_results.json", db_path: Path = EXPERIMENT_DB
+):
+    """Import hand-written experiment records (one object or a list of objects)."""
+    records = json.loads(input_path.read_text())
+    tracker = Tracker(db_path)
+    for record in records if isinstance(records, list) else [records]:
+        run_id = tracker.import_record(record)
+        logger.info(f"Imported {record.get('experiment_id')} as run {run_id}")
+
+
+@app.command("export-mlflow")
+def export_mlflow(run_id: int, db_path: Path = EXPERIMENT_DB, experiment: str | None = None):
+    """Copy a tracked run to mlflow (uses MLFLOW_TRACKING_URI as usual)."""
+    mlflow_run_id = export_to_mlflow(Tracker(db_path), run_id, experiment)
+    logger.success(f"Exported run {run_id} to mlflow run {mlflow_run_id}")
+
+
+if __name__ == "__main__":
+    app()
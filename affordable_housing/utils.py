@@ -1,3 +1,7 @@
+from pathlib import Path
+
+import pandas as pd
+from scipy import sparse
 from sklearn.preprocessing import FunctionTransformer
 
 
@@ -12,3 +16,32 @@ def get_binary_homeless_transformer():
         func=binary_homeless,
         feature_names_out="one-to-one",
     )
+
+
+def save_feature_matrix(X, path: Path, feature_names=None) -> None:
+    """Save a transformed feature matrix, as .npz if sparse or .csv if dense.
+
+    Args:
+        X: Dense array or scipy sparse matrix returned by the preprocessor.
+        path (Path): Destination file; the suffix decides the format.
+        feature_names: Column names for the CSV header (ignored for .npz).
+    """
+    if path.suffix == ".npz":
+        sparse.save_npz(path, sparse.csr_matrix(X))
+    else:
+        X_dense = X.toarray() if sparse.issparse(X) else X
+        pd.DataFrame(X_dense, columns=feature_names).to_csv(path, index=False)
+
+
+def load_feature_matrix(path: Path):
+    """Load a transformed feature matrix saved by save_feature_matrix.
+
+    Args:
+        path (Path): .npz (sparse CSR) or .csv (dense DataFrame) file.
+
+    Returns:
+        scipy.sparse.csr_matrix or pd.DataFrame: The feature matrix.
+    """
+    if path.suffix == ".npz":
+        return sparse.load_npz(path).tocsr()
+    return pd.read_csv(path)
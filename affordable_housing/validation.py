@@ -0,0 +1,158 @@
+from collections import Counter
+from enum import Enum
+import re
+
+from pydantic import ConfigDict, create_model, field_validator
+
+# No project imports, so the Lambda package ships a copy of this module
+
+NUMERIC_INPUTS = {
+    "avg_targeted_affordability": float,
+    "CDLAC_total_points_score": int,
+    "CDLAC_tie_breaker_self_score": float,
+    "bond_request_amount": float,
+    "homeless_percent": float,
+}
+CATEGORICAL_INPUTS = [
+    "construction_type",
+    "housing_type",
+    "CDLAC_pool_type",
+    "new_construction_set_aside",
+    "CDLAC_region",
+]
+
+
+def region_alias(region: str) -> str | None:
+    """Standard name of a CDLAC region spelling, or None if it matches none of them."""
+    region = region.strip().lower()  # Normalize to lowercase for consistent matching
+
+    if re.search(r"bay\s*area", region):
+        return "BAY AREA"
+    elif re.search(r"northern", region):
+        return "NORTHERN"
+    elif re.search(r"inland", region):
+        return "INLAND"
+    elif re.search(r"city\s*of\s*(la|los\s*angeles)", region):
+        return "CITY OF LA"
+    elif re.search(r"balance\s*of\s*(la|los\s*angeles)\s*county", region):
+        return "BALANCE OF LA COUNTY"
+    elif re.search(r"coastal", region):
+        return "COASTAL"
+    return None
+
+
+def clean_region(region: str) -> str:
+    return region_alias(region) or "NONE"
+
+
+def clean_construction_type(construction_type: str) -> str:
+    construction_type = (
+        construction_type.strip().lower()
+    )  # Normalize to lowercase for consistent matching
+
+    if re.search(r"acq", construction_type, re.IGNORECASE):
+        return "ACQ AND REHAB"
+    else:
+        return construction_type.upper()
+
+
+# Spellings dataset.py cleans, tried when a normalized value is not a category itself
+CATEGORY_ALIASES = {
+    "CDLAC_region": region_alias,
+    "construction_type": clean_construction_type,
+}
+
+
+def normalize_category(value: str) -> str:
+    """Upper case, with surrounding whitespace stripped and inner runs collapsed to a space."""
+    return " ".join(value.split()).upper()
+
+
+def category_vocabulary(preprocessor) -> dict:
+    """
+    Categories of each one-hot encoded input column, read from the encoder's `categories_`
+    (fitted ColumnTransformer) or the export manifest's vocabularies (ExportedPreprocessor).
+    """
+    vocabulary = {}
+    if hasattr(preprocessor, "blocks"):
+        for block in preprocessor.blocks:
+            for step in block["steps"]:
+                if step["type"] == "one_hot":
+                    for column, vocab_name in zip(block["columns"], step["categories"]):
+                        vocabulary[column] = list(preprocessor.arrays[vocab_name])
+    else:
+        for _, transformer, columns in preprocessor.transformers_:
+            for _, step in getattr(transformer, "steps", [(None, transformer)]):
+                if hasattr(step, "categories_"):
+                    for column, categories in zip(columns, step.categories_):
+                        vocabulary[column] = list(categories)
+    # A missing value seen in training is a category too, but not one a request can send
+    return {
+        column: [str(c) for c in categories if isinstance(c, str)]
+        for column, categories in vocabulary.items()
+    }
+
+
+def category_normalizer(field: str, categories: list):
+    """
+    Function mapping a raw value onto the spelling of one of `categories`, or returning it
+    unchanged when it matches none. A category is also reachable through its cleaned spelling
+    (e.g. "BAY AREA" for the encoder's "Bay Area (Alameda, ...)"), unless two categories clean
+    to the same one.
+    """
+    canonical = {normalize_category(c): c for c in categories}
+    alias = CATEGORY_ALIASES.get(field)
+    if alias is not None:
+        cleaned = {c: alias(normalize_category(c)) for c in categories}
+        counts = Counter(cleaned.values())
+        for category, spelling in cleaned.items():
+            if spelling is not None and counts[spelling] == 1:
+                canonical.setdefault(spelling, category)
+
+    def normalize(value: str) -> str:
+        spelling = normalize_category(value)
+        if spelling not in canonical and alias is not None:
+            spelling = alias(spelling) or spelling
+        return canonical.get(spelling, value)
+
+    return normalize
+
+
+def category_validator(field: str, categories: list):
+    """Before-validator normalizing a value with category_normalizer."""
+    normalize_value = category_normalizer(field, categories)
+
+    def normalize(cls, value):
+        if not isinstance(value, str):
+            return value
+        return normalize_value(value)  # unknown values fail with the raw input
+
+    return field_validator(field, mode="before")(normalize)
+
+
+def input_model(vocabulary: dict | None = None, name: str = "PredictionInput"):
+    """
+    Pydantic model of one prediction input.
+
+    Categorical fields found in `vocabulary` (see category_vocabulary) are enums of the
+    encoder's categories: values are normalized first (case, whitespace and the region and
+    construction type spellings dataset.py cleans), and anything still unknown fails
+    validation, before any pandas or sklearn work. Other categorical fields accept any string.
+    Enum values are stored as plain strings, so `model_dump()` feeds the preprocessor as is.
+    """
+    vocabulary = vocabulary or {}
+    fields = {field: (kind, ...) for field, kind in NUMERIC_INPUTS.items()}
+    validators = {}
+    for field in CATEGORICAL_INPUTS:
+        if field in vocabulary:
+            categories = vocabulary[field]
+            fields[field] = (Enum(field, {c: c for c in categories}), ...)
+            validators[f"normalize_{field}"] = category_validator(field, categories)
+        else:
+            fields[field] = (str, ...)
+    return create_model(
+        name,
+        __config__=ConfigDict(use_enum_values=True),
+        __validators__=validators,
+        **fields,
+    )
@@ -96,7 +96,7 @@ def main(
     points_pipe = make_pipeline(points_transformer, MinMaxScaler())
 
     logger.debug("Setting up categorical and numerical pipelines")
-    cat_pipe = make_pipeline(OneHotEncoder())
+    cat_pipe = make_pipeline(OneHotEncoder(handle_unknown="ignore"))
     remainder_num_pipe = make_pipeline(StandardScaler())
 
     logger.info("Creating column transformer")
@@ -0,0 +1,25 @@
+# No project imports, so the Lambda package ships a copy of this module
+
+# Cut used everywhere a model stores no threshold (a plain pipeline, or an export with
+# "threshold": null): lowered by hand from 0.5 to reflect OBBBA's increased LIHTC (see the README)
+FALLBACK_THRESHOLD = 0.44
+
+
+def stored_threshold(model) -> float | None:
+    """Return the decision threshold stored in a model artifact, or None if it has none."""
+    # FixedThresholdClassifier and exported artifacts both carry a numeric `threshold`
+    threshold = getattr(model, "threshold", None)
+    if isinstance(threshold, (int, float)):
+        return float(threshold)
+    return None
+
+
+def decision_threshold(model) -> float:
+    """Return the decision threshold stored in a model artifact, or FALLBACK_THRESHOLD."""
+    threshold = stored_threshold(model)
+    return FALLBACK_THRESHOLD if threshold is None else threshold
+
+
+def predict_labels(model, probabilities):
+    """0/1 predictions of `model` for its positive-class probabilities."""
+    return (probabilities >= decision_threshold(model)).astype(int)
@@ -0,0 +1,185 @@
+from collections.abc import Callable
+from datetime import datetime, timezone
+import hashlib
+import os
+from pathlib import Path
+import queue
+import threading
+import time
+import uuid
+
+from loguru import logger
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# No project imports, so the Lambda package ships a copy of this module
+
+INPUT_FIELDS = [
+    ("avg_targeted_affordability", pa.float64()),
+    ("CDLAC_total_points_score", pa.int64()),
+    ("CDLAC_tie_breaker_self_score", pa.float64()),
+    ("bond_request_amount", pa.float64()),
+    ("homeless_percent", pa.float64()),
+    ("construction_type", pa.string()),
+    ("housing_type", pa.string()),
+    ("CDLAC_pool_type", pa.string()),
+    ("new_construction_set_aside", pa.string()),
+    ("CDLAC_region", pa.string()),
+]
+LOG_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("request_id", pa.string()),
+        ("source", pa.string()),  # api, lambda or shadow
+        ("application_number", pa.string()),  # when the caller sent one; needed for labels
+        ("model_version", pa.string()),
+        *INPUT_FIELDS,
+        ("prediction", pa.int64()),
+        ("probability", pa.float64()),
+        ("latency_ms", pa.float64()),
+        ("batch_size", pa.int64()),  # records scored by the same request
+    ]
+)
+
+
+def file_version(path) -> str:
+    """Short content hash of a model file, logged as the model version."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:12]
+
+
+def prediction_records(
+    inputs: list,
+    predictions,
+    probabilities,
+    latency_ms: float,
+    model_version: str,
+    source: str,
+    application_numbers=None,
+    request_ids=None,
+) -> list:
+    """
+    Log records of one scored request, one per input. `inputs` are the request's input dicts:
+    building the records from them rather than the scored DataFrame keeps pandas off the
+    request path. Pass `request_ids` to share ids with the records of another model version
+    scoring the same inputs.
+    """
+    timestamp = datetime.now(timezone.utc)
+    records = [{name: values[name] for name, _ in INPUT_FIELDS} for values in inputs]
+    if application_numbers is None:
+        application_numbers = [None] * len(records)
+    if request_ids is None:
+        request_ids = [uuid.uuid4().hex for _ in records]
+    for record, prediction, probability, number, request_id in zip(
+        records, predictions, probabilities, application_numbers, request_ids
+    ):
+        record.update(
+            timestamp=timestamp,
+            request_id=request_id,
+            source=source,
+            application_number=number,
+            model_version=model_version,
+            prediction=int(prediction),
+            probability=float(probability),
+            latency_ms=float(latency_ms),
+            batch_size=len(records),
+        )
+    return records
+
+
+class PredictionLogger:
+    """
+    Buffered, non-blocking prediction log writing rolling Parquet files.
+
+    Request handlers only put records on a bounded queue (records are dropped and counted
+    when it is full, never blocking). A daemon thread batches them and writes a new file under
+    <log_dir>/date=<UTC date>/ every `flush_rows` records or `flush_seconds`, whichever comes
+    first, so memory is bounded by the queue plus one batch. Files are written under a
+    temporary name and renamed, so readers never see a partial file; `on_write` is then called
+    with its path (the Lambda uploads it to S3 there).
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        flush_rows: int = 1000,
+        flush_seconds: float = 60.0,
+        max_queue: int = 10_000,
+        on_write: Callable[[Path], None] | None = None,
+    ):
+        self.log_dir = Path(log_dir)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self.files = 0
+        self.on_write = on_write
+        self.thread = None
+
+    def log(self, records: list) -> None:
+        """Queue records for writing; never blocks."""
+        for record in records:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def write(self, buffer: list) -> Path | None:
+        if not buffer:
+            return None
+        now = datetime.now(timezone.utc)
+        partition = self.log_dir / f"date={now:%Y-%m-%d}"
+        partition.mkdir(parents=True, exist_ok=True)
+        self.files += 1
+        name = f"part-{now:%H%M%S%f}-{os.getpid()}-{self.files}.parquet"
+        tmp_path = partition / f".{name}.tmp"
+        pq.write_table(pa.Table.from_pylist(buffer, schema=LOG_SCHEMA), tmp_path)
+        path = partition / name
+        os.replace(tmp_path, path)
+        self.written += len(buffer)
+        if self.on_write is not None:
+            self.on_write(path)
+        return path
+
+    def run(self) -> None:
+        buffer, stopping = [], False
+        deadline = time.monotonic() + self.flush_seconds
+        while not stopping:
+            try:
+                record = self.queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                stopping = record is None
+                if not stopping:
+                    buffer.append(record)
+                    if len(buffer) < self.flush_rows:
+                        continue
+            except queue.Empty:
+                pass  # flush interval reached
+            try:
+                self.write(buffer)
+            except Exception:  # a failed write must not stop the logger
+                logger.exception(f"Prediction log write failed, {len(buffer)} records lost")
+            buffer = []
+            deadline = time.monotonic() + self.flush_seconds
+
+    def start(self) -> "PredictionLogger":
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="prediction-log", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Write what is buffered and stop the writer thread."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+
+def read_prediction_logs(log_dir: Path) -> pd.DataFrame:
+    """Every logged prediction under `log_dir` (all date partitions), oldest first."""
+    paths = sorted(Path(log_dir).glob("date=*/part-*.parquet"))
+    if not paths:
+        return pd.DataFrame(columns=LOG_SCHEMA.names)
+    logs = pa.concat_tables(pq.read_table(path, schema=LOG_SCHEMA) for path in paths)
+    return logs.to_pandas().sort_values("timestamp", kind="stable", ignore_index=True)
@@ -0,0 +1,109 @@
+import os
+from pathlib import Path
+import shutil
+import tempfile
+
+from loguru import logger
+import numpy as np
+import pandas as pd
+
+from affordable_housing.modeling.applicants import iter_round_chunks, prepare_round_features
+from affordable_housing.modeling.decision import decision_threshold
+
+RESULT_SUFFIX = "-predictions.csv"
+RESULT_COLUMNS = ["PREDICTED_AWARD", "PREDICTION_PROBABILITY"]  # appended to the input columns
+SUPPORTED_SUFFIXES = (".csv", ".xlsx", ".parquet")
+CHUNK_ROWS = int(os.getenv("BATCH_CHUNK_ROWS", "5000"))
+
+
+class S3ObjectStore:
+    """Object store backed by S3 (boto3 ships with the Lambda Python runtime)."""
+
+    def __init__(self):
+        import boto3
+
+        self.client = boto3.client("s3")
+
+    def download(self, bucket: str, key: str, path: str) -> None:
+        self.client.download_file(bucket, key, path)
+
+    def upload(self, path: str, bucket: str, key: str) -> None:
+        self.client.upload_file(path, bucket, key)
+
+
+class LocalObjectStore:
+    """Filesystem stand-in for S3: object <bucket>/<key> is the file <root>/<bucket>/<key>."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def download(self, bucket: str, key: str, path: str) -> None:
+        shutil.copyfile(self.root / bucket / key, path)
+
+    def upload(self, path: str, bucket: str, key: str) -> None:
+        target = self.root / bucket / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, target)
+
+
+def get_object_store():
+    """LocalObjectStore when OBJECT_STORE_ROOT is set (local runs), otherwise S3."""
+    root = os.getenv("OBJECT_STORE_ROOT")
+    return LocalObjectStore(root) if root else S3ObjectStore()
+
+
+def result_key(key: str) -> str:
+    """Key of the results file written next to the input: <dir>/<stem>-predictions.csv."""
+    return f"{os.path.splitext(key)[0]}{RESULT_SUFFIX}"
+
+
+def is_scorable(key: str) -> bool:
+    # Results land in the same prefix and raise their own object-created event: skip them
+    return key.lower().endswith(SUPPORTED_SUFFIXES) and not key.endswith(RESULT_SUFFIX)
+
+
+def score_object(store, bucket: str, key: str, model, preprocessor, chunk_rows=CHUNK_ROWS):
+    """
+    Stream-score an applicant list object and write the results file next to it.
+
+    The object is copied to local temporary storage, read `chunk_rows` rows at a time and each
+    scored chunk is appended to a local csv that is uploaded at the end, so memory stays bounded
+    by the chunk size rather than the file size.
+    Args:
+        store: LocalObjectStore or S3ObjectStore.
+        bucket (str): Bucket of the uploaded object.
+        key (str): Key of the uploaded object (.csv, .xlsx or .parquet).
+        model: Cached model (see main.load_model).
+        preprocessor: Cached preprocessor.
+        chunk_rows (int): Rows per chunk.
+    Returns:
+        dict: Input and output keys and the number of rows scored.
+    """
+    output_key = result_key(key)
+    threshold = decision_threshold(model)
+    n_rows = 0
+    input_columns = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, os.path.basename(key))
+        output_path = os.path.join(tmp_dir, "predictions.csv")
+        store.download(bucket, key, input_path)
+
+        for chunk in iter_round_chunks(input_path, chunk_rows):
+            raw_df, X_values = prepare_round_features(chunk)
+            if raw_df.empty:  # header-only csv: nothing to score, keep its columns for the header
+                input_columns = list(raw_df.columns)
+                continue
+            transformed_features = preprocessor.transform(X_values)
+            probability = model.predict_proba(transformed_features)[:, 1]
+            raw_df["PREDICTED_AWARD"] = np.where(probability >= threshold, "Yes", "No")
+            raw_df["PREDICTION_PROBABILITY"] = probability
+            raw_df.to_csv(output_path, mode="a", header=n_rows == 0, index=False)
+            n_rows += len(raw_df)
+            logger.info(f"Scored {n_rows} rows of s3://{bucket}/{key}")
+
+        if n_rows == 0:
+            # An empty input still gets its results file, so callers waiting on it see one
+            logger.warning(f"s3://{bucket}/{key} has no rows to score")
+            pd.DataFrame(columns=input_columns + RESULT_COLUMNS).to_csv(output_path, index=False)
+        store.upload(output_path, bucket, output_key)
+    return {"bucket": bucket, "input_key": key, "output_key": output_key, "rows": n_rows}
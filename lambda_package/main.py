@@ -1,7 +1,17 @@
 import json
+import os
+import time
+from urllib.parse import unquote_plus
 
 import joblib
 import pandas as pd
+from pydantic import ValidationError
+
+from affordable_housing.modeling.artifact import MANIFEST_NAME, load_artifact
+from affordable_housing.modeling.decision import predict_labels
+from affordable_housing.prediction_log import PredictionLogger, file_version, prediction_records
+from affordable_housing.validation import category_vocabulary, input_model
+from batch import get_object_store, is_scorable, score_object
 
 HEADER_CORS = {
     "Content-Type": "application/json",
@@ -11,6 +21,85 @@ HEADER_CORS = {
 }
 
 
+EXPORT_DIR = "models/export"
+# "joblib" serves model.pkl / preprocessor.pkl, "export" serves the pickle-free EXPORT_DIR,
+# as MODEL_FORMAT does for the API
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "joblib")
+
+# Loaded once per container and reused across warm invocations
+_ARTIFACTS = {}
+_PREDICTION_LOG = {}
+
+
+def load_model(
+    model_path: str = "models/model.pkl",
+    preprocessor_path: str = "models/preprocessor.pkl",
+):
+    """Load the model and preprocessor in MODEL_FORMAT: the pickles or the pickle-free export.
+
+    Returns:
+        tuple: (model, preprocessor)
+    """
+    if not _ARTIFACTS:
+        if MODEL_FORMAT == "export":
+            _ARTIFACTS["pair"] = load_artifact(EXPORT_DIR)
+        else:
+            _ARTIFACTS["pair"] = (joblib.load(model_path), joblib.load(preprocessor_path))
+    return _ARTIFACTS["pair"]
+
+
+def get_input_model(
+    model_path: str = "models/model.pkl",
+    preprocessor_path: str = "models/preprocessor.pkl",
+):
+    """Request validation model generated from the loaded preprocessor's categories."""
+    if "input_model" not in _ARTIFACTS:
+        _, preprocessor = load_model(model_path, preprocessor_path)
+        _ARTIFACTS["input_model"] = input_model(category_vocabulary(preprocessor))
+    return _ARTIFACTS["input_model"]
+
+
+def get_prediction_logger():
+    """
+    The container's prediction logger, started on first use; None when PREDICTION_LOGGING is
+    false. Files are written to local /tmp storage and uploaded under PREDICTION_LOG_BUCKET /
+    PREDICTION_LOG_PREFIX when a bucket is set. The writer thread only runs while the container
+    is thawed, so a file is due at the first invocation after `flush_seconds`; records still
+    buffered when the container is reclaimed are lost.
+    """
+    if os.getenv("PREDICTION_LOGGING", "true").lower() != "true":
+        return None
+    if "logger" not in _PREDICTION_LOG:
+        log_dir = os.getenv("PREDICTION_LOG_DIR", "/tmp/prediction_logs")
+        bucket = os.getenv("PREDICTION_LOG_BUCKET")
+        on_write = None
+        if bucket:
+            store = get_object_store()
+            prefix = os.getenv("PREDICTION_LOG_PREFIX", "prediction_logs")
+
+            def on_write(path):
+                key = f"{prefix}/{os.path.relpath(path, log_dir)}"
+                store.upload(str(path), bucket, key)
+                os.remove(path)
+
+        _PREDICTION_LOG["logger"] = PredictionLogger(
+            log_dir,
+            flush_rows=int(os.getenv("PREDICTION_LOG_FLUSH_ROWS", "1000")),
+            flush_seconds=float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "60")),
+            on_write=on_write,
+        ).start()
+    return _PREDICTION_LOG["logger"]
+
+
+def model_version(model_path: str = "models/model.pkl") -> str:
+    """Content hash of the served model, recorded in the prediction log."""
+    if "version" not in _PREDICTION_LOG:
+        if MODEL_FORMAT == "export":
+            model_path = os.path.join(EXPORT_DIR, MANIFEST_NAME)
+        _PREDICTION_LOG["version"] = file_version(model_path)
+    return _PREDICTION_LOG["version"]
+
+
 def predict(
     user_input: dict,
     model_path: str = "models/model.pkl",
@@ -26,21 +115,39 @@ def predict(
     Returns:
         dict: Predicted labels and probability
     """
-    model = joblib.load(model_path)
-    preprocessor = joblib.load(preprocessor_path)
+    model, preprocessor = load_model(model_path, preprocessor_path)
 
     # Convert dict to list of values for sklearn
     features = pd.DataFrame([user_input])
     transformed_features = preprocessor.transform(features)
-    prediction = model.predict(transformed_features)
-    prob = model.predict_proba(transformed_features)[:, 1][0]
+    probabilities = model.predict_proba(transformed_features)[:, 1]
+    prediction = predict_labels(model, probabilities)[0]
+    prob = probabilities[0]
 
     return {"prediction": int(prediction), "probability": float(prob)}
 
 
+def handle_object_created(event) -> dict:
+    """Score every applicant list referenced by an S3 object-created event."""
+    model, preprocessor = load_model()
+    store = get_object_store()
+    results = []
+    for record in event["Records"]:
+        bucket = record["s3"]["bucket"]["name"]
+        key = unquote_plus(record["s3"]["object"]["key"])  # keys arrive URL-encoded
+        if not is_scorable(key):
+            results.append({"bucket": bucket, "input_key": key, "skipped": True})
+            continue
+        results.append(score_object(store, bucket, key, model, preprocessor))
+    return {"statusCode": 200, "body": json.dumps({"results": results})}
+
+
 def lambda_handler(event, context):
-    """AWS Lambda handler for housing prediction API."""
+    """AWS Lambda handler for housing prediction API and S3 batch scoring events."""
     try:
+        if "Records" in event:
+            return handle_object_created(event)
+
         if "resource" not in event:
             return {
                 "statusCode": 400,
@@ -74,59 +181,16 @@ def lambda_handler(event, context):
                 "headers": HEADER_CORS,
             }
 
+        start = time.perf_counter()
         body = event["body"]
         if isinstance(body, str):
             body = json.loads(body)
 
-        # Validate required fields
-        required_fields = [
-            "avg_targeted_affordability",
-            "CDLAC_total_points_score",
-            "CDLAC_tie_breaker_self_score",
-            "bond_request_amount",
-            "homeless_percent",
-            "construction_type",
-            "housing_type",
-            "CDLAC_pool_type",
-            "new_construction_set_aside",
-            "CDLAC_region",
-        ]
-        if not all(field in body for field in required_fields):
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"error": "Missing required input fields"}),
-                "headers": HEADER_CORS,
-            }
-
-        # Validate field types
-        try:
-            input_data = {
-                "avg_targeted_affordability": float(body["avg_targeted_affordability"]),
-                "CDLAC_total_points_score": int(body["CDLAC_total_points_score"]),
-                "CDLAC_tie_breaker_self_score": float(body["CDLAC_tie_breaker_self_score"]),
-                "bond_request_amount": float(body["bond_request_amount"]),
-                "homeless_percent": float(body["homeless_percent"]),
-                "construction_type": str(body["construction_type"]),
-                "housing_type": str(body["housing_type"]),
-                "CDLAC_pool_type": str(body["CDLAC_pool_type"]),
-                "new_construction_set_aside": str(body["new_construction_set_aside"]),
-                "CDLAC_region": str(body["CDLAC_region"]),
-            }
-        except (ValueError, TypeError):
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"error": "Invalid input data types"}),
-                "headers": HEADER_CORS,
-            }
-
         # Check model and preprocessor files
         model_path = "models/model.pkl"
         preprocessor_path = "models/preprocessor.pkl"
         try:
-            with open(model_path, "rb"):
-                pass
-            with open(preprocessor_path, "rb"):
-                pass
+            request_model = get_input_model(model_path, preprocessor_path)
         except FileNotFoundError:
             return {
                 "statusCode": 500,
@@ -134,8 +198,32 @@ def lambda_handler(event, context):
                 "headers": HEADER_CORS,
             }
 
+        # Validate fields and categories against the encoder's vocabulary
+        try:
+            input_data = request_model.model_validate(body).model_dump()
+        except ValidationError as e:
+            return {
+                "statusCode": 422,
+                "body": json.dumps({"detail": json.loads(e.json(include_url=False))}),
+                "headers": HEADER_CORS,
+            }
+
         # Perform prediction
         result = predict(input_data, model_path, preprocessor_path)
+        prediction_logger = get_prediction_logger()
+        if prediction_logger is not None:
+            application_number = body.get("application_number")
+            prediction_logger.log(
+                prediction_records(
+                    [input_data],
+                    [result["prediction"]],
+                    [result["probability"]],
+                    (time.perf_counter() - start) * 1000,
+                    model_version(model_path),
+                    "lambda",
+                    [None if application_number is None else str(application_number)],
+                )
+            )
 
         # Return response
         return {"statusCode": 200, "body": json.dumps(result), "headers": HEADER_CORS}
@@ -0,0 +1,80 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import FixedThresholdClassifier
+from sklearn.pipeline import make_pipeline
+
+from affordable_housing.config import MODELS_DIR
+from affordable_housing.modeling.artifact import MANIFEST_NAME, load_artifact
+from affordable_housing.modeling.decision import predict_labels
+from affordable_housing.modeling.export import export_artifact
+from affordable_housing.validation import category_vocabulary
+
+N_ROWS = 400
+
+
+@pytest.fixture(scope="module")
+def preprocessor():
+    return joblib.load(MODELS_DIR / "preprocessor.pkl")
+
+
+@pytest.fixture(scope="module")
+def raw(preprocessor):
+    """Applications drawn over the committed preprocessor's categories, with award labels."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(
+        {
+            "avg_targeted_affordability": rng.uniform(0.3, 0.8, N_ROWS),
+            "CDLAC_total_points_score": rng.integers(80, 131, N_ROWS),
+            "CDLAC_tie_breaker_self_score": rng.uniform(0, 3, N_ROWS),
+            "bond_request_amount": rng.uniform(1e6, 1e8, N_ROWS),
+            "homeless_percent": rng.choice([0.0, 10.0, 50.0], N_ROWS),
+        }
+    )
+    for column, categories in category_vocabulary(preprocessor).items():
+        X[column] = rng.choice(categories, N_ROWS)
+    logit = 0.2 * (X["CDLAC_total_points_score"] - 110) + X["CDLAC_tie_breaker_self_score"] - 1
+    y = (logit + rng.logistic(size=N_ROWS) > 0).astype(int)
+    return X[list(preprocessor.feature_names_in_)], y.to_numpy()
+
+
+def fit_model(calibration: str, threshold, X, y):
+    """A model artifact as threshold.py saves it."""
+    model = make_pipeline(LogisticRegression(max_iter=1000))
+    if calibration != "none":
+        model = CalibratedClassifierCV(clone(model), method=calibration, cv=3, ensemble=False)
+    model.fit(X, y)
+    if threshold is not None:
+        model = FixedThresholdClassifier(
+            model, threshold=threshold, response_method="predict_proba"
+        )
+    return model
+
+
+@pytest.mark.parametrize("threshold", [None, 0.3])
+@pytest.mark.parametrize("calibration", ["none", "sigmoid", "isotonic"])
+def test_exported_model_matches_sklearn(tmp_path, preprocessor, raw, calibration, threshold):
+    X, y = raw
+    transformed = preprocessor.transform(X)
+    model = fit_model(calibration, threshold, transformed, y)
+
+    export_artifact(model, preprocessor, tmp_path, source_version="abc123")
+    exported_model, exported_preprocessor = load_artifact(tmp_path)
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["model"]["threshold"] == threshold
+    assert manifest["source_model_version"] == "abc123"
+    exported_transformed = exported_preprocessor.transform(X)
+    np.testing.assert_allclose(exported_transformed, transformed, atol=1e-12)
+    probabilities = model.predict_proba(transformed)
+    np.testing.assert_allclose(exported_model.predict_proba(exported_transformed), probabilities)
+    expected = predict_labels(model, probabilities[:, 1])
+    if threshold is not None:
+        np.testing.assert_array_equal(expected, model.predict(transformed))
+    np.testing.assert_array_equal(exported_model.predict(exported_transformed), expected)
@@ -0,0 +1,113 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from affordable_housing.config import MODELS_DIR
+from affordable_housing.feature_store import KEY, FeatureStore
+
+PREPROCESSOR_PATH = MODELS_DIR / "preprocessor.pkl"
+ROUND_ID = "2025-R2"
+KEYS = ["CA-25-900", "CA-25-901", "25-902", "CA-2025-903"]
+X_VALUES = pd.DataFrame(
+    {
+        "avg_targeted_affordability": [0.52, 0.54, 0.41, 0.6],
+        "CDLAC_total_points_score": [114, 117, 119, 105],
+        "CDLAC_tie_breaker_self_score": [1.55, 0.67, 1.02, 0.2],
+        "bond_request_amount": [25302119.02, 11535801.7, 30000000.0, 8000000.0],
+        "homeless_percent": [0.0, 0.0, 25.0, 10.0],
+        "construction_type": [
+            "Acq and Rehabilitation",
+            "New Construction",
+            "New Construction",
+            "New Construction",
+        ],
+        "housing_type": ["Large Family", "Non-Targeted", "Seniors", "Large Family"],
+        "CDLAC_pool_type": [
+            "Preservation",
+            "New Construction",
+            "New Construction",
+            "Other Rehabilitation",
+        ],
+        "new_construction_set_aside": ["none", "none", "Homeless, ELI/VLI", "ELI/VLI"],
+        "CDLAC_region": [
+            "City of Los Angeles",
+            "Balance of Los Angeles County",
+            "City of Los Angeles",
+            "Balance of Los Angeles County",
+        ],
+    }
+)
+
+
+class CountingPreprocessor:
+    """The committed preprocessor, recording how many rows each transform call receives."""
+
+    def __init__(self):
+        self.preprocessor = joblib.load(PREPROCESSOR_PATH)
+        self.calls = []
+
+    def transform(self, X):
+        self.calls.append(len(X))
+        return self.preprocessor.transform(X)
+
+    def get_feature_names_out(self):
+        return self.preprocessor.get_feature_names_out()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeatureStore(PREPROCESSOR_PATH, root=tmp_path, preprocessor=CountingPreprocessor())
+
+
+def expected(X: pd.DataFrame) -> np.ndarray:
+    transformed = joblib.load(PREPROCESSOR_PATH).transform(X)
+    return transformed.toarray() if hasattr(transformed, "toarray") else transformed
+
+
+def test_first_transform_stores_every_row(store):
+    result = store.transform(X_VALUES, KEYS, ROUND_ID)
+
+    np.testing.assert_allclose(result, expected(X_VALUES))
+    assert store.preprocessor.calls == [len(KEYS)]
+    stored = store.read(ROUND_ID)
+    assert sorted(stored[KEY]) == ["CA-2025-900", "CA-2025-901", "CA-2025-902", "CA-2025-903"]
+
+
+def test_unchanged_rows_are_reused(store):
+    store.transform(X_VALUES, KEYS, ROUND_ID)
+
+    # Same applications in another order: read back in the requested order, nothing transformed
+    order = [3, 1, 0, 2]
+    result = store.transform(X_VALUES.iloc[order], [KEYS[i] for i in order], ROUND_ID)
+
+    np.testing.assert_allclose(result, expected(X_VALUES.iloc[order]))
+    assert store.preprocessor.calls == [len(KEYS)]
+
+
+def test_changed_and_new_rows_are_transformed(store):
+    store.transform(X_VALUES.iloc[:3], KEYS[:3], ROUND_ID)
+    changed = X_VALUES.copy()
+    changed.loc[1, "bond_request_amount"] = 15_000_000.0
+
+    result = store.transform(changed, KEYS, ROUND_ID)
+
+    np.testing.assert_allclose(result, expected(changed))
+    # Row 1 changed since it was stored, row 3 is new
+    assert store.preprocessor.calls == [3, 2]
+    assert len(store.read(ROUND_ID)) == len(KEYS)
+
+
+def test_rounds_are_stored_separately(store):
+    store.transform(X_VALUES, KEYS, ROUND_ID)
+
+    store.transform(X_VALUES, KEYS, "2025-R1")
+
+    assert store.preprocessor.calls == [len(KEYS), len(KEYS)]
+    assert store.rounds() == ["2025-R1", ROUND_ID]
+    assert len(store.read()) == 2 * len(KEYS)
+
+
+def test_duplicate_application_numbers_are_rejected(store):
+    with pytest.raises(ValueError, match="Duplicate application numbers"):
+        store.transform(X_VALUES.iloc[:2], ["CA-25-900", "25-900"], ROUND_ID)
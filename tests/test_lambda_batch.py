@@ -0,0 +1,162 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+LAMBDA_DIR = Path(__file__).resolve().parents[1] / "lambda_package"
+BUCKET = "rounds"
+
+NORTHERN = (
+    "Northern (Butte, El Dorado, Placer, Sacramento, San Joaquin, Shasta, Solano, Sutter, Yuba, "
+    "and Yolo Counties)"
+)
+# A Round 2 applicant list with the columns transform_predict.py expects
+ROUND = pd.DataFrame(
+    {
+        "APPLICATION NUMBER": ["CA-25-900", "CA-25-901", "CA-25-902"],
+        "PROJECT NAME": ["Project 1", "Project 2", "Project 3"],
+        "CONSTRUCTION TYPE": [
+            "Acquisition/Rehabilitation",
+            "New Construction",
+            "New Construction",
+        ],
+        "HOUSING TYPE": ["Large Family", "Non-Targeted", "Seniors"],
+        "HOMELESS %": [0.0, 0.0, 25.0],
+        "AVERAGE TARGETED AFFORDABILITY": [0.52, 0.54, 0.41],
+        "BOND REQUEST": [25302119.02, 11535801.7, 30000000.0],
+        "CDLAC POOL": ["New Construction", "New Construction", "Preservation"],
+        "HOMELESS": ["Yes", "No", "Yes"],
+        "ELI/VLI": ["Yes", "No", "Yes"],
+        "MIP": ["No", "No", "No"],
+        "CDLAC REGION": [
+            "City of Los Angeles",
+            "Balance of Los Angeles County",
+            NORTHERN,
+        ],
+        "CDLAC TOTAL POINTS": [114.0, 117.0, 119.0],
+        "TIEBREAKER SELF SCORE": [1.55, 0.67, 1.02],
+    }
+)
+
+
+@pytest.fixture
+def lambda_env(tmp_path, monkeypatch):
+    """
+    The Lambda modules, imported as the runtime does (from lambda_package, with its models/
+    relative to the working directory), with a LocalObjectStore rooted at `tmp_path`.
+    """
+    monkeypatch.chdir(LAMBDA_DIR)
+    monkeypatch.syspath_prepend(str(LAMBDA_DIR))
+    monkeypatch.setenv("OBJECT_STORE_ROOT", str(tmp_path))
+    monkeypatch.setenv("PREDICTION_LOGGING", "false")
+    import batch
+    import main
+
+    main._ARTIFACTS.clear()
+    return batch, main, batch.LocalObjectStore(str(tmp_path))
+
+
+def put_object(store, key: str, df: pd.DataFrame) -> None:
+    path = store.root / BUCKET / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def read_results(store, key: str) -> pd.DataFrame:
+    return pd.read_csv(store.root / BUCKET / key)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_score_object_writes_results_next_to_input(lambda_env, suffix):
+    batch, main, store = lambda_env
+    model, preprocessor = main.load_model()
+    put_object(store, f"uploads/2025-R2{suffix}", ROUND)
+
+    result = batch.score_object(
+        store, BUCKET, f"uploads/2025-R2{suffix}", model, preprocessor, chunk_rows=2
+    )
+
+    assert result["rows"] == len(ROUND)
+    assert result["output_key"] == "uploads/2025-R2-predictions.csv"
+    scored = read_results(store, result["output_key"])
+    assert scored["APPLICATION NUMBER"].tolist() == ROUND["APPLICATION NUMBER"].tolist()
+    assert scored["PREDICTION_PROBABILITY"].between(0, 1).all()
+    threshold = batch.decision_threshold(model)
+    expected = scored["PREDICTION_PROBABILITY"].ge(threshold).map({True: "Yes", False: "No"})
+    assert scored["PREDICTED_AWARD"].tolist() == expected.tolist()
+
+
+def test_score_object_chunking_does_not_change_results(lambda_env):
+    batch, main, store = lambda_env
+    model, preprocessor = main.load_model()
+    put_object(store, "2025-R2.csv", ROUND)
+
+    batch.score_object(store, BUCKET, "2025-R2.csv", model, preprocessor, chunk_rows=1)
+    one_row_chunks = read_results(store, "2025-R2-predictions.csv")
+    batch.score_object(store, BUCKET, "2025-R2.csv", model, preprocessor, chunk_rows=100)
+
+    pd.testing.assert_frame_equal(one_row_chunks, read_results(store, "2025-R2-predictions.csv"))
+
+
+def test_score_object_header_only_input_writes_empty_results(lambda_env):
+    batch, main, store = lambda_env
+    model, preprocessor = main.load_model()
+    put_object(store, "empty.csv", ROUND.iloc[:0])
+
+    result = batch.score_object(store, BUCKET, "empty.csv", model, preprocessor)
+
+    assert result["rows"] == 0
+    scored = read_results(store, "empty-predictions.csv")
+    assert scored.empty
+    assert list(scored.columns[-2:]) == batch.RESULT_COLUMNS
+
+
+def s3_event(*keys: str) -> dict:
+    return {
+        "Records": [{"s3": {"bucket": {"name": BUCKET}, "object": {"key": key}}} for key in keys]
+    }
+
+
+def test_lambda_handler_scores_url_encoded_key(lambda_env):
+    _, main, store = lambda_env
+    put_object(store, "uploads/2025 R2 list.csv", ROUND)
+
+    response = main.lambda_handler(s3_event("uploads/2025+R2+list.csv"), None)
+
+    assert response["statusCode"] == 200, response["body"]
+    (result,) = json.loads(response["body"])["results"]
+    assert result["input_key"] == "uploads/2025 R2 list.csv"
+    assert result["rows"] == len(ROUND)
+    assert len(read_results(store, "uploads/2025 R2 list-predictions.csv")) == len(ROUND)
+
+
+def test_lambda_handler_skips_results_and_unsupported_files(lambda_env):
+    _, main, store = lambda_env
+
+    response = main.lambda_handler(
+        s3_event("uploads/2025-R2-predictions.csv", "uploads/notes.txt"), None
+    )
+
+    assert response["statusCode"] == 200
+    results = json.loads(response["body"])["results"]
+    assert [r.get("skipped") for r in results] == [True, True]
+    assert not (store.root / BUCKET).exists()
+
+
+def test_load_model_honours_model_format(lambda_env, monkeypatch):
+    batch, main, store = lambda_env
+    put_object(store, "2025-R2.csv", ROUND)
+    scored = {}
+    for model_format in ("joblib", "export"):
+        monkeypatch.setattr(main, "MODEL_FORMAT", model_format)
+        main._ARTIFACTS.clear()
+        model, preprocessor = main.load_model()
+        assert (type(model).__name__ == "ExportedModel") == (model_format == "export")
+        batch.score_object(store, BUCKET, "2025-R2.csv", model, preprocessor)
+        scored[model_format] = read_results(store, "2025-R2-predictions.csv")
+
+    pd.testing.assert_frame_equal(scored["joblib"], scored["export"])
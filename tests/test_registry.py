@@ -0,0 +1,77 @@
+import shutil
+
+import joblib
+import pytest
+
+from affordable_housing.api.registry import PRIMARY, ModelRegistry
+from affordable_housing.config import MODELS_DIR
+
+CANDIDATE = "20250801T120000Z"
+KEYS = [f"CA-25-{number:03d}" for number in range(2000)]
+
+
+@pytest.fixture
+def versions_dir(tmp_path):
+    version_dir = tmp_path / CANDIDATE
+    version_dir.mkdir()
+    for name in ("model.pkl", "preprocessor.pkl"):
+        shutil.copy(MODELS_DIR / name, version_dir / name)
+    return tmp_path
+
+
+@pytest.fixture
+def primary():
+    return joblib.load(MODELS_DIR / "model.pkl"), joblib.load(MODELS_DIR / "preprocessor.pkl")
+
+
+def registry(primary, versions_dir, percent) -> ModelRegistry:
+    policy = {"candidate": CANDIDATE, "candidate_percent": percent, "shadow": []}
+    return ModelRegistry(primary, "primary-version", policy, versions_dir=versions_dir)
+
+
+def test_same_application_always_gets_the_same_version(primary, versions_dir):
+    first = registry(primary, versions_dir, 30)
+    # A restarted server routes every project as before
+    second = registry(primary, versions_dir, 30)
+
+    routes = [first.route(key) for key in KEYS]
+
+    assert routes == [first.route(key) for key in KEYS]
+    assert routes == [second.route(key) for key in KEYS]
+
+
+@pytest.mark.parametrize("percent", [10, 30, 50])
+def test_candidate_answers_its_percent_of_applications(primary, versions_dir, percent):
+    model_registry = registry(primary, versions_dir, percent)
+
+    share = sum(model_registry.route(key) == CANDIDATE for key in KEYS) / len(KEYS)
+
+    assert share == pytest.approx(percent / 100, abs=0.03)
+
+
+def test_raising_the_percent_only_moves_projects_to_the_candidate(primary, versions_dir):
+    before = registry(primary, versions_dir, 10)
+    after = registry(primary, versions_dir, 40)
+
+    moved = [key for key in KEYS if before.route(key) != after.route(key)]
+
+    assert moved
+    assert all(before.route(key) == PRIMARY for key in moved)
+    assert all(after.route(key) == CANDIDATE for key in moved)
+
+
+@pytest.mark.parametrize("percent", [0, 100])
+def test_percent_bounds_route_everything_one_way(primary, versions_dir, percent):
+    model_registry = registry(primary, versions_dir, percent)
+    expected = CANDIDATE if percent == 100 else PRIMARY
+
+    assert {model_registry.route(key) for key in KEYS} == {expected}
+    assert {model_registry.route() for _ in range(200)} == {expected}
+
+
+def test_without_candidate_the_primary_answers(primary, versions_dir):
+    policy = {"candidate": None, "candidate_percent": 50, "shadow": []}
+    model_registry = ModelRegistry(primary, "primary-version", policy, versions_dir=versions_dir)
+
+    assert {model_registry.route(key) for key in KEYS[:100]} == {PRIMARY}
+    assert model_registry.route() == PRIMARY
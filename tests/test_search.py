@@ -0,0 +1,66 @@
+from loguru import logger
+import numpy as np
+import pandas as pd
+import pytest
+
+from affordable_housing.modeling.search import path_search, select_candidate
+
+
+def candidates(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["penalty", "class_weight", "C", "f1", "std", "constant"])
+
+
+def test_select_candidate_breaks_ties_by_std_then_larger_c():
+    scores = candidates(
+        [
+            ("l1", "none", 0.001, 0.80, 0.00, True),  # best F1, but predicts one class
+            ("l1", "none", 0.1, 0.75, 0.02, False),
+            ("l1", "none", 1.0, 0.75, 0.01, False),
+            ("l2", "none", 10.0, 0.75, 0.01, False),
+            ("l2", "none", 100.0, 0.70, 0.00, False),
+        ]
+    )
+
+    assert select_candidate(scores) == 3
+
+
+def test_select_candidate_falls_back_when_every_candidate_is_constant():
+    scores = candidates(
+        [("l1", "none", 0.001, 0.6, 0.0, True), ("l1", "none", 0.01, 0.7, 0.0, True)]
+    )
+
+    assert select_candidate(scores) == 1
+
+
+@pytest.fixture
+def majority_positive():
+    """
+    80% awarded rows and a weak signal: an all-zero L1 model predicting "award" for every row
+    has the best mean F1 (0.889, no fold variance).
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 8))
+    y = (0.1 * X[:, 0] + rng.normal(size=300) > -0.85).astype(int)
+    return X, pd.Series(y)
+
+
+def test_path_search_skips_single_class_candidates(majority_positive):
+    X, y = majority_positive
+    messages = []
+    sink = logger.add(messages.append, level="INFO")
+    try:
+        result = path_search(X, y, n_cs=9, n_jobs=1)
+    finally:
+        logger.remove(sink)
+
+    assert result.n_candidates == len(result.trials) == 4 * 9
+    assert any("predicting a single class" in message for message in messages)
+    assert result.trials["mean_score"].max() > result.best_score  # the all-positive model
+    best = result.best_params
+    assert best["logisticregression__C"] > 1e-3
+    model = result.estimator[-1]
+    assert np.any(model.coef_ != 0)
+    assert set(result.estimator.predict(X)) == {0, 1}
+    assert result.best_score == pytest.approx(
+        result.trials.loc[result.trials["params"].map(lambda p: p == best), "mean_score"].iloc[0]
+    )
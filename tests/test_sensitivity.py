@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from affordable_housing.modeling.sensitivity import build_grid, minimum_change, sensitivity
+
+BASE = {
+    "avg_targeted_affordability": 0.5,
+    "CDLAC_total_points_score": 110,
+    "CDLAC_tie_breaker_self_score": 1.0,
+    "bond_request_amount": 20_000_000.0,
+    "homeless_percent": 0.0,
+    "CDLAC_region": "City of Los Angeles",
+}
+
+
+def score(features: pd.DataFrame) -> np.ndarray:
+    """Award probability rising with points and the tie breaker: 0.5 at 115 points, 1.0."""
+    logit = 0.5 * (features["CDLAC_total_points_score"] - 115) + (
+        features["CDLAC_tie_breaker_self_score"] - 1.0
+    )
+    return 1 / (1 + np.exp(-logit.to_numpy(dtype=float)))
+
+
+def test_minimum_change_picks_closest_crossing_value():
+    values = np.array([100.0, 105.0, 110.0, 115.0, 120.0])
+    probabilities = np.array([0.9, 0.2, 0.3, 0.6, 0.8])
+
+    assert minimum_change(values, probabilities, current=110.0, threshold=0.5) == 3
+    assert minimum_change(values, probabilities, current=102.0, threshold=0.5) == 0
+
+
+def test_minimum_change_without_crossing():
+    assert minimum_change(np.arange(3.0), np.full(3, 0.1), current=1.0, threshold=0.5) is None
+
+
+def test_build_grid_holds_grid_then_sweeps():
+    axes = {"CDLAC_total_points_score": np.array([100, 120]), "homeless_percent": [0, 10, 20]}
+
+    grid = build_grid(BASE, axes)
+
+    assert len(grid) == 2 * 3 + 2 + 3
+    assert grid["CDLAC_total_points_score"].tolist()[:6] == [100, 100, 100, 120, 120, 120]
+    assert grid["homeless_percent"].tolist()[:6] == [0, 10, 20, 0, 10, 20]
+    # Each sweep moves its own field only
+    assert grid["homeless_percent"].tolist()[6:8] == [0, 0]
+    assert grid["CDLAC_total_points_score"].tolist()[8:] == [110, 110, 110]
+    assert (grid["CDLAC_region"] == BASE["CDLAC_region"]).all()
+
+
+def test_sensitivity_suggests_smallest_change_to_threshold():
+    axes = {
+        "CDLAC_total_points_score": np.arange(100, 131, 5),
+        "homeless_percent": np.array([0.0, 50.0]),  # no effect on the score
+    }
+
+    result = sensitivity(BASE, axes, score, threshold=0.5)
+
+    assert result["base_probability"] == pytest.approx(score(pd.DataFrame([BASE]))[0])
+    points, homeless = result["suggestions"]
+    assert points["required"] == 115 and points["change"] == 5
+    assert points["probability"] == pytest.approx(0.5)
+    assert homeless["required"] is None and homeless["change"] is None
+    assert result["best_combination"]["values"] == {
+        "CDLAC_total_points_score": 115.0,
+        "homeless_percent": 0.0,
+    }
+    assert np.shape(result["surface"]) == (7, 2)
+
+
+def test_sensitivity_for_awarded_project_needs_no_change():
+    base = {**BASE, "CDLAC_total_points_score": 125}
+    axes = {"CDLAC_total_points_score": np.arange(100, 131, 5)}
+
+    result = sensitivity(base, axes, score, threshold=0.5)
+
+    assert result["base_probability"] > 0.5
+    (points,) = result["suggestions"]
+    assert points == {
+        "field": "CDLAC_total_points_score",
+        "current": 125.0,
+        "required": 125.0,
+        "change": 0.0,
+        "probability": result["base_probability"],
+    }
+    assert result["best_combination"]["values"] == {"CDLAC_total_points_score": 125.0}
+
+
+def test_sensitivity_for_awarded_project_off_the_grid():
+    # The closest crossing grid value would be 120, a cut of 1 point
+    base = {**BASE, "CDLAC_total_points_score": 121}
+    axes = {"CDLAC_total_points_score": np.arange(100, 131, 5)}
+
+    (points,) = sensitivity(base, axes, score, threshold=0.5)["suggestions"]
+
+    assert points["required"] == 121.0 and points["change"] == 0.0
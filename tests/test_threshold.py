@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score, precision_score, recall_score
+from sklearn.model_selection import FixedThresholdClassifier
+from sklearn.pipeline import make_pipeline
+
+from affordable_housing.modeling.decision import (
+    FALLBACK_THRESHOLD,
+    decision_threshold,
+    predict_labels,
+)
+from affordable_housing.modeling.threshold import sweep_thresholds
+
+
+@pytest.fixture
+def scores():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 300)
+    # Rounded so many rows share a probability, as a calibrated model's scores do
+    y_proba = np.round(np.clip(0.3 * y_true + rng.uniform(0, 0.7, 300), 0, 1), 2)
+    return y_true, y_proba
+
+
+def test_sweep_matches_sklearn_metrics_at_every_threshold(scores):
+    y_true, y_proba = scores
+
+    sweep = sweep_thresholds(y_true, y_proba)
+
+    assert sweep["threshold"].tolist() == sorted(np.unique(y_proba), reverse=True)
+    for row in sweep.itertuples():
+        y_pred = (y_proba >= row.threshold).astype(int)
+        assert row.tp == ((y_pred == 1) & (y_true == 1)).sum()
+        assert row.fp == ((y_pred == 1) & (y_true == 0)).sum()
+        assert row.precision == pytest.approx(precision_score(y_true, y_pred))
+        assert row.recall == pytest.approx(recall_score(y_true, y_pred))
+        assert row.f1 == pytest.approx(f1_score(y_true, y_pred))
+
+
+def test_sweep_without_positive_labels():
+    sweep = sweep_thresholds([0, 0, 0], [0.2, 0.5, 0.5])
+
+    assert sweep["threshold"].tolist() == [0.5, 0.2]
+    assert (sweep[["precision", "recall", "f1"]] == 0).all().all()
+
+
+@pytest.fixture
+def fitted():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(200, 3))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=200) > 0).astype(int)
+    return X, y, make_pipeline(LogisticRegression()).fit(X, y)
+
+
+def test_model_without_stored_threshold_falls_back(fitted):
+    X, _, model = fitted
+    probabilities = model.predict_proba(X)[:, 1]
+
+    assert decision_threshold(model) == FALLBACK_THRESHOLD
+    assert (predict_labels(model, probabilities) == (probabilities >= 0.44)).all()
+
+
+def test_stored_threshold_is_used(fitted):
+    X, y, model = fitted
+    wrapped = FixedThresholdClassifier(model, threshold=0.7, response_method="predict_proba")
+    wrapped.fit(X, y)
+    probabilities = wrapped.predict_proba(X)[:, 1]
+
+    assert decision_threshold(wrapped) == 0.7
+    assert (predict_labels(wrapped, probabilities) == wrapped.predict(X)).all()
@@ -0,0 +1,132 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import joblib
+import numpy as np
+import pyarrow as pa
+from pydantic import ValidationError
+import pytest
+
+from affordable_housing.config import MODEL_EXPORT_DIR, MODELS_DIR
+from affordable_housing.modeling.artifact import load_artifact
+from affordable_housing.modeling.columnar import ColumnarScorer, score_arrow_table
+from affordable_housing.validation import category_vocabulary, input_model
+
+BAY_AREA = (
+    "Bay Area (Alameda, Contra Costa, Marin, San Francisco, San Mateo, Santa Clara, and Santa "
+    "Cruz Counties)"
+)
+INPUT = {
+    "avg_targeted_affordability": 0.5,
+    "CDLAC_total_points_score": 119,
+    "CDLAC_tie_breaker_self_score": 1.2,
+    "bond_request_amount": 30000000.0,
+    "homeless_percent": 0.1,
+    "construction_type": "New Construction",
+    "housing_type": "Large Family",
+    "CDLAC_pool_type": "New Construction",
+    "new_construction_set_aside": "ELI/VLI",
+    "CDLAC_region": "City of Los Angeles",
+}
+
+
+@pytest.fixture(scope="module")
+def vocabulary():
+    return category_vocabulary(joblib.load(MODELS_DIR / "preprocessor.pkl"))
+
+
+@pytest.fixture(scope="module")
+def prediction_input(vocabulary):
+    return input_model(vocabulary)
+
+
+def test_vocabulary_matches_exported_preprocessor(vocabulary):
+    _, exported = load_artifact(MODEL_EXPORT_DIR)
+
+    assert category_vocabulary(exported) == vocabulary
+
+
+@pytest.mark.parametrize(
+    "field, raw, expected",
+    [
+        ("housing_type", "  large   FAMILY ", "Large Family"),
+        ("CDLAC_region", "bay area", BAY_AREA),
+        ("CDLAC_region", "Bay Area (Alameda, ...)", BAY_AREA),
+        ("CDLAC_region", "city of la", "City of Los Angeles"),
+        ("construction_type", "Acq/Rehab", "Acq and Rehabilitation"),
+        ("new_construction_set_aside", "NONE", "none"),
+    ],
+)
+def test_aliases_normalize_to_encoder_categories(prediction_input, field, raw, expected):
+    parsed = prediction_input(**{**INPUT, field: raw})
+
+    assert parsed.model_dump()[field] == expected
+    assert type(parsed.model_dump()[field]) is str
+
+
+def test_unknown_category_fails_with_raw_value(prediction_input):
+    with pytest.raises(ValidationError) as info:
+        prediction_input(**{**INPUT, "CDLAC_region": "Mars"})
+
+    (error,) = info.value.errors()
+    assert error["type"] == "enum"
+    assert error["loc"] == ("CDLAC_region",)
+    assert error["input"] == "Mars"
+
+
+def test_without_vocabulary_any_string_is_accepted():
+    parsed = input_model()(**{**INPUT, "CDLAC_region": "Mars"})
+
+    assert parsed.CDLAC_region == "Mars"
+
+
+def test_unknown_category_is_rejected_with_422(prediction_input):
+    app = FastAPI()
+
+    @app.post("/predict")
+    def predict(input: prediction_input):
+        return input.model_dump()
+
+    client = TestClient(app)
+    accepted = client.post("/predict", json={**INPUT, "CDLAC_region": " BAY AREA"})
+    rejected = client.post("/predict", json={**INPUT, "housing_type": "Castles"})
+
+    assert accepted.status_code == 200
+    assert accepted.json()["CDLAC_region"] == BAY_AREA
+    assert rejected.status_code == 422
+    (error,) = rejected.json()["detail"]
+    assert error["loc"] == ["body", "housing_type"]
+    assert error["type"] == "enum"
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return ColumnarScorer(*load_artifact(MODEL_EXPORT_DIR))
+
+
+def test_arrow_scoring_normalizes_aliases(scorer):
+    alias = pa.Table.from_pylist(
+        [{**INPUT, "CDLAC_region": "bay area", "housing_type": "SENIORS"}]
+    )
+    expected = pa.Table.from_pylist(
+        [{**INPUT, "CDLAC_region": BAY_AREA, "housing_type": "Seniors"}]
+    )
+
+    np.testing.assert_allclose(
+        score_arrow_table(alias, scorer)["probability"].to_numpy(),
+        score_arrow_table(expected, scorer)["probability"].to_numpy(),
+    )
+
+
+@pytest.mark.parametrize(
+    "field, value, message",
+    [
+        ("CDLAC_region", "Mars", r"CDLAC_region: unknown categories \['Mars'\]"),
+        ("housing_type", None, "housing_type: 1 missing values"),
+        ("homeless_percent", None, "homeless_percent: 1 missing values"),
+    ],
+)
+def test_arrow_scoring_rejects_unknown_and_missing_values(scorer, field, value, message):
+    table = pa.Table.from_pylist([INPUT, {**INPUT, field: value}])
+
+    with pytest.raises(ValueError, match=message):
+        score_arrow_table(table, scorer)